@@ -2,15 +2,18 @@ import os
 from dotenv import load_dotenv
 from flask import Flask
 from flask_cors import CORS
-from google import genai
-from psycopg_pool import ConnectionPool
 from flask_cors import CORS
 from app.extensions import extensions
+from app.services.db_pool_service import init_db_pools, wait_db_pools
+from app.services.embedding_service import warmup_embedding_model, warmup_embedding_model_in_background
 
 from app.routes.health import health_bp
 from app.routes.llm import llm_bp
 from app.routes.database_queries import database_bp
 from app.routes.resume_upload import upload_bp
+from app.routes.metrics import metrics_bp
+from app.services.metrics_service import init_app as init_metrics
+from app.cli import register_cli
 
 #factory function to create app with all blueprint routes registered
 def create_app() -> Flask:
@@ -33,7 +36,8 @@ def create_app() -> Flask:
     if not gemini_api_key:
         raise ValueError("GEMINI_API_KEY not found in environment variables")
     
-    extensions.llm_client = genai.Client(api_key=gemini_api_key)
+    #client itself is created lazily by extensions.get_llm_client() to keep startup fast
+    extensions.llm_api_key = gemini_api_key
     
     # #initialize db connection pool
     db_url = os.environ.get("DATABASE_URL")
@@ -41,18 +45,30 @@ def create_app() -> Flask:
         raise RuntimeError("DATABASE_URL not set")
     
     #connection pool should be better than creating new connection every time we access db
-    extensions.db_pool = ConnectionPool(
-        conninfo=db_url,
-        min_size=1,
-        max_size=5,
-        timeout=60,
-    )
-    extensions.db_pool.wait()    
+    #sizes, timeouts and the separate sync pool come from DB_POOL_* / DB_SYNC_POOL_* (see db_pool_service)
+    #the pools connect in the background; DB_POOL_WAIT=true blocks startup until they are ready
+    init_db_pools(db_url)
+    if os.getenv("DB_POOL_WAIT", "false").lower() in ("1", "true", "yes"):
+        wait_db_pools()
+
+    #embedding model loads lazily on first use; EMBEDDING_WARMUP=background|eager loads it up front
+    embedding_warmup = os.getenv("EMBEDDING_WARMUP", "lazy").lower()
+    if embedding_warmup == "eager":
+        warmup_embedding_model()
+    elif embedding_warmup == "background":
+        warmup_embedding_model_in_background()
     
     #---------register route blueprints here--------------------------
     app.register_blueprint(health_bp, url_prefix="/health")
     app.register_blueprint(llm_bp, url_prefix="/llm")
     app.register_blueprint(database_bp, url_prefix="/database")
     app.register_blueprint(upload_bp, url_prefix="/upload")
+    app.register_blueprint(metrics_bp)
+
+    #request timing + Server-Timing headers (see /metrics)
+    init_metrics(app)
+
+    #---------register CLI commands here------------------------------
+    register_cli(app)
 
     return app
@@ -0,0 +1,41 @@
+import json
+import click
+from flask import Flask
+from app.services.resume_service import score_resumes_batch
+from app.services.resume_utils.resume_parser import benchmark_resume_extractors
+
+
+#command line entry points, run with: flask --app run <command>
+def register_cli(app: Flask) -> None:
+
+    @app.cli.command("score-resumes")
+    @click.option("--resume-id", "resume_ids", type=int, multiple=True, help="Resume id to score (repeatable). Default: all resumes.")
+    @click.option("--top-k", type=int, default=50, show_default=True, help="Matches stored per resume.")
+    @click.option("--chunk-size", type=int, default=128, show_default=True, help="Resumes per matrix product.")
+    def score_resumes(resume_ids, top_k, chunk_size):
+        """Re-score resumes against all active jobs in one pass."""
+        stats = score_resumes_batch(
+            resume_ids=list(resume_ids) or None,
+            top_k=top_k,
+            chunk_size=chunk_size,
+        )
+        click.echo(json.dumps(stats))
+
+    @app.cli.command("benchmark-extractors")
+    @click.argument("paths", nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+    @click.option("--repeat", type=int, default=3, show_default=True, help="Runs per file and backend.")
+    @click.option("--backend", "backends", multiple=True, help="PDF backend to include (repeatable). Default: all.")
+    @click.option("--json", "as_json", is_flag=True, help="Print JSON lines instead of a table.")
+    def benchmark_extractors(paths, repeat, backends, as_json):
+        """Compare resume text extraction backends on sample PDF/DOCX files."""
+        rows = benchmark_resume_extractors(list(paths), repeat=repeat, backends=list(backends) or None)
+        if as_json:
+            for row in rows:
+                click.echo(json.dumps(row))
+            return
+        click.echo(f"{'file':<32} {'backend':<12} {'best_ms':>9} {'mean_ms':>9} {'chars':>7}  poor")
+        for row in rows:
+            click.echo(
+                f"{row['file'][:32]:<32} {row['backend']:<12} {row['best_ms']:>9} "
+                f"{row['mean_ms']:>9} {row['chars']:>7}  {'yes' if row['looks_poor'] else 'no'}"
+            )
@@ -18,6 +18,9 @@ CREATE TABLE IF NOT EXISTS resumes (
 );
 
 CREATE INDEX IF NOT EXISTS idx_resumes_created_at ON resumes(created_at DESC);
+-- sha256 of the uploaded file bytes; repeat uploads reuse the stored resume/extraction
+ALTER TABLE resumes ADD COLUMN IF NOT EXISTS content_sha256 TEXT;
+CREATE INDEX IF NOT EXISTS idx_resumes_content_sha256 ON resumes(content_sha256);
 
 -- RESUME EXTRACTIONS (LLM OUTPUT)
 -- Stores structured data extracted from a resume (skills, titles, etc.).
@@ -27,13 +30,17 @@ CREATE TABLE IF NOT EXISTS resume_extractions (
 
     -- e.g. {"skills":["python","sql"], "titles":["data analyst"], ...}
     extracted_json  JSONB NOT NULL,
-    -- 1536 is a common embedding size. If we choose a different embedding model later, this dimension may need to change.
+    -- 384 = all-MiniLM-L6-v2 output size. If the embedding model changes, run
+    -- vector_schema_service.migrate_embedding_dimensions() (POST /database/vector_indexes/migrate).
     embedding       vector(384),
 
     model_name      TEXT,
     created_at      TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
+-- sha256 of the normalized user intent the extraction was made with
+ALTER TABLE resume_extractions ADD COLUMN IF NOT EXISTS intent_sha256 TEXT;
+
 CREATE INDEX IF NOT EXISTS idx_resume_extractions_resume_id
 ON resume_extractions(resume_id);
 CREATE INDEX IF NOT EXISTS idx_resume_extractions_embedding_cosine
@@ -63,8 +70,15 @@ CREATE TABLE IF NOT EXISTS jobs (
     company_logo    TEXT,
     tags            JSONB,
     description     TEXT,
-    -- 1536 is a common embedding size. If we choose a different embedding model later, this dimension may need to change.
-    embedding       vector(1536),
+    -- 384 = all-MiniLM-L6-v2 output size. If the embedding model changes, run
+    -- vector_schema_service.migrate_embedding_dimensions() (POST /database/vector_indexes/migrate).
+    embedding       vector(384),
+    -- sha256 of the text the embedding was built from, plus the model that produced it.
+    -- Lets syncs skip re-embedding jobs whose text has not changed.
+    embedding_hash  TEXT,
+    embedding_model TEXT,
+    -- Upstream file a job was parsed from (Simplify README / archived READMEs)
+    source_file     TEXT,
     date_posted     TIMESTAMPTZ,
     epoch           BIGINT,
     salary_min      INTEGER,
@@ -80,6 +94,19 @@ CREATE TABLE IF NOT EXISTS jobs (
     CONSTRAINT uq_jobs_source_source_job_id UNIQUE (source, source_job_id)
 );
 
+-- Columns added after the initial schema (safe to re-run on existing databases)
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS embedding_hash TEXT;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS embedding_model TEXT;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS source_file TEXT;
+-- Full-text document for lexical matching: title (A), tags (B), company (C).
+-- 'simple' config: no stemming or stop words, so skills like "go" or "r" survive.
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_tsv tsvector
+GENERATED ALWAYS AS (
+    setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+    setweight(jsonb_to_tsvector('simple', coalesce(tags, '[]'::jsonb), '["string"]'), 'B') ||
+    setweight(to_tsvector('simple', coalesce(company, '')), 'C')
+) STORED;
+
 -- Helpful indexes
 CREATE INDEX IF NOT EXISTS idx_jobs_is_active ON jobs(is_active);
 CREATE INDEX IF NOT EXISTS idx_jobs_source ON jobs(source);
@@ -87,10 +114,97 @@ CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs(company);
 CREATE INDEX IF NOT EXISTS idx_jobs_title ON jobs(title);
 CREATE INDEX IF NOT EXISTS idx_jobs_date_posted ON jobs(date_posted DESC);
 CREATE INDEX IF NOT EXISTS idx_jobs_last_seen_at ON jobs(last_seen_at DESC);
+-- Lets in-process match indexes pick up changed jobs incrementally
+CREATE INDEX IF NOT EXISTS idx_jobs_updated_at ON jobs(updated_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_source_file ON jobs(source, source_file);
+CREATE INDEX IF NOT EXISTS idx_jobs_search_tsv ON jobs USING GIN (search_tsv);
+-- Keyset pagination order for the jobs listing
+CREATE INDEX IF NOT EXISTS idx_jobs_listing_order
+ON jobs ((COALESCE(date_posted, created_at)) DESC, id DESC);
+-- Partial: every match query filters on is_active. Existing full indexes are rebuilt as
+-- partial by vector_schema_service.ensure_vector_indexes() (POST /database/vector_indexes/tune).
 CREATE INDEX IF NOT EXISTS idx_jobs_embedding_cosine
 ON jobs
 USING ivfflat (embedding vector_cosine_ops)
-WITH (lists = 100);
+WITH (lists = 100)
+WHERE is_active = TRUE;
+-- Per-source partial index (VECTOR_SOURCE_INDEX_SOURCES) for source-filtered matching
+CREATE INDEX IF NOT EXISTS idx_jobs_embedding_cosine_remoteok
+ON jobs
+USING ivfflat (embedding vector_cosine_ops)
+WITH (lists = 100)
+WHERE is_active = TRUE AND source = 'remoteok';
+-- Recency filter on matches
+CREATE INDEX IF NOT EXISTS idx_jobs_active_posted
+ON jobs ((COALESCE(date_posted, created_at)) DESC)
+WHERE is_active = TRUE;
+
+-- RESUME TASKS
+-- Status of background resume processing started by /upload/upload_resume.
+-- Kept in Postgres so any app worker can answer status polls.
+CREATE TABLE IF NOT EXISTS resume_tasks (
+    id              TEXT PRIMARY KEY,
+
+    -- queued | running | done | failed
+    status          TEXT NOT NULL,
+    -- completed stages in order, e.g. ["parsed","extracted","embedded","stored","scored"]
+    stages          JSONB NOT NULL DEFAULT '[]'::jsonb,
+
+    filename        TEXT,
+    auto_score      BOOLEAN NOT NULL DEFAULT FALSE,
+
+    resume_id       BIGINT REFERENCES resumes(id) ON DELETE SET NULL,
+    extraction_id   BIGINT,
+    result          JSONB,
+    error           TEXT,
+
+    created_at      TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at      TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_resume_tasks_created_at ON resume_tasks(created_at DESC);
+
+-- LLM EXTRACTION CACHE
+-- Skill-extraction responses keyed on sha256(normalized resume text, intent, prompt template, model).
+CREATE TABLE IF NOT EXISTS llm_extraction_cache (
+    cache_key       TEXT PRIMARY KEY,
+    model_name      TEXT NOT NULL,
+    response        JSONB NOT NULL,
+
+    hit_count       BIGINT NOT NULL DEFAULT 0,
+    created_at      TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    last_hit_at     TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_extraction_cache_created_at ON llm_extraction_cache(created_at);
+
+-- VECTOR INDEX STATE
+-- What each pgvector index was last built with, so retuning can tell when a rebuild is due
+-- and queries can pick ivfflat.probes / hnsw.ef_search to match.
+-- The ivfflat indexes above are placeholders; POST /database/vector_indexes/tune sizes them to the data.
+CREATE TABLE IF NOT EXISTS vector_index_state (
+    table_name      TEXT PRIMARY KEY,
+    index_name      TEXT NOT NULL,
+    method          TEXT NOT NULL,      -- ivfflat | hnsw
+    lists           INTEGER,
+    m               INTEGER,
+    ef_construction INTEGER,
+    row_count       BIGINT NOT NULL DEFAULT 0,
+    built_at        TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- SYNC SOURCES
+-- Remembers the validators (HTTP ETag / git blob SHA) of each upstream file a sync reads,
+-- so files that have not changed since the last run can be skipped.
+CREATE TABLE IF NOT EXISTS sync_sources (
+    source          TEXT NOT NULL,
+    name            TEXT NOT NULL,
+    etag            TEXT,
+    blob_sha        TEXT,
+    fetched_at      TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+    CONSTRAINT pk_sync_sources PRIMARY KEY (source, name)
+);
 
 -- MATCHES
 -- Stores resume->job match score + explanation
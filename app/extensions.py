@@ -1,5 +1,10 @@
+import threading
+from typing import TYPE_CHECKING, Optional
 from psycopg_pool import ConnectionPool
-from google import genai
+
+# google.genai is slow to import, so it is only loaded when the LLM client is first used
+if TYPE_CHECKING:
+    from google import genai
 
 
 """
@@ -8,8 +13,13 @@ To be initialized run_app() within __init__.py, and then importable throughout t
 """
 
 class Extensions:
-    db_pool: ConnectionPool
-    llm_client: genai.Client
+    db_pool: Optional[ConnectionPool] = None
+    #separate pool for long-running job syncs (None = syncs use db_pool)
+    sync_db_pool: Optional[ConnectionPool] = None
+    llm_client: Optional["genai.Client"] = None
+    llm_api_key: Optional[str] = None
+
+    _llm_lock = threading.Lock()
 
     #safe getter method for db_pool - errors if attempting to access before initialization
     def get_db_pool(self) -> ConnectionPool:
@@ -17,11 +27,25 @@ class Extensions:
             raise RuntimeError("Attempted to access db_pool before initialization")
         
         return self.db_pool
+
+    #pool for job syncs - falls back to db_pool when no separate sync pool is configured
+    def get_sync_db_pool(self) -> ConnectionPool:
+        if self.sync_db_pool != None:
+            return self.sync_db_pool
+
+        return self.get_db_pool()
     
-    def get_llm_client(self) -> genai.Client:
+    #llm client is built on first use from llm_api_key (set in create_app)
+    def get_llm_client(self) -> "genai.Client":
         if self.llm_client == None:
-            raise RuntimeError("Attempted to access llm_client before initialization")
+            if self.llm_api_key == None:
+                raise RuntimeError("Attempted to access llm_client before initialization")
+
+            with self._llm_lock:
+                if self.llm_client == None:
+                    from google import genai
+                    self.llm_client = genai.Client(api_key=self.llm_api_key)
         
         return self.llm_client
 
-extensions = Extensions()
\ No newline at end of file
+extensions = Extensions()
@@ -1,20 +1,113 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 import traceback
+from typing import Any, Callable, Dict, Optional, Tuple
 from app.services.database_service import sync_remoteok_jobs
-from app.services.database_service import get_jobs_payload
+from app.services.database_service import get_jobs_payload, stream_jobs_json, stream_jobs_ndjson
 from app.services.database_service import sync_simplify_jobs
-from app.services.resume_service import score_resume_against_jobs, get_display_jobs_for_resume
+from app.services.database_service import JOB_UPSERT_METHOD, JOB_UPSERT_METHODS, MatchFilters
+from app.services.embedding_service import EMBED_BATCH_SIZE
+from app.services.sync_pipeline import SYNC_CHUNK_SIZE
+from app.services.resume_service import score_resume_against_jobs, get_display_jobs_for_resume, score_resumes_batch
+from app.services.response_cache_service import (
+    RESPONSE_CACHE_ENABLED,
+    get_cached_response,
+    response_etag,
+    store_cached_response,
+)
+from app.services.vector_schema_service import (
+    ensure_vector_indexes,
+    get_vector_index_state,
+    migrate_embedding_dimensions,
+)
 
 #a simple blueprint for a route to check rest connection health
 
 database_bp = Blueprint("database", __name__)
 
+
+def _flag(name: str, default: bool = False) -> bool:
+    # Boolean query parameter: 1/true/yes or 0/false/no
+    value = request.args.get(name)
+    if value is None:
+        return default
+    return value.lower() in ("1", "true", "yes")
+
+
+def _match_filters() -> MatchFilters:
+    # ?location=&remote=&source=&posted_within_days=&min_salary= ; raises ValueError on bad ints
+    def _int_arg(name: str) -> Optional[int]:
+        value = request.args.get(name)
+        if value in (None, ""):
+            return None
+        number = int(value)
+        if number < 0:
+            raise ValueError(f"{name} must not be negative")
+        return number
+
+    return MatchFilters(
+        location=(request.args.get("location") or "").strip() or None,
+        remote=_flag("remote"),
+        source=(request.args.get("source") or "").strip() or None,
+        posted_within_days=_int_arg("posted_within_days"),
+        min_salary=_int_arg("min_salary"),
+    )
+
+def _cached_json(
+    endpoint: str,
+    scopes: Tuple[str, ...],
+    build: Callable[[], Tuple[Dict[str, Any], int]],
+) -> Response:
+    """
+    Serve a JSON read through the versioned response cache. The ETag comes from the query
+    string plus the generations of `scopes`, so If-None-Match is answered without the database.
+    Only 200 responses are cached.
+    """
+    if not RESPONSE_CACHE_ENABLED:
+        payload, status_code = build()
+        return jsonify(payload), status_code
+
+    etag = response_etag(endpoint, scopes, {**request.view_args, **request.args.to_dict(flat=False)})
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+
+    body = get_cached_response(etag)
+    cache_status = "hit"
+    if body is None:
+        cache_status = "miss"
+        payload, status_code = build()
+        if status_code != 200:
+            return jsonify(payload), status_code
+        body = jsonify(payload).get_data()
+        store_cached_response(etag, body)
+
+    response = Response(body, status=200, mimetype="application/json")
+    response.set_etag(etag, weak=True)
+    # Clients may keep the body but must revalidate each time
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Cache"] = cache_status
+    return response
+
+
 # Call to get jobs on db
+# ?limit=&cursor= pages through jobs; ?stream=ndjson|json streams the whole table
 @database_bp.route("/jobs", methods=["GET"])
 def jobs():
+    stream_format = request.args.get("stream")
+    if stream_format == "ndjson":
+        return Response(stream_with_context(stream_jobs_ndjson()), mimetype="application/x-ndjson")
+    if stream_format == "json":
+        return Response(stream_with_context(stream_jobs_json()), mimetype="application/json")
+    if stream_format is not None:
+        return jsonify({"status": "error", "message": "stream must be 'ndjson' or 'json'"}), 400
+
     try:
-        payload, status_code = get_jobs_payload(request.args.get("limit"))
-        return jsonify(payload), status_code
+        return _cached_json(
+            "jobs",
+            ("jobs",),
+            lambda: get_jobs_payload(request.args.get("limit"), request.args.get("cursor")),
+        )
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
@@ -27,18 +120,35 @@ def sync_remoteok() -> tuple:
     """
     limit_raw = request.args.get("limit", "1000")
     days_raw = request.args.get("inactive_after_days", "10")
+    batch_raw = request.args.get("embed_batch_size", str(EMBED_BATCH_SIZE))
+    chunk_raw = request.args.get("chunk_size", str(SYNC_CHUNK_SIZE))
 
     try:
         limit = int(limit_raw)
         inactive_days = int(days_raw)
+        embed_batch_size = int(batch_raw)
+        chunk_size = int(chunk_raw)
     except ValueError:
-        return jsonify({"status": "error", "message": "limit and inactive_after_days must be integers"}), 400
+        return jsonify({"status": "error", "message": "limit, inactive_after_days, embed_batch_size and chunk_size must be integers"}), 400
 
     limit = max(1, min(limit, 2000))
     inactive_days = max(1, min(inactive_days, 365))
+    embed_batch_size = max(1, min(embed_batch_size, 512))
+    chunk_size = max(1, min(chunk_size, 50000))
+
+    upsert_method = request.args.get("upsert_method", JOB_UPSERT_METHOD)
+    if upsert_method not in JOB_UPSERT_METHODS:
+        return jsonify({"status": "error", "message": f"upsert_method must be one of {', '.join(JOB_UPSERT_METHODS)}"}), 400
 
     try:
-        stats = sync_remoteok_jobs(limit=limit, inactive_after_days=inactive_days)
+        stats = sync_remoteok_jobs(
+            limit=limit,
+            inactive_after_days=inactive_days,
+            embed_batch_size=embed_batch_size,
+            upsert_method=upsert_method,
+            update_matches=_flag("update_matches", default=True),
+            chunk_size=chunk_size,
+        )
         return jsonify({"status": "ok", "source": "remoteok", **stats}), 200
     except Exception as e:
         traceback.print_exc()
@@ -57,25 +167,57 @@ def sync_remoteok() -> tuple:
 def sync_simplify() -> tuple:
     limit_raw = request.args.get("limit", "1000")
     days_raw = request.args.get("inactive_after_days", "10")
+    chunk_raw = request.args.get("chunk_size", str(SYNC_CHUNK_SIZE))
 
     try:
         limit = int(limit_raw)
         inactive_days = int(days_raw)
+        chunk_size = int(chunk_raw)
     except ValueError:
-        return jsonify({"status": "error", "message": "limit and inactive_after_days must be integers"}), 400
+        return jsonify({"status": "error", "message": "limit, inactive_after_days and chunk_size must be integers"}), 400
 
     limit = max(1, min(limit, 50000))
     inactive_days = max(1, min(inactive_days, 365))
+    chunk_size = max(1, min(chunk_size, 50000))
+    force_full = _flag("force_full")
 
-    stats = sync_simplify_jobs(limit=limit, inactive_after_days=inactive_days)
+    upsert_method = request.args.get("upsert_method", JOB_UPSERT_METHOD)
+    if upsert_method not in JOB_UPSERT_METHODS:
+        return jsonify({"status": "error", "message": f"upsert_method must be one of {', '.join(JOB_UPSERT_METHODS)}"}), 400
+
+    stats = sync_simplify_jobs(
+        limit=limit,
+        inactive_after_days=inactive_days,
+        force_full=force_full,
+        upsert_method=upsert_method,
+        update_matches=_flag("update_matches", default=True),
+        chunk_size=chunk_size,
+    )
     return jsonify({"status": "ok", "source": "simplify_newgrad", **stats}), 200
 
 
 @database_bp.route("/resumes/<int:resume_id>/score", methods=["POST"])
 def score_resume(resume_id: int) -> tuple:
     # Trigger scoring for one resume against active jobs.
+    # Optional ?engine=pgvector|memory selects where the vector search runs.
+    # Optional ?engine=hybrid adds full-text retrieval (RRF-fused); ?prefilter=true restricts the
+    # vector side to the full-text candidates.
+    # Optional ?return_jobs=N (max 50) includes the top N display-ready jobs in the response.
+    # Optional filters: location, remote, source, posted_within_days, min_salary.
     try:
-        stats = score_resume_against_jobs(resume_id)
+        return_jobs = max(0, min(int(request.args.get("return_jobs", "0")), 50))
+        filters = _match_filters()
+    except ValueError:
+        return jsonify({"status": "error", "message": "return_jobs, posted_within_days and min_salary must be non-negative integers"}), 400
+
+    try:
+        stats = score_resume_against_jobs(
+            resume_id,
+            engine=request.args.get("engine"),
+            return_jobs=return_jobs,
+            prefilter=_flag("prefilter"),
+            filters=filters,
+        )
         return jsonify({"status": "ok", **stats}), 200
     except ValueError as e:
         return jsonify({"status": "error", "message": str(e)}), 400
@@ -83,18 +225,81 @@ def score_resume(resume_id: int) -> tuple:
         return jsonify({"status": "error", "message": "failed to score resume"}), 500
 
 
+@database_bp.route("/resumes/score", methods=["POST"])
+def score_resumes() -> tuple:
+    # Bulk re-score. JSON body: {"resume_ids": [1, 2, ...], "top_k": 50}; omit resume_ids to score all
+    data = request.get_json(silent=True) or {}
+    resume_ids = data.get("resume_ids")
+    try:
+        if resume_ids is not None:
+            resume_ids = [int(r) for r in resume_ids]
+        top_k = max(1, min(int(data.get("top_k", 50)), 200))
+    except (TypeError, ValueError):
+        return jsonify({"status": "error", "message": "resume_ids must be a list of integers and top_k an integer"}), 400
+
+    try:
+        stats = score_resumes_batch(resume_ids=resume_ids, top_k=top_k)
+        return jsonify({"status": "ok", **stats}), 200
+    except Exception:
+        traceback.print_exc()
+        return jsonify({"status": "error", "message": "failed to score resumes"}), 500
+
+
 @database_bp.route("/resumes/<int:resume_id>/matches", methods=["GET"])
 def get_resume_matches(resume_id: int) -> tuple:
     # Return top matched jobs for a resume.
+    # Accepts the same filters as the score endpoint, applied to the stored matches.
     limit_raw = request.args.get("limit", "10")
     try:
         limit = int(limit_raw)
+        filters = _match_filters()
     except ValueError:
-        return jsonify({"status": "error", "message": "limit must be an integer"}), 400
+        return jsonify({"status": "error", "message": "limit, posted_within_days and min_salary must be integers"}), 400
+
+    def build() -> Tuple[Dict[str, Any], int]:
+        matches = get_display_jobs_for_resume(resume_id=resume_id, limit=limit, filters=filters)
+        return {"status": "ok", "resume_id": resume_id, "count": len(matches), "jobs": matches}, 200
 
     try:
-        matches = get_display_jobs_for_resume(resume_id=resume_id, limit=limit)
-        print ("[DEBUG] Matches: ", matches)
-        return jsonify({"status": "ok", "resume_id": resume_id, "count": len(matches), "jobs": matches}), 200
+        # Listed matches join jobs, so either a sync or a scoring run invalidates them
+        return _cached_json("resume_matches", ("jobs", "matches"), build)
     except Exception:
         return jsonify({"status": "error", "message": "failed to fetch matches"}), 500
+
+
+@database_bp.route("/vector_indexes", methods=["GET"])
+def vector_indexes() -> tuple:
+    # Show how each pgvector index was last built
+    try:
+        return jsonify({"status": "ok", "indexes": get_vector_index_state()}), 200
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
+@database_bp.route("/vector_indexes/tune", methods=["POST"])
+def tune_vector_indexes() -> tuple:
+    # Rebuild vector indexes that no longer fit the data; ?method=ivfflat|hnsw, ?force=true
+    method = request.args.get("method")
+    force = _flag("force")
+    try:
+        stats = ensure_vector_indexes(method=method, force=force)
+        return jsonify({"status": "ok", **stats}), 200
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
+@database_bp.route("/vector_indexes/migrate", methods=["POST"])
+def migrate_vector_columns() -> tuple:
+    # Align embedding column dimensions with the embedding model, then rebuild indexes
+    try:
+        migrated = migrate_embedding_dimensions()
+        stats = ensure_vector_indexes(method=request.args.get("method"))
+        return jsonify({"status": "ok", "migration": migrated, **stats}), 200
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"status": "error", "message": str(e)}), 500
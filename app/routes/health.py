@@ -1,4 +1,5 @@
-from flask import Blueprint
+from flask import Blueprint, jsonify, request
+from app.services.health_service import get_readiness
 
 #a simple blueprint for a route to check rest connection health
 
@@ -6,4 +7,12 @@ health_bp = Blueprint("health", __name__)
 
 @health_bp.route("/", methods=["GET"])
 def health():
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+#readiness: db pool + embedding model state
+#?require_model=true also requires the embedding model to be loaded
+@health_bp.route("/ready", methods=["GET"])
+def ready():
+    require_model = request.args.get("require_model", "false").lower() in ("1", "true", "yes")
+    payload, ok = get_readiness(require_model=require_model)
+    return jsonify(payload), (200 if ok else 503)
@@ -1,5 +1,6 @@
 from flask import Blueprint, jsonify, request
 from app.services import llm_service
+from app.services.llm_cache_service import get_llm_cache_stats
 
 llm_bp = Blueprint("gemini", __name__)
 
@@ -22,4 +23,9 @@ def llm_test():
         return jsonify({
             "ok": False,
             "error": str(e)
-        }), 500
\ No newline at end of file
+        }), 500
+
+#hit/miss counters for the skill-extraction cache (this process only)
+@llm_bp.route("/cache_stats", methods=["GET"])
+def cache_stats():
+    return jsonify({"ok": True, "cache": get_llm_cache_stats()})
@@ -0,0 +1,10 @@
+from flask import Blueprint, Response
+from app.services.metrics_service import render_metrics
+
+#prometheus scrape endpoint: stage latency histograms, request latency, db pool stats
+
+metrics_bp = Blueprint("metrics", __name__)
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def metrics():
+    return Response(render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
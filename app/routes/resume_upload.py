@@ -1,8 +1,13 @@
 import os
+import uuid
 from flask import Blueprint, request, jsonify
+from werkzeug.utils import secure_filename
 
 
 from app.services.resume_service import process_uploaded_resume
+from app.services.resume_utils.resume_parser import RESUME_MAX_UPLOAD_BYTES, UploadTooLargeError
+from app.services.resume_task_service import ResumeQueueFullError, submit_resume_task
+from app.services.database_service import get_resume_task
 
 upload_bp = Blueprint("upload", __name__)
 
@@ -10,17 +15,69 @@ UPLOAD_DIR = os.path.join(os.getcwd(), "uploads")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 
+def _flag(name: str) -> bool:
+    # Boolean option from query string or form data
+    value = request.args.get(name) or request.form.get(name) or ""
+    return value.lower() in ("1", "true", "yes")
+
+
 @upload_bp.route("/upload_resume", methods=["POST"])
 def upload_resume():
-    # Handle resume upload and return resume/extraction ids
+    # Save the upload and queue it for background processing; returns 202 with a task id.
+    # Pass sync=true to process inline and get resume/extraction ids in the response.
     file = request.files.get("resume")
     user_job_description = request.form.get("user_job_description")
 
     if not file or not file.filename:
         return jsonify({"ok": False, "error": "No file uploaded under key 'resume'"}), 400
 
+    # Cheap early reject from the header; the exact limit is enforced while spooling
+    if request.content_length is not None and request.content_length > RESUME_MAX_UPLOAD_BYTES:
+        return jsonify({"ok": False, "file": file.filename, "error": "Upload is too large"}), 413
+
+    if _flag("sync"):
+        try:
+            data = process_uploaded_resume(file, user_job_description)
+            return jsonify({"ok": True, "file": file.filename, "data": data}), 200
+        except UploadTooLargeError as e:
+            return jsonify({"ok": False, "file": file.filename, "error": str(e)}), 413
+        except Exception as e:
+            return jsonify({"ok": False, "file": file.filename, "error": str(e)}), 500
+
+    saved_path = os.path.join(UPLOAD_DIR, f"{uuid.uuid4().hex}_{secure_filename(file.filename)}")
     try:
-        data = process_uploaded_resume(file, user_job_description)
-        return jsonify({"ok": True, "file": file.filename, "data": data}), 200
+        file.save(saved_path)
+        task_id = submit_resume_task(
+            saved_path,
+            file.filename,
+            user_job_description,
+            auto_score=_flag("auto_score"),
+        )
+    except ResumeQueueFullError as e:
+        os.remove(saved_path)
+        return jsonify({"ok": False, "file": file.filename, "error": str(e)}), 503
     except Exception as e:
+        if os.path.exists(saved_path):
+            os.remove(saved_path)
         return jsonify({"ok": False, "file": file.filename, "error": str(e)}), 500
+
+    return jsonify({
+        "ok": True,
+        "file": file.filename,
+        "task_id": task_id,
+        "status_url": f"/upload/tasks/{task_id}",
+    }), 202
+
+
+@upload_bp.route("/tasks/<task_id>", methods=["GET"])
+def resume_task_status(task_id: str):
+    # Poll background processing status for an upload
+    try:
+        task = get_resume_task(task_id)
+    except Exception as e:
+        return jsonify({"ok": False, "error": str(e)}), 500
+
+    if task is None:
+        return jsonify({"ok": False, "error": "task not found"}), 404
+
+    return jsonify({"ok": True, "task": task}), 200
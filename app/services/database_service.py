@@ -1,60 +1,153 @@
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 from app.extensions import extensions
+import psycopg
 from psycopg.rows import dict_row
+import base64
+import codecs
 import json
 from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
-import requests
 import hashlib
+import heapq
+import html
+import os
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from psycopg.types.json import Json
-from app.services.embedding_service import build_job_embedding_text, embed_text
+from app.services.db_pool_service import PREPARE_HOT
+from app.services.http_service import get_http_session
+from app.services.vector_schema_service import apply_search_params, maybe_retune_after_sync
+from app.services.response_cache_service import bump_generation
+from app.services.metrics_service import observe_sync, timed_stage
+from app.services.sync_pipeline import SYNC_CHUNK_SIZE, MemoryTracker, SyncStats, chunked, prefetch
+from app.services.embedding_service import (
+    build_job_embedding_text,
+    embed_text,
+    embed_texts,
+    embedding_fingerprint,
+    EMBED_BATCH_SIZE,
+    EMBEDDING_MODEL_NAME,
+)
+
+
+# Columns returned by the jobs listing endpoints
+_JOB_LIST_COLUMNS: str = """
+    id, source, source_job_id, is_active,
+    title, company, location,
+    url, apply_url, slug, company_logo,
+    tags, description, date_posted, epoch, salary_min, salary_max,
+    last_seen_at, created_at, updated_at
+"""
+
+JOBS_PAGE_DEFAULT: int = 100
+JOBS_PAGE_MAX: int = 1000
+# Rows pulled per round trip from the server-side cursor when streaming
+JOBS_STREAM_BATCH: int = 500
+
 
+def _serialize_job_row(row: dict[str, Any]) -> dict[str, Any]:
+    for dt_key in ("date_posted", "last_seen_at", "created_at", "updated_at"):
+        if row.get(dt_key):
+            row[dt_key] = row[dt_key].isoformat()
+    return row
+
+
+# Opaque next-page token: the (sort timestamp, id) keyset position of the last row served
+def _encode_jobs_cursor(sort_at: datetime, job_id: int) -> str:
+    raw = json.dumps({"t": sort_at.isoformat(), "id": int(job_id)})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_jobs_cursor(token: str) -> Tuple[datetime, int]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(data["t"]), int(data["id"])
+    except (ValueError, KeyError, TypeError, UnicodeError):
+        raise ValueError("invalid cursor")
+
+
+#function to list one page of jobs on the database, newest first
+#pages are keyset-based on (COALESCE(date_posted, created_at), id); returns (jobs, next_cursor)
+def list_jobs(
+    jobs_limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Tuple[list[dict[str, Any]], Optional[str]]:
+    page_size = JOBS_PAGE_DEFAULT if jobs_limit is None else max(1, min(jobs_limit, JOBS_PAGE_MAX))
 
-#function to list all jobs on the database
-def list_jobs(jobs_limit: Optional[int] = None) -> list[dict[str, Any]]:
     with extensions.get_db_pool().connection() as conn:
         with conn.cursor(row_factory=dict_row) as cur:
-            if jobs_limit is None:
+            if cursor is None:
                 cur.execute(
-                    """
-                    SELECT
-                        id, source, source_job_id, is_active,
-                        title, company, location,
-                        url, apply_url, slug, company_logo,
-                        tags, description, date_posted, epoch, salary_min, salary_max,
-                        last_seen_at, created_at, updated_at
+                    f"""
+                    SELECT {_JOB_LIST_COLUMNS}
                     FROM jobs
-                    ORDER BY COALESCE(date_posted, created_at) DESC
-                    """
+                    ORDER BY COALESCE(date_posted, created_at) DESC, id DESC
+                    LIMIT %s
+                    """,
+                    (page_size + 1,),
                 )
             else:
-                jobs_limit = max(1, jobs_limit)
+                after_at, after_id = _decode_jobs_cursor(cursor)
                 cur.execute(
-                    """
-                    SELECT
-                        id, source, source_job_id, is_active,
-                        title, company, location,
-                        url, apply_url, slug, company_logo,
-                        tags, description, date_posted, epoch, salary_min, salary_max,
-                        last_seen_at, created_at, updated_at
+                    f"""
+                    SELECT {_JOB_LIST_COLUMNS}
                     FROM jobs
-                    ORDER BY COALESCE(date_posted, created_at) DESC
+                    WHERE (COALESCE(date_posted, created_at), id) < (%s, %s)
+                    ORDER BY COALESCE(date_posted, created_at) DESC, id DESC
                     LIMIT %s
                     """,
-                    (jobs_limit,),
+                    (after_at, after_id, page_size + 1),
                 )
             rows = cur.fetchall()
 
-    for r in rows:
-        for dt_key in ("date_posted", "last_seen_at", "created_at", "updated_at"):
-            if r.get(dt_key):
-                r[dt_key] = r[dt_key].isoformat()
+    # One extra row was fetched to know whether another page exists
+    next_cursor: Optional[str] = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = _encode_jobs_cursor(last["date_posted"] or last["created_at"], last["id"])
 
-    return rows
+    return [_serialize_job_row(r) for r in rows], next_cursor
 
 
-def get_jobs_payload(limit_raw: Optional[str]) -> tuple[dict[str, Any], int]:
+def iter_all_jobs(batch_size: int = JOBS_STREAM_BATCH) -> Iterator[dict[str, Any]]:
+    """
+    Yield every job newest first from a server-side cursor, so memory stays
+    constant regardless of table size. Holds one pooled connection until exhausted.
+    """
+    with extensions.get_db_pool().connection() as conn:
+        with conn.cursor(name="jobs_stream", row_factory=dict_row) as cur:
+            cur.itersize = batch_size
+            cur.execute(
+                f"""
+                SELECT {_JOB_LIST_COLUMNS}
+                FROM jobs
+                ORDER BY COALESCE(date_posted, created_at) DESC, id DESC
+                """
+            )
+            for row in cur:
+                yield _serialize_job_row(row)
+
+
+def stream_jobs_ndjson() -> Iterator[str]:
+    # One JSON document per line
+    for job in iter_all_jobs():
+        yield json.dumps(job) + "\n"
+
+
+def stream_jobs_json() -> Iterator[str]:
+    # Same shape as the paged payload ({"jobs": [...], "count": N}), written incrementally
+    count = 0
+    yield '{"jobs": ['
+    for job in iter_all_jobs():
+        yield ("," if count else "") + json.dumps(job)
+        count += 1
+    yield f'], "count": {count}}}'
+
+
+def get_jobs_payload(limit_raw: Optional[str], cursor: Optional[str] = None) -> tuple[dict[str, Any], int]:
     if limit_raw is None:
         limit = None
     else:
@@ -63,21 +156,30 @@ def get_jobs_payload(limit_raw: Optional[str]) -> tuple[dict[str, Any], int]:
         except ValueError:
             return {"status": "error", "message": "limit must be an integer"}, 400
 
-    jobs = list_jobs(limit)
-    return {"count": len(jobs), "jobs": jobs}, 200
+    try:
+        jobs, next_cursor = list_jobs(limit, cursor=cursor)
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}, 400
 
+    return {"count": len(jobs), "jobs": jobs, "next_cursor": next_cursor}, 200
 
-def create_resume(resume_text: str, filename: Optional[str] = None, file_url: Optional[str] = None) -> int:
+
+def create_resume(
+    resume_text: str,
+    filename: Optional[str] = None,
+    file_url: Optional[str] = None,
+    content_sha256: Optional[str] = None,
+) -> int:
     # Insert parsed resume text and optional metadata; return new resume id
     with extensions.get_db_pool().connection() as conn:
         with conn.cursor() as cur:
             cur.execute(
                 """
-                INSERT INTO resumes (resume_text, filename, file_url)
-                VALUES (%s, %s, %s)
+                INSERT INTO resumes (resume_text, filename, file_url, content_sha256)
+                VALUES (%s, %s, %s, %s)
                 RETURNING id
                 """,
-                (resume_text, filename, file_url),
+                (resume_text, filename, file_url, content_sha256),
             )
             resume_id = cur.fetchone()[0]
     return int(resume_id)
@@ -87,21 +189,47 @@ def create_resume_extraction(
     resume_id: int,
     extracted_json: Dict[str, Any],
     embedding: List[float],
-    model_name: Optional[str] = None
+    model_name: Optional[str] = None,
+    intent_sha256: Optional[str] = None,
 ) -> int:
     with extensions.get_db_pool().connection() as conn:
         with conn.cursor() as cur:
             cur.execute("""
                 INSERT INTO resume_extractions (
-                    resume_id, extracted_json, embedding, model_name
+                    resume_id, extracted_json, embedding, model_name, intent_sha256
                 )
-                VALUES (%s, %s::jsonb, %s, %s)
+                VALUES (%s, %s::jsonb, %s, %s, %s)
                 RETURNING id
-            """, (resume_id, json.dumps(extracted_json), embedding, model_name))
+            """, (resume_id, json.dumps(extracted_json), embedding, model_name, intent_sha256))
 
             return cur.fetchone()[0]
 
 
+def find_resume_by_content(
+    content_sha256: str,
+    intent_sha256: str,
+    model_name: Optional[str] = None,
+) -> Optional[dict[str, Any]]:
+    # Latest embedded extraction for an identical file uploaded with the same intent and model
+    with extensions.get_db_pool().connection() as conn:
+        with conn.cursor(row_factory=dict_row) as cur:
+            cur.execute(
+                """
+                SELECT r.id AS resume_id, e.id AS extraction_id, e.extracted_json
+                FROM resumes r
+                JOIN resume_extractions e ON e.resume_id = r.id
+                WHERE r.content_sha256 = %s
+                  AND e.intent_sha256 = %s
+                  AND e.model_name IS NOT DISTINCT FROM %s
+                  AND e.embedding IS NOT NULL
+                ORDER BY e.created_at DESC, e.id DESC
+                LIMIT 1
+                """,
+                (content_sha256, intent_sha256, model_name),
+            )
+            return cur.fetchone()
+
+
 def get_latest_resume_extraction(resume_id: int) -> Optional[dict[str, Any]]:
     # Fetch the latest extraction record for a resume
     with extensions.get_db_pool().connection() as conn:
@@ -129,7 +257,8 @@ def list_active_jobs_for_matching() -> list[dict[str, Any]]:
         with conn.cursor(row_factory=dict_row) as cur:
             cur.execute(
                 """
-                SELECT id, title, company, location, description, tags
+                SELECT id, title, company, location, description, tags,
+                       embedding_hash, embedding_model
                 FROM jobs
                 WHERE is_active = TRUE
                 """
@@ -164,19 +293,92 @@ def list_active_jobs_for_matching() -> list[dict[str, Any]]:
 #             match_id = cur.fetchone()[0]
 #     return int(match_id)
 
-def compute_matches_for_resume(resume_id: int, resume_embedding: list[float], top_k: int = 10):
+@dataclass(frozen=True)
+class MatchFilters:
+    """Optional job filters for scoring and listing matches. Unset fields don't filter."""
+    location: Optional[str] = None              # case-insensitive substring, e.g. "united states"
+    remote: bool = False                        # location mentions remote, or a remote-only source
+    source: Optional[str] = None                # e.g. "remoteok", "simplify_newgrad"
+    posted_within_days: Optional[int] = None
+    min_salary: Optional[int] = None
+
+    @property
+    def active(self) -> bool:
+        return any((self.location, self.remote, self.source, self.posted_within_days, self.min_salary))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {k: v for k, v in self.__dict__.items() if v}
+
+
+# Sources that only list remote jobs
+REMOTE_ONLY_SOURCES: Tuple[str, ...] = ("remoteok",)
+
+
+def _match_filter_sql(filters: Optional[MatchFilters], alias: str = "j") -> Tuple[str, Dict[str, Any]]:
+    """
+    Return (" AND ..." clause, named params) for `filters` against jobs aliased as `alias`.
+    An equality on source lets the planner pick that source's partial vector index.
+    """
+    if filters is None or not filters.active:
+        return "", {}
+
+    clauses: List[str] = []
+    params: Dict[str, Any] = {}
+    if filters.source:
+        clauses.append(f"{alias}.source = %(f_source)s")
+        params["f_source"] = filters.source
+    if filters.location:
+        clauses.append(f"{alias}.location ILIKE %(f_location)s")
+        params["f_location"] = f"%{filters.location}%"
+    if filters.remote:
+        clauses.append(f"({alias}.location ILIKE %(f_remote)s OR {alias}.source = ANY(%(f_remote_sources)s))")
+        params["f_remote"] = "%remote%"
+        params["f_remote_sources"] = list(REMOTE_ONLY_SOURCES)
+    if filters.posted_within_days:
+        clauses.append(
+            f"COALESCE({alias}.date_posted, {alias}.created_at) >= NOW() - make_interval(days => %(f_days)s::int)"
+        )
+        params["f_days"] = int(filters.posted_within_days)
+    if filters.min_salary:
+        clauses.append(f"COALESCE({alias}.salary_max, {alias}.salary_min) >= %(f_min_salary)s")
+        params["f_min_salary"] = int(filters.min_salary)
+
+    return "".join(f"\n  AND {c}" for c in clauses), params
+
+
+@timed_stage("match")
+def compute_matches_for_resume(
+    resume_id: int,
+    resume_embedding: list[float],
+    top_k: int = 10,
+    target_recall: Optional[float] = None,
+    filters: Optional[MatchFilters] = None,
+):
+    filter_sql, filter_params = _match_filter_sql(filters)
     with extensions.get_db_pool().connection() as conn:
         with conn.cursor() as cur:
-            cur.execute("SET ivfflat.probes = 10;")
-            cur.execute("""
-                SELECT id,
-                       1 - (embedding <=> %s) AS similarity
-                FROM jobs
-                WHERE is_active = TRUE
-                  AND embedding IS NOT NULL
-                ORDER BY embedding <=> %s
-                LIMIT %s;
-            """, (resume_embedding, resume_embedding, top_k))
+            # probes / ef_search follow the index shape and VECTOR_TARGET_RECALL
+            apply_search_params(
+                cur, "jobs", target_recall=target_recall, top_k=top_k, filtered=bool(filter_sql)
+            )
+            cur.execute(
+                """
+                SELECT id, similarity
+                FROM (
+                    SELECT j.id,
+                           1 - (j.embedding <=> %(embedding)s) AS similarity
+                    FROM jobs j
+                    WHERE j.is_active = TRUE
+                      AND j.embedding IS NOT NULL"""
+                + filter_sql
+                + """
+                    ORDER BY j.embedding <=> %(embedding)s
+                    LIMIT %(top_k)s
+                ) nn
+                ORDER BY similarity DESC;
+                """,
+                {"embedding": resume_embedding, "top_k": top_k, **filter_params},
+            )
 
             rows = cur.fetchall()
 
@@ -226,66 +428,726 @@ def create_or_update_matches(matches: List[List[Any]]) -> int:
         with conn.cursor() as cur:
             cur.executemany(query, values)
 
+    bump_generation("matches")
     return len(matches)
 
 
+# Number of matches kept per resume by scoring and incremental maintenance
+MATCHES_TOP_K: int = 50
+
+
+def _stage_match_rows(cur, matches: List[Tuple[int, int, float]]) -> None:
+    # COPY (resume_id, job_id, score) rows into a temp matches_stage table dropped at commit
+    cur.execute("DROP TABLE IF EXISTS matches_stage;")
+    cur.execute(
+        """
+        CREATE TEMP TABLE matches_stage (
+            resume_id BIGINT,
+            job_id BIGINT,
+            score DOUBLE PRECISION
+        ) ON COMMIT DROP;
+        """
+    )
+    with cur.copy("COPY matches_stage (resume_id, job_id, score) FROM STDIN") as copy:
+        for row in matches:
+            copy.write_row(row)
+
+
+def list_latest_resume_embeddings(resume_ids: Optional[List[int]] = None) -> List[Tuple[int, List[float]]]:
+    # Latest embedding per resume, for all resumes or the given ids
+    with extensions.get_db_pool().connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT DISTINCT ON (resume_id) resume_id, embedding::real[]
+                FROM resume_extractions
+                WHERE embedding IS NOT NULL
+                  AND (%s::bigint[] IS NULL OR resume_id = ANY(%s::bigint[]))
+                ORDER BY resume_id, created_at DESC, id DESC
+                """,
+                (resume_ids, resume_ids),
+            )
+            return [(int(r[0]), r[1]) for r in cur.fetchall()]
+
+
+def replace_matches_bulk(resume_ids: List[int], matches: List[Tuple[int, int, float]]) -> int:
+    """
+    Replace all matches for `resume_ids` with `matches` [(resume_id, job_id, score)] in one
+    transaction: COPY into a staging table, delete the old rows, insert the new ones.
+    """
+    if not resume_ids:
+        return 0
+
+    with extensions.get_db_pool().connection() as conn:
+        with conn.cursor() as cur:
+            _stage_match_rows(cur, matches)
+            cur.execute("DELETE FROM matches WHERE resume_id = ANY(%s)", (resume_ids,))
+            cur.execute(
+                """
+                INSERT INTO matches (resume_id, job_id, score, explanation, metadata)
+                SELECT resume_id, job_id, score, NULL, '{}'::jsonb
+                FROM matches_stage
+                ON CONFLICT (resume_id, job_id)
+                DO UPDATE SET
+                    score = EXCLUDED.score,
+                    explanation = EXCLUDED.explanation,
+                    metadata = EXCLUDED.metadata
+                """
+            )
+            saved = cur.rowcount
+
+    # Bumped after commit so a concurrent read can't cache pre-commit rows under the new generation
+    bump_generation("matches")
+    return saved
+
+
 def clear_matches_for_resume(resume_id: int) -> int:
     # Remove existing matches for a resume before re-scoring
     with extensions.get_db_pool().connection() as conn:
         with conn.cursor() as cur:
             cur.execute("DELETE FROM matches WHERE resume_id = %s", (resume_id,))
-            return cur.rowcount
+            cleared = cur.rowcount
+
+    bump_generation("matches")
+    return cleared
+
+
+def get_job_ids_by_source_ids(source: str, source_job_ids: List[str]) -> List[int]:
+    if not source_job_ids:
+        return []
+    with extensions.get_sync_db_pool().connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT id FROM jobs WHERE source = %s AND source_job_id = ANY(%s)",
+                (source, source_job_ids),
+            )
+            return [int(r[0]) for r in cur.fetchall()]
 
 
-def list_top_matches_for_resume(resume_id: int, limit: int = 10) -> list[dict[str, Any]]:
+# Nearest resume extractions looked up per changed job on the resume_extractions vector index
+MATCH_UPDATE_RESUMES_PER_JOB: int = int(os.getenv("MATCH_UPDATE_RESUMES_PER_JOB", "200"))
+
+
+def update_matches_for_changed_jobs(
+    job_ids: List[int],
+    deactivated_job_ids: List[int],
+    top_k: int = MATCHES_TOP_K,
+    chunk_size: int = 1024,
+    resumes_per_job: int = MATCH_UPDATE_RESUMES_PER_JOB,
+) -> Dict[str, Any]:
+    """
+    Incrementally maintain stored matches after a sync, in one transaction.
+
+    - Each new/re-embedded job is matched to its `resumes_per_job` nearest resume extractions
+      with an ANN query on idx_resume_extractions_embedding_cosine (`chunk_size` jobs per
+      statement). Only a resume's latest extraction counts, and only resumes that already
+      hold plain cosine matches; both filters run inside the ANN query. Hybrid (RRF scores)
+      and filtered matches can't take unfiltered cosine candidates; they refresh on their
+      next score.
+    - Matches to deactivated jobs are removed, as are plain cosine matches to re-embedded jobs.
+    - The candidates are merged and each touched resume is trimmed back to `top_k`.
+
+    Cost scales with the number of changed jobs, not with resumes x jobs. A job only reaches
+    resumes among its nearest `resumes_per_job`. Because removed rows aren't backfilled from
+    older jobs, a resume can briefly hold fewer than top_k matches until its next full score.
+    """
+    started = time.perf_counter()
+    job_ids = list(job_ids)
+    if not job_ids and not deactivated_job_ids:
+        return {"removed": 0, "jobs_scored": 0, "resumes_considered": 0, "merged": 0, "trimmed": 0, "elapsed_seconds": 0.0}
+
+    jobs_scored = resumes_considered = merged = trimmed = 0
+    with extensions.get_sync_db_pool().connection() as conn:
+        with conn.cursor() as cur:
+            # Candidates are collected before the removals below, so resumes whose only
+            # matches were to re-embedded jobs still count as scored
+            if job_ids:
+                # The eligibility filters sit inside the ANN subquery, so stale extractions and
+                # hybrid/filtered resumes don't use up the nearest slots; iterative scans keep
+                # the index scan going until resumes_per_job eligible rows are found
+                apply_search_params(cur, "resume_extractions", top_k=resumes_per_job, filtered=True)
+                cur.execute("DROP TABLE IF EXISTS matches_stage;")
+                cur.execute(
+                    """
+                    CREATE TEMP TABLE matches_stage (
+                        resume_id BIGINT,
+                        job_id BIGINT,
+                        score DOUBLE PRECISION
+                    ) ON COMMIT DROP;
+                    """
+                )
+                for start in range(0, len(job_ids), chunk_size):
+                    cur.execute(
+                        """
+                        INSERT INTO matches_stage (resume_id, job_id, score)
+                        SELECT nn.resume_id, j.id, 1 - nn.distance
+                        FROM jobs j
+                        CROSS JOIN LATERAL (
+                            SELECT e.resume_id, e.embedding <=> j.embedding AS distance
+                            FROM resume_extractions e
+                            WHERE e.embedding IS NOT NULL
+                              AND NOT EXISTS (
+                                  SELECT 1
+                                  FROM resume_extractions newer
+                                  WHERE newer.resume_id = e.resume_id
+                                    AND newer.embedding IS NOT NULL
+                                    AND (newer.created_at, newer.id) > (e.created_at, e.id)
+                              )
+                              AND EXISTS (
+                                  SELECT 1
+                                  FROM matches m
+                                  WHERE m.resume_id = e.resume_id
+                                    AND (m.metadata IS NULL OR m.metadata = '{}'::jsonb)
+                              )
+                            ORDER BY e.embedding <=> j.embedding
+                            LIMIT %s
+                        ) nn
+                        WHERE j.id = ANY(%s)
+                          AND j.is_active = TRUE
+                          AND j.embedding IS NOT NULL
+                        """,
+                        (resumes_per_job, job_ids[start:start + chunk_size]),
+                    )
+                cur.execute("SELECT COUNT(DISTINCT job_id), COUNT(DISTINCT resume_id) FROM matches_stage")
+                jobs_scored, resumes_considered = (int(v) for v in cur.fetchone())
+
+            # Deactivated jobs leave every resume. Re-embedded jobs only leave plain cosine
+            # matches, the ones re-added from matches_stage; hybrid and filtered rows keep their
+            # scores until that resume is scored again
+            cur.execute(
+                """
+                DELETE FROM matches
+                WHERE job_id = ANY(%s)
+                   OR (job_id = ANY(%s) AND (metadata IS NULL OR metadata = '{}'::jsonb))
+                """,
+                (list(deactivated_job_ids), job_ids),
+            )
+            removed = cur.rowcount
+
+            if resumes_considered:
+                cur.execute(
+                    """
+                    INSERT INTO matches (resume_id, job_id, score, explanation, metadata)
+                    SELECT resume_id, job_id, score, NULL, '{}'::jsonb
+                    FROM matches_stage
+                    ON CONFLICT (resume_id, job_id)
+                    DO UPDATE SET score = EXCLUDED.score
+                    """
+                )
+                merged = cur.rowcount
+
+                # Candidates below a resume's k-th score are dropped here
+                cur.execute(
+                    """
+                    DELETE FROM matches m
+                    USING (
+                        SELECT id,
+                               ROW_NUMBER() OVER (PARTITION BY resume_id ORDER BY score DESC, id) AS rn
+                        FROM matches
+                        WHERE resume_id IN (SELECT DISTINCT resume_id FROM matches_stage)
+                    ) ranked
+                    WHERE m.id = ranked.id
+                      AND ranked.rn > %s
+                    """,
+                    (top_k,),
+                )
+                trimmed = cur.rowcount
+
+    bump_generation("matches")
+    return {
+        "removed": removed,
+        "jobs_scored": jobs_scored,
+        "resumes_considered": resumes_considered,
+        "merged": merged,
+        "trimmed": trimmed,
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+# Display columns for matched jobs, shared by the matches listing and the fused score path
+_MATCH_DISPLAY_SQL: str = """
+    SELECT
+        m.id AS match_id,
+        m.resume_id,
+        m.job_id,
+        m.score,
+        m.explanation,
+        m.metadata,
+        m.created_at AS matched_at,
+        j.title,
+        j.company,
+        j.location,
+        j.url,
+        j.apply_url,
+        j.description,
+        j.tags,
+        j.date_posted
+    FROM matches m
+    JOIN jobs j ON j.id = m.job_id
+    WHERE m.resume_id = %(resume_id)s
+      AND j.is_active = TRUE{filters}
+    ORDER BY m.score DESC, j.date_posted DESC NULLS LAST, m.created_at DESC
+    LIMIT %(limit)s
+"""
+
+
+def _fetch_match_display_rows(cur, resume_id: int, limit: int, filters: Optional[MatchFilters] = None) -> list[dict[str, Any]]:
+    filter_sql, filter_params = _match_filter_sql(filters)
+    cur.execute(
+        _MATCH_DISPLAY_SQL.format(filters=filter_sql),
+        {"resume_id": resume_id, "limit": limit, **filter_params},
+        prepare=PREPARE_HOT,
+    )
+    return _serialize_match_rows(cur.fetchall())
+
+
+def _serialize_match_rows(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    for row in rows:
+        if row.get("matched_at"):
+            row["matched_at"] = row["matched_at"].isoformat()
+        if row.get("date_posted"):
+            row["date_posted"] = row["date_posted"].isoformat()
+    return rows
+
+
+def list_top_matches_for_resume(
+    resume_id: int,
+    limit: int = 10,
+    filters: Optional[MatchFilters] = None,
+) -> list[dict[str, Any]]:
     # Return top scored active jobs for frontend display
     safe_limit = max(1, min(limit, 10))
+    with extensions.get_db_pool().connection() as conn:
+        with conn.cursor(row_factory=dict_row) as cur:
+            return _fetch_match_display_rows(cur, resume_id, safe_limit, filters)
+
+
+def list_scored_matches_for_resume(resume_id: int, limit: int) -> list[dict[str, Any]]:
+    # Display rows right after scoring: `limit` is the caller's return_jobs, not the listing's cap of 10
+    with extensions.get_db_pool().connection() as conn:
+        with conn.cursor(row_factory=dict_row) as cur:
+            return _fetch_match_display_rows(cur, resume_id, max(1, limit))
+
+
+@timed_stage("match")
+def score_and_fetch_matches(
+    resume_id: int,
+    top_k: int = MATCHES_TOP_K,
+    display_limit: int = 10,
+    target_recall: Optional[float] = None,
+    filters: Optional[MatchFilters] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Re-score one resume on a single connection in a single transaction:
+    latest extraction lookup, delete, ANN query + insert (one INSERT ... SELECT),
+    then the display rows. Readers see the old matches until commit, never an empty list.
+    With filters, the stored matches are the filtered top_k (recorded in matches.metadata).
+    Returns None if the resume has no embedded extraction.
+    """
+    filter_sql, filter_params = _match_filter_sql(filters)
+    metadata = {"filters": filters.as_dict()} if filter_sql else {}
+
     with extensions.get_db_pool().connection() as conn:
         with conn.cursor(row_factory=dict_row) as cur:
             cur.execute(
                 """
+                SELECT id, embedding
+                FROM resume_extractions
+                WHERE resume_id = %s
+                  AND embedding IS NOT NULL
+                ORDER BY created_at DESC, id DESC
+                LIMIT 1
+                """,
+                (resume_id,),
+                prepare=PREPARE_HOT,
+            )
+            extraction = cur.fetchone()
+            if extraction is None:
+                return None
+
+            # Filtered queries use iterative scans so they still fill top_k
+            apply_search_params(cur, "jobs", target_recall=target_recall, top_k=top_k, filtered=bool(filter_sql))
+            cur.execute("DELETE FROM matches WHERE resume_id = %s", (resume_id,))
+            cleared = cur.rowcount
+
+            # The embedding stays in its pgvector text form and is cast back, so it never
+            # round-trips through Python floats; the inner ORDER BY ... LIMIT uses the ANN index
+            cur.execute(
+                """
+                INSERT INTO matches (resume_id, job_id, score, explanation, metadata)
+                SELECT %(resume_id)s, nn.id, 1 - nn.distance, NULL, %(metadata)s
+                FROM (
+                    SELECT j.id, j.embedding <=> %(embedding)s::vector AS distance
+                    FROM jobs j
+                    WHERE j.is_active = TRUE
+                      AND j.embedding IS NOT NULL"""
+                + filter_sql
+                + """
+                    ORDER BY j.embedding <=> %(embedding)s::vector
+                    LIMIT %(top_k)s
+                ) nn
+                ON CONFLICT (resume_id, job_id)
+                DO UPDATE SET
+                    score = EXCLUDED.score,
+                    explanation = EXCLUDED.explanation,
+                    metadata = EXCLUDED.metadata
+                """,
+                {
+                    "resume_id": resume_id,
+                    "metadata": Json(metadata),
+                    "embedding": extraction["embedding"],
+                    "top_k": top_k,
+                    **filter_params,
+                },
+                # one prepared statement per filter combination
+                prepare=PREPARE_HOT,
+            )
+            saved = cur.rowcount
+
+            jobs: list[dict[str, Any]] = []
+            if display_limit > 0:
+                jobs = _fetch_match_display_rows(cur, resume_id, display_limit)
+
+    bump_generation("matches")
+    return {
+        "extraction_id": extraction["id"],
+        "matches_cleared": cleared,
+        "matches_saved": saved,
+        "jobs": jobs,
+    }
+
+
+# Reciprocal rank fusion constant and how many candidates each retriever contributes
+HYBRID_RRF_K: int = int(os.getenv("HYBRID_RRF_K", "60"))
+HYBRID_CANDIDATES: int = int(os.getenv("HYBRID_CANDIDATES", "200"))
+
+
+@timed_stage("match")
+def hybrid_score_and_fetch_matches(
+    resume_id: int,
+    lexical_query_for: Callable[[Dict[str, Any]], str],
+    top_k: int = MATCHES_TOP_K,
+    display_limit: int = 10,
+    candidates: int = HYBRID_CANDIDATES,
+    rrf_k: int = HYBRID_RRF_K,
+    prefilter: bool = False,
+    target_recall: Optional[float] = None,
+    filters: Optional[MatchFilters] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Like score_and_fetch_matches, but fuses two retrievers with reciprocal rank fusion:
+      - lexical: jobs.search_tsv (GIN) against the resume keywords, ranked by ts_rank_cd
+      - vector: cosine ANN over jobs.embedding
+    score = sum(1 / (rrf_k + rank)) over the retrievers that returned the job, so jobs without
+    an embedding (e.g. Simplify listings) can still match on keywords.
+
+    `lexical_query_for(extracted_json)` returns websearch_to_tsquery text. With prefilter=True
+    the vector side only ranks the lexical candidates (exact cosine over a few hundred rows)
+    instead of searching the whole table. Filters apply to both retrievers.
+    Returns None if the resume has no embedded extraction.
+    """
+    filter_sql, filter_params = _match_filter_sql(filters)
+    filters_json = filters.as_dict() if filter_sql else None
+
+    with extensions.get_db_pool().connection() as conn:
+        with conn.cursor(row_factory=dict_row) as cur:
+            cur.execute(
+                """
+                SELECT id, extracted_json, embedding
+                FROM resume_extractions
+                WHERE resume_id = %s
+                  AND embedding IS NOT NULL
+                ORDER BY created_at DESC, id DESC
+                LIMIT 1
+                """,
+                (resume_id,),
+                prepare=PREPARE_HOT,
+            )
+            extraction = cur.fetchone()
+            if extraction is None:
+                return None
+
+            lexical_query = lexical_query_for(extraction["extracted_json"] or {})
+            embedding = extraction["embedding"]
+            # Nothing to prefilter with if the extraction has no usable keywords
+            prefilter = prefilter and bool(lexical_query.strip())
+
+            if prefilter:
+                vector_cte = """
+                    vec AS (
+                        SELECT j.id, ROW_NUMBER() OVER (ORDER BY j.embedding <=> %(embedding)s::vector) AS rank,
+                               1 - (j.embedding <=> %(embedding)s::vector) AS similarity
+                        FROM lex
+                        JOIN jobs j ON j.id = lex.id
+                        WHERE j.embedding IS NOT NULL
+                    )
+                """
+            else:
+                apply_search_params(
+                    cur, "jobs", target_recall=target_recall, top_k=candidates, filtered=bool(filter_sql)
+                )
+                vector_cte = """
+                    vec AS (
+                        SELECT id, ROW_NUMBER() OVER (ORDER BY distance) AS rank, 1 - distance AS similarity
+                        FROM (
+                            SELECT j.id, j.embedding <=> %(embedding)s::vector AS distance
+                            FROM jobs j
+                            WHERE j.is_active = TRUE
+                              AND j.embedding IS NOT NULL""" + filter_sql + """
+                            ORDER BY j.embedding <=> %(embedding)s::vector
+                            LIMIT %(candidates)s
+                        ) nn
+                    )
+                """
+
+            cur.execute("DELETE FROM matches WHERE resume_id = %s", (resume_id,))
+            cleared = cur.rowcount
+
+            cur.execute(
+                """
+                WITH q AS (
+                    SELECT websearch_to_tsquery('simple', %(lexical_query)s) AS query
+                ),
+                lex AS (
+                    SELECT id, ROW_NUMBER() OVER (ORDER BY lexical_score DESC, id) AS rank, lexical_score
+                    FROM (
+                        SELECT j.id, ts_rank_cd(j.search_tsv, q.query) AS lexical_score
+                        FROM jobs j, q
+                        WHERE j.is_active = TRUE
+                          AND j.search_tsv @@ q.query"""
+                + filter_sql
+                + """
+                        ORDER BY lexical_score DESC
+                        LIMIT %(candidates)s
+                    ) ranked
+                ),
+                """
+                + vector_cte
+                + """
+                INSERT INTO matches (resume_id, job_id, score, explanation, metadata)
                 SELECT
-                    m.id AS match_id,
-                    m.resume_id,
-                    m.job_id,
-                    m.score,
-                    m.explanation,
-                    m.metadata,
-                    m.created_at AS matched_at,
-                    j.title,
-                    j.company,
-                    j.location,
-                    j.url,
-                    j.apply_url,
-                    j.description,
-                    j.tags,
-                    j.date_posted
-                FROM matches m
-                JOIN jobs j ON j.id = m.job_id
-                WHERE m.resume_id = %s
-                  AND j.is_active = TRUE
-                ORDER BY m.score DESC, j.date_posted DESC NULLS LAST, m.created_at DESC
-                LIMIT %s
+                    %(resume_id)s,
+                    COALESCE(vec.id, lex.id),
+                    COALESCE(1.0 / (%(rrf_k)s + vec.rank), 0) + COALESCE(1.0 / (%(rrf_k)s + lex.rank), 0) AS rrf,
+                    NULL,
+                    jsonb_strip_nulls(jsonb_build_object(
+                        'retrieval', 'hybrid',
+                        'vector_rank', vec.rank,
+                        'similarity', vec.similarity,
+                        'lexical_rank', lex.rank,
+                        'lexical_score', lex.lexical_score,
+                        'filters', %(filters)s::jsonb
+                    ))
+                FROM vec
+                FULL OUTER JOIN lex ON lex.id = vec.id
+                ORDER BY rrf DESC
+                LIMIT %(top_k)s
+                ON CONFLICT (resume_id, job_id)
+                DO UPDATE SET
+                    score = EXCLUDED.score,
+                    explanation = EXCLUDED.explanation,
+                    metadata = EXCLUDED.metadata
                 """,
-                (resume_id, safe_limit),
+                {
+                    "resume_id": resume_id,
+                    "lexical_query": lexical_query,
+                    "embedding": embedding,
+                    "candidates": candidates,
+                    "rrf_k": rrf_k,
+                    "top_k": top_k,
+                    "filters": Json(filters_json) if filters_json else None,
+                    **filter_params,
+                },
+                # one prepared statement per filter combination and prefilter mode
+                prepare=PREPARE_HOT,
             )
-            rows = cur.fetchall()
+            saved = cur.rowcount
+
+            jobs: list[dict[str, Any]] = []
+            if display_limit > 0:
+                jobs = _fetch_match_display_rows(cur, resume_id, display_limit)
+
+    bump_generation("matches")
+    return {
+        "extraction_id": extraction["id"],
+        "matches_cleared": cleared,
+        "matches_saved": saved,
+        "jobs": jobs,
+    }
+
+#-------------------Service functions for the LLM extraction cache----------------------------
+
+def get_llm_cache_entry(cache_key: str, ttl_seconds: int) -> Optional[Dict[str, Any]]:
+    # Return a cached LLM response younger than ttl_seconds, bumping its hit stats
+    with extensions.get_db_pool().connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                UPDATE llm_extraction_cache
+                SET hit_count = hit_count + 1,
+                    last_hit_at = NOW()
+                WHERE cache_key = %s
+                  AND created_at >= NOW() - (%s || ' seconds')::interval
+                RETURNING response
+                """,
+                (cache_key, ttl_seconds),
+            )
+            row = cur.fetchone()
+    return row[0] if row else None
+
+
+def upsert_llm_cache_entry(cache_key: str, model_name: str, response: Dict[str, Any]) -> None:
+    with extensions.get_db_pool().connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO llm_extraction_cache (cache_key, model_name, response)
+                VALUES (%s, %s, %s)
+                ON CONFLICT (cache_key)
+                DO UPDATE SET
+                    model_name = EXCLUDED.model_name,
+                    response = EXCLUDED.response,
+                    created_at = NOW()
+                """,
+                (cache_key, model_name, Json(response)),
+            )
+
+
+def prune_llm_cache(ttl_seconds: int, max_rows: int) -> int:
+    # Drop expired entries, then the least recently used ones beyond max_rows
+    with extensions.get_db_pool().connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                DELETE FROM llm_extraction_cache
+                WHERE created_at < NOW() - (%s || ' seconds')::interval
+                """,
+                (ttl_seconds,),
+            )
+            removed = cur.rowcount
+            cur.execute(
+                """
+                DELETE FROM llm_extraction_cache
+                WHERE cache_key IN (
+                    SELECT cache_key
+                    FROM llm_extraction_cache
+                    ORDER BY COALESCE(last_hit_at, created_at) DESC
+                    OFFSET %s
+                )
+                """,
+                (max_rows,),
+            )
+            removed += cur.rowcount
+    return removed
+
+#-------------------Service functions for background resume tasks----------------------------
+
+def create_resume_task(task_id: str, filename: Optional[str], auto_score: bool = False) -> None:
+    with extensions.get_db_pool().connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO resume_tasks (id, status, filename, auto_score)
+                VALUES (%s, 'queued', %s, %s)
+                """,
+                (task_id, filename, auto_score),
+            )
+
+
+def start_resume_task(task_id: str) -> None:
+    # A worker picked the task up
+    with extensions.get_db_pool().connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                UPDATE resume_tasks
+                SET status = 'running',
+                    updated_at = NOW()
+                WHERE id = %s
+                  AND status = 'queued'
+                """,
+                (task_id,),
+            )
+
+
+def add_resume_task_stage(task_id: str, stage: str) -> None:
+    # Record one completed stage; also flips a queued task to running
+    with extensions.get_db_pool().connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                UPDATE resume_tasks
+                SET status = 'running',
+                    stages = stages || %s::jsonb,
+                    updated_at = NOW()
+                WHERE id = %s
+                """,
+                (json.dumps([stage]), task_id),
+            )
+
+
+def finish_resume_task(
+    task_id: str,
+    status: str,
+    result: Optional[Dict[str, Any]] = None,
+    error: Optional[str] = None,
+) -> None:
+    result = result or {}
+    with extensions.get_db_pool().connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                UPDATE resume_tasks
+                SET status = %s,
+                    resume_id = %s,
+                    extraction_id = %s,
+                    result = %s,
+                    error = %s,
+                    updated_at = NOW()
+                WHERE id = %s
+                """,
+                (
+                    status,
+                    result.get("resume_id"),
+                    result.get("extraction_id"),
+                    Json(result) if result else None,
+                    error,
+                    task_id,
+                ),
+            )
+
+
+def get_resume_task(task_id: str) -> Optional[dict[str, Any]]:
+    with extensions.get_db_pool().connection() as conn:
+        with conn.cursor(row_factory=dict_row) as cur:
+            cur.execute(
+                """
+                SELECT id, status, stages, filename, auto_score,
+                       resume_id, extraction_id, result, error,
+                       created_at, updated_at
+                FROM resume_tasks
+                WHERE id = %s
+                """,
+                (task_id,),
+            )
+            row = cur.fetchone()
 
-    for row in rows:
-        if row.get("matched_at"):
-            row["matched_at"] = row["matched_at"].isoformat()
-        if row.get("date_posted"):
-            row["date_posted"] = row["date_posted"].isoformat()
-    return rows
+    if row:
+        for dt_key in ("created_at", "updated_at"):
+            if row.get(dt_key):
+                row[dt_key] = row[dt_key].isoformat()
+    return row
 
 #-------------------Service functions for syncing RemoteOK and SimplifyJobs----------------------------
 
 # --------- RemoteOK API ---------
 REMOTEOK_API_URL: str = "https://remoteok.com/api"
 
-@dataclass(frozen=True)
-class RemoteOkJob:
-    """Normalized job record from RemoteOK."""
+class RemoteOkJob(NamedTuple):
+    """
+    Normalized job record from RemoteOK. Tuple-backed and in `jobs` column order, so a record
+    is written to the DB as a row with only the tags and embedding columns added.
+    """
     source: str
     source_job_id: str
     title: str
@@ -303,6 +1165,11 @@ class RemoteOkJob:
     salary_max: Optional[int]
 
 
+_REMOTEOK_TAGS_INDEX: int = RemoteOkJob._fields.index("tags")
+# Response bytes read per step while decoding the feed
+REMOTEOK_STREAM_CHUNK_BYTES: int = int(os.getenv("REMOTEOK_STREAM_CHUNK_BYTES", "65536"))
+
+
 def _parse_iso_datetime(dt_str: Optional[str]) -> Optional[datetime]:
     """
     RemoteOK returns ISO strings like: '2026-02-23T00:00:20+00:00'
@@ -321,11 +1188,98 @@ def _parse_iso_datetime(dt_str: Optional[str]) -> Optional[datetime]:
         return None
 
 
-def fetch_remoteok_jobs(limit: int = 1000) -> List[RemoteOkJob]:
+def _iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
     """
-    Fetch jobs from RemoteOK, normalize fields, sort newest first, cap at 'limit'.
+    Yield the elements of a top-level JSON array as its bytes arrive, so the whole document is
+    never held (or decoded into one list) at once. Only the element being decoded is buffered.
     """
-    resp = requests.get(
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    it = iter(chunks)
+    buf = ""
+    pos = 0
+    opened = False
+    eof = False
+
+    while True:
+        # Whitespace and element separators
+        while pos < len(buf) and buf[pos] in " \t\r\n,":
+            pos += 1
+
+        if pos < len(buf):
+            if not opened:
+                if buf[pos] != "[":
+                    raise RuntimeError("Unexpected RemoteOK API response format (expected list).")
+                opened = True
+                pos += 1
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # Most likely the element continues in the next chunk
+                if eof:
+                    raise
+            else:
+                # A bare number at the very end of the buffer may still be cut short
+                if end < len(buf) or eof:
+                    yield item
+                    pos = end
+                    continue
+        elif eof:
+            raise RuntimeError("RemoteOK API response ended before the JSON array was closed.")
+
+        chunk = next(it, None)
+        if chunk is None:
+            eof = True
+            buf = buf[pos:] + utf8.decode(b"", final=True)
+        else:
+            buf = buf[pos:] + utf8.decode(chunk)
+        pos = 0
+
+
+def _remoteok_job_from_item(item: Any) -> Optional[RemoteOkJob]:
+    # The first element often contains metadata/legal info, not a job record.
+    if not isinstance(item, dict):
+        return None
+    if "id" not in item or "position" not in item or "company" not in item or "url" not in item:
+        return None
+
+    tags_val = item.get("tags") or []
+    if not isinstance(tags_val, list):
+        tags_val = []
+
+    epoch = item.get("epoch")
+    salary_min = item.get("salary_min")
+    salary_max = item.get("salary_max")
+    job = RemoteOkJob(
+        "remoteok",
+        str(item.get("id")),
+        str(item.get("position") or "").strip(),
+        str(item.get("company") or "").strip(),
+        str(item["location"]).strip() if item.get("location") else None,
+        str(item.get("url") or "").strip(),
+        str(item["apply_url"]).strip() if item.get("apply_url") else None,
+        str(item["slug"]).strip() if item.get("slug") else None,
+        str(item["company_logo"]).strip() if item.get("company_logo") else None,
+        [t for t in (str(t).strip() for t in tags_val) if t],
+        str(item["description"]) if item.get("description") else None,
+        _parse_iso_datetime(item.get("date")),
+        int(epoch) if isinstance(epoch, (int, float, str)) and str(epoch).isdigit() else None,
+        int(salary_min) if isinstance(salary_min, (int, float)) else None,
+        int(salary_max) if isinstance(salary_max, (int, float)) else None,
+    )
+
+    # Basic sanity checks: title/company/url must exist
+    if not job.title or not job.company or not job.url or not job.source_job_id:
+        return None
+    return job
+
+
+def iter_remoteok_jobs() -> Iterator[RemoteOkJob]:
+    """Stream the RemoteOK feed, yielding normalized jobs as they are decoded."""
+    resp = get_http_session().get(
         REMOTEOK_API_URL,
         headers={
             "User-Agent": "Mozilla/5.0",
@@ -334,95 +1288,210 @@ def fetch_remoteok_jobs(limit: int = 1000) -> List[RemoteOkJob]:
             "Origin": "https://remoteok.com",
         },
         timeout=30,
+        stream=True,
     )
-    resp.raise_for_status()
-    data: Any = resp.json()
-
-    if not isinstance(data, list):
-        raise RuntimeError("Unexpected RemoteOK API response format (expected list).")
-
-    jobs: List[RemoteOkJob] = []
+    try:
+        resp.raise_for_status()
+        for item in _iter_json_array(resp.iter_content(chunk_size=REMOTEOK_STREAM_CHUNK_BYTES)):
+            job = _remoteok_job_from_item(item)
+            if job is not None:
+                yield job
+    finally:
+        resp.close()
 
-    for item in data:
-        # The first element often contains metadata/legal info, not a job record.
-        if not isinstance(item, dict):
-            continue
-        if "id" not in item or "position" not in item or "company" not in item or "url" not in item:
-            continue
 
-        tags_val = item.get("tags") or []
-        if not isinstance(tags_val, list):
-            tags_val = []
-
-        job = RemoteOkJob(
-            source="remoteok",
-            source_job_id=str(item.get("id")),
-            title=str(item.get("position") or "").strip(),
-            company=str(item.get("company") or "").strip(),
-            location=(str(item.get("location")).strip() if item.get("location") else None),
-            url=str(item.get("url") or "").strip(),
-            apply_url=(str(item.get("apply_url")).strip() if item.get("apply_url") else None),
-            slug=(str(item.get("slug")).strip() if item.get("slug") else None),
-            company_logo=(str(item.get("company_logo")).strip() if item.get("company_logo") else None),
-            tags=[str(t).strip() for t in tags_val if str(t).strip()],
-            description=(str(item.get("description")) if item.get("description") else None),
-            date_posted=_parse_iso_datetime(item.get("date")),
-            epoch=(int(item["epoch"]) if isinstance(item.get("epoch"), (int, float, str)) and str(item.get("epoch")).isdigit() else None),
-            salary_min=(int(item["salary_min"]) if isinstance(item.get("salary_min"), (int, float)) else None),
-            salary_max=(int(item["salary_max"]) if isinstance(item.get("salary_max"), (int, float)) else None),
-        )
+def _remoteok_sort_key(j: RemoteOkJob) -> int:
+    # Sort by epoch if present, else by date_posted, else push to bottom
+    if j.epoch is not None:
+        return j.epoch
+    if j.date_posted is not None:
+        return int(j.date_posted.timestamp())
+    return 0
 
-        # Basic sanity checks: title/company/url must exist
-        if not job.title or not job.company or not job.url or not job.source_job_id:
-            continue
 
-        jobs.append(job)
+def fetch_remoteok_jobs(limit: int = 1000) -> List[RemoteOkJob]:
+    """
+    Fetch jobs from RemoteOK, normalized and newest first, capped at 'limit'.
+    Only the newest `limit` jobs are kept while the feed streams in (a bounded heap).
+    """
+    # nlargest keeps ties in feed order, same as a stable sort + slice
+    return heapq.nlargest(max(0, int(limit)), iter_remoteok_jobs(), key=_remoteok_sort_key)
+
+def _rows_per_sec(rows: int, seconds: float) -> float:
+    # Throughput helper for sync stats; guards against zero-length timings
+    if seconds <= 0:
+        return 0.0
+    return round(rows / seconds, 2)
+
+
+# "copy" streams rows into a temp staging table and merges them with one statement;
+# "executemany" is the original row-by-row upsert, kept for comparison
+JOB_UPSERT_METHODS: Tuple[str, ...] = ("copy", "executemany")
+JOB_UPSERT_METHOD: str = os.getenv("JOB_UPSERT_METHOD", "copy")
+
+# Staging column types for jobs. Embeddings are staged as real[] and cast to vector on merge.
+_JOB_STAGE_COLUMN_TYPES: Dict[str, str] = {
+    "id": "BIGINT",
+    "source": "TEXT",
+    "source_job_id": "TEXT",
+    "title": "TEXT",
+    "company": "TEXT",
+    "location": "TEXT",
+    "url": "TEXT",
+    "apply_url": "TEXT",
+    "slug": "TEXT",
+    "company_logo": "TEXT",
+    "tags": "JSONB",
+    "description": "TEXT",
+    "date_posted": "TIMESTAMPTZ",
+    "epoch": "BIGINT",
+    "salary_min": "INTEGER",
+    "salary_max": "INTEGER",
+    "embedding": "REAL[]",
+    "embedding_hash": "TEXT",
+    "embedding_model": "TEXT",
+    "source_file": "TEXT",
+}
+
+
+def _stage_job_rows(cur, rows: List[Any], columns: List[str]) -> None:
+    """
+    COPY rows into a temp `jobs_stage` table that is dropped at commit.
+    Rows are dicts keyed by column, or tuples already in `columns` order.
+    `stage_ord` keeps input order so merges can let the last duplicate win, like executemany did.
+    """
+    column_defs = ", ".join(f"{c} {_JOB_STAGE_COLUMN_TYPES[c]}" for c in columns)
+    cur.execute("DROP TABLE IF EXISTS jobs_stage;")
+    cur.execute(f"CREATE TEMP TABLE jobs_stage (stage_ord BIGINT, {column_defs}) ON COMMIT DROP;")
+
+    with cur.copy(f"COPY jobs_stage (stage_ord, {', '.join(columns)}) FROM STDIN") as copy:
+        for i, row in enumerate(rows):
+            if isinstance(row, tuple):
+                copy.write_row((i, *row))
+            else:
+                copy.write_row((i, *(row[c] for c in columns)))
+
+
+def _upsert_job_chunks(
+    chunks: Iterable[List[Any]],
+    columns: List[str],
+    upsert_sql: str,
+    merge_sql: str,
+    upsert_method: str,
+    stats: SyncStats,
+    on_commit: Optional[Callable[[List[Any]], None]] = None,
+) -> Tuple[int, int, List[Dict[str, Any]]]:
+    """
+    Upsert each chunk of job rows (dicts, or tuples in `columns` order) in its own transaction.
+    A chunk that fails on bad data is rolled back and recorded, and the remaining chunks still run.
+    Returns (rows upserted, chunks committed, failed chunk details).
+    """
+    pool = extensions.get_sync_db_pool()
+    upserted = 0
+    committed = 0
+    failed: List[Dict[str, Any]] = []
 
-    # Sort by epoch if present, else by date_posted, else push to bottom
-    def sort_key(j: RemoteOkJob) -> int:
-        if j.epoch is not None:
-            return j.epoch
-        if j.date_posted is not None:
-            return int(j.date_posted.timestamp())
-        return 0
+    for index, chunk in enumerate(chunks):
+        with stats.stage("upsert", items=len(chunk)):
+            try:
+                with pool.connection() as conn:
+                    with conn.cursor() as cur:
+                        cur.execute("BEGIN;")
+                        try:
+                            if upsert_method == "copy":
+                                _stage_job_rows(cur, chunk, columns)
+                                cur.execute(merge_sql)
+                            else:
+                                cur.executemany(upsert_sql, chunk)
+                            cur.execute("COMMIT;")
+                        except Exception:
+                            cur.execute("ROLLBACK;")
+                            raise
+            except (psycopg.DataError, psycopg.IntegrityError) as e:
+                print(f"[WARN] Job upsert chunk {index} ({len(chunk)} rows) rolled back: {e}")
+                failed.append({
+                    "chunk": index,
+                    "rows": len(chunk),
+                    "first_source_job_id": (
+                        chunk[0][columns.index("source_job_id")] if isinstance(chunk[0], tuple)
+                        else chunk[0].get("source_job_id")
+                    ),
+                    "error": str(e)[:300],
+                })
+                continue
+
+        upserted += len(chunk)
+        committed += 1
+        if on_commit is not None:
+            on_commit(chunk)
+
+    return upserted, committed, failed
+
+
+def get_embedding_fingerprints(source: str, source_job_ids: List[str]) -> Dict[str, str]:
+    """
+    Bulk lookup of stored embedding fingerprints for one source.
+    Only rows embedded by the current model (and that still have a vector) are returned.
+    """
+    if not source_job_ids:
+        return {}
 
-    jobs.sort(key=sort_key, reverse=True)
+    with extensions.get_sync_db_pool().connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT source_job_id, embedding_hash
+                FROM jobs
+                WHERE source = %s
+                  AND source_job_id = ANY(%s)
+                  AND embedding IS NOT NULL
+                  AND embedding_hash IS NOT NULL
+                  AND embedding_model = %s
+                """,
+                (source, source_job_ids, EMBEDDING_MODEL_NAME),
+            )
+            return {row[0]: row[1] for row in cur.fetchall()}
 
-    # Cap results
-    return jobs[: max(0, int(limit))]
 
-def sync_remoteok_jobs(limit: int = 1000, inactive_after_days: int = 10) -> Dict[str, int]:
+def sync_remoteok_jobs(
+    limit: int = 1000,
+    inactive_after_days: int = 10,
+    embed_batch_size: int = EMBED_BATCH_SIZE,
+    upsert_method: str = JOB_UPSERT_METHOD,
+    update_matches: bool = True,
+    chunk_size: int = SYNC_CHUNK_SIZE,
+) -> Dict[str, Any]:
     """
     Sync RemoteOK jobs into the DB without deleting history.
 
-    - Upsert jobs seen in this fetch:
+    Runs as a pipeline: fetch -> fingerprint + embed (background thread) -> upsert, in chunks
+    of `chunk_size` rows that each commit on their own.
+
+    - Upsert jobs seen in this fetch (`upsert_method` "copy" or "executemany"):
         set is_active = TRUE, last_seen_at = NOW(), update core fields
-    - Mark jobs inactive if not seen for `inactive_after_days`.
+    - Embed new/changed jobs in batches of `embed_batch_size`; jobs whose
+      embedding text fingerprint is unchanged keep their stored vector
+    - Once every chunk has committed, mark jobs inactive if not seen for `inactive_after_days`.
+    - If `update_matches`, merge newly embedded jobs into existing matches
+      and remove matches to deactivated jobs.
     """
-    jobs = fetch_remoteok_jobs(limit=limit)
-    pool = extensions.get_db_pool()
+    if upsert_method not in JOB_UPSERT_METHODS:
+        raise ValueError(f"upsert_method must be one of {', '.join(JOB_UPSERT_METHODS)}")
 
-    upsert_sql = """
-        INSERT INTO jobs (
-            source, source_job_id,
-            title, company, location,
-            url, apply_url, slug, company_logo,
-            tags, description,
-            date_posted, epoch, salary_min, salary_max,
-            embedding,
-            is_active, last_seen_at,
-            created_at, updated_at
-        )
-        VALUES (
-            %(source)s, %(source_job_id)s,
-            %(title)s, %(company)s, %(location)s,
-            %(url)s, %(apply_url)s, %(slug)s, %(company_logo)s,
-            %(tags)s::jsonb, %(description)s,
-            %(date_posted)s, %(epoch)s, %(salary_min)s, %(salary_max)s,
-            %(embedding)s,
-            TRUE, NOW(),
-            NOW(), NOW()
-        )
+    started = time.perf_counter()
+    chunk_size = max(1, int(chunk_size))
+    stats = SyncStats()
+    memory = MemoryTracker().start()
+
+    with stats.stage("fetch") as fetch_stage:
+        jobs = fetch_remoteok_jobs(limit=limit)
+        fetch_stage.items = len(jobs)
+    pool = extensions.get_sync_db_pool()
+
+    # RemoteOkJob fields are the leading columns, so rows are built from records without dicts
+    upsert_columns = [*RemoteOkJob._fields, "embedding", "embedding_hash", "embedding_model"]
+
+    on_conflict_sql = """
         ON CONFLICT (source, source_job_id)
         DO UPDATE SET
             title = EXCLUDED.title,
@@ -438,70 +1507,175 @@ def sync_remoteok_jobs(limit: int = 1000, inactive_after_days: int = 10) -> Dict
             epoch = EXCLUDED.epoch,
             salary_min = EXCLUDED.salary_min,
             salary_max = EXCLUDED.salary_max,
-            embedding = EXCLUDED.embedding,
+            -- NULL embedding means the cached vector is still valid
+            embedding = COALESCE(EXCLUDED.embedding, jobs.embedding),
+            embedding_hash = EXCLUDED.embedding_hash,
+            embedding_model = EXCLUDED.embedding_model,
             is_active = TRUE,
             last_seen_at = NOW(),
             updated_at = NOW();
     """
 
+    upsert_sql = """
+        INSERT INTO jobs (
+            source, source_job_id,
+            title, company, location,
+            url, apply_url, slug, company_logo,
+            tags, description,
+            date_posted, epoch, salary_min, salary_max,
+            embedding, embedding_hash, embedding_model,
+            is_active, last_seen_at,
+            created_at, updated_at
+        )
+        VALUES (
+            %s, %s,
+            %s, %s, %s,
+            %s, %s, %s, %s,
+            %s::jsonb, %s,
+            %s, %s, %s, %s,
+            %s, %s, %s,
+            TRUE, NOW(),
+            NOW(), NOW()
+        )
+    """ + on_conflict_sql
+
+    # Set-based merge from the COPY staging table
+    merge_sql = """
+        INSERT INTO jobs (
+            source, source_job_id,
+            title, company, location,
+            url, apply_url, slug, company_logo,
+            tags, description,
+            date_posted, epoch, salary_min, salary_max,
+            embedding, embedding_hash, embedding_model,
+            is_active, last_seen_at,
+            created_at, updated_at
+        )
+        SELECT DISTINCT ON (s.source, s.source_job_id)
+            s.source, s.source_job_id,
+            s.title, s.company, s.location,
+            s.url, s.apply_url, s.slug, s.company_logo,
+            s.tags, s.description,
+            s.date_posted, s.epoch, s.salary_min, s.salary_max,
+            s.embedding::vector, s.embedding_hash, s.embedding_model,
+            TRUE, NOW(),
+            NOW(), NOW()
+        FROM jobs_stage s
+        ORDER BY s.source, s.source_job_id, s.stage_ord DESC
+    """ + on_conflict_sql
+
     deactivate_sql = """
         UPDATE jobs
         SET is_active = FALSE,
             updated_at = NOW()
         WHERE source = 'remoteok'
-          AND last_seen_at < NOW() - (%s || ' days')::interval;
+          AND is_active = TRUE
+          AND last_seen_at < NOW() - (%s || ' days')::interval
+        RETURNING id;
     """
 
-    rows: List[Dict[str, Any]] = []
-    for j in jobs:
-        text = build_job_embedding_text({
-            "title": j.title,
-            "company": j.company,
-            "description": j.description,
-            "tags": j.tags or []
-        })
-
-        embedding = embed_text(text)
-
-        rows.append(
-            {
-                "source": j.source,
-                "source_job_id": j.source_job_id,
-                "title": j.title,
-                "company": j.company,
-                "location": j.location,
-                "url": j.url,
-                "apply_url": j.apply_url,
-                "slug": j.slug,
-                "company_logo": j.company_logo,
-                "tags": json.dumps(j.tags),
-                "description": j.description,
-                "date_posted": j.date_posted,
-                "epoch": j.epoch,
-                "salary_min": j.salary_min,
-                "salary_max": j.salary_max,
-                "embedding": embedding,
-            }
-        )
-
-    with pool.connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute("BEGIN;")
-            try:
-                upserted = 0
-                if rows:
-                    cur.executemany(upsert_sql, rows)
-                    upserted = len(rows)
-
-                cur.execute(deactivate_sql, (inactive_after_days,))
-                deactivated = cur.rowcount
-
-                cur.execute("COMMIT;")
-            except Exception:
-                cur.execute("ROLLBACK;")
-                raise
+    counts = {"misses": 0, "embedded": 0}
+
+    def prepare_chunks() -> Iterator[List[tuple]]:
+        # Runs on the prefetch thread, so chunk N+1 is embedded while chunk N is written
+        for chunk in chunked(jobs, chunk_size):
+            with stats.stage("fingerprint", items=len(chunk)):
+                texts = [
+                    build_job_embedding_text({
+                        "title": j.title,
+                        "company": j.company,
+                        "description": j.description,
+                        "tags": j.tags or [],
+                    })
+                    for j in chunk
+                ]
+                fingerprints = [embedding_fingerprint(t) for t in texts]
+
+                # Only send new or changed texts to the model
+                stored = get_embedding_fingerprints("remoteok", [j.source_job_id for j in chunk])
+                miss_idx = [i for i, j in enumerate(chunk) if stored.get(j.source_job_id) != fingerprints[i]]
+
+            with stats.stage("embed", items=len(miss_idx)):
+                new_vectors = embed_texts([texts[i] for i in miss_idx], batch_size=embed_batch_size)
+            counts["misses"] += len(miss_idx)
+            counts["embedded"] += len(new_vectors)
+
+            embeddings: List[Optional[List[float]]] = [None] * len(chunk)
+            for i, vec in zip(miss_idx, new_vectors):
+                embeddings[i] = vec
+
+            # The record itself is the row: only tags (as JSON) and the embedding columns change
+            yield [
+                j[:_REMOTEOK_TAGS_INDEX]
+                + (json.dumps(j.tags),)
+                + j[_REMOTEOK_TAGS_INDEX + 1:]
+                + (embedding, fingerprint, EMBEDDING_MODEL_NAME)
+                for j, embedding, fingerprint in zip(chunk, embeddings, fingerprints)
+            ]
+
+    # Rows carrying a vector were (re-)embedded this run; cached rows carry None
+    embedded_source_ids: List[str] = []
+    source_id_index = upsert_columns.index("source_job_id")
+    embedding_index = upsert_columns.index("embedding")
+
+    def on_commit(rows: List[tuple]) -> None:
+        embedded_source_ids.extend(r[source_id_index] for r in rows if r[embedding_index] is not None)
+
+    upserted, committed, failed_chunks = _upsert_job_chunks(
+        prefetch(prepare_chunks(), name="remoteok-embed"),
+        upsert_columns, upsert_sql, merge_sql, upsert_method, stats, on_commit=on_commit,
+    )
 
-    return {"fetched": len(rows), "upserted": upserted, "deactivated": deactivated}
+    # A failed chunk's jobs were not marked seen; deactivating now could retire live jobs
+    complete = not failed_chunks
+    deactivated_ids: List[int] = []
+    if complete:
+        with stats.stage("deactivate"):
+            with pool.connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(deactivate_sql, (inactive_after_days,))
+                    deactivated_ids = [int(r[0]) for r in cur.fetchall()]
+    total_seconds = time.perf_counter() - started
+
+    # Cached /jobs and /matches responses are stale from here on
+    bump_generation("jobs")
+
+    # New embeddings can shift the ivfflat centroids a lot; rebuild when the table size moved enough
+    index_retune = maybe_retune_after_sync(len(embedded_source_ids))
+
+    # Fold newly embedded jobs into existing resumes' top-k and drop matches to deactivated jobs
+    matches_update = None
+    if update_matches:
+        changed_job_ids = get_job_ids_by_source_ids("remoteok", embedded_source_ids)
+        matches_update = update_matches_for_changed_jobs(changed_job_ids, deactivated_ids)
+
+    memory.stop()
+    observe_sync("remoteok", stats.as_dict())
+    embed_seconds = stats.seconds.get("embed", 0.0)
+    upsert_seconds = stats.seconds.get("upsert", 0.0)
+    return {
+        "fetched": len(jobs),
+        "upserted": upserted,
+        "deactivated": len(deactivated_ids),
+        "complete": complete,
+        "chunk_size": chunk_size,
+        "chunks_committed": committed,
+        "chunks_failed": failed_chunks,
+        "embedded": counts["embedded"],
+        "embedding_cache_hits": len(jobs) - counts["misses"],
+        "embedding_cache_misses": counts["misses"],
+        "embed_seconds": round(embed_seconds, 3),
+        "embed_rows_per_sec": _rows_per_sec(counts["embedded"], embed_seconds),
+        "upsert_method": upsert_method,
+        "upsert_seconds": round(upsert_seconds, 3),
+        "upsert_rows_per_sec": _rows_per_sec(upserted, upsert_seconds),
+        "elapsed_seconds": round(total_seconds, 3),
+        "rows_per_sec": _rows_per_sec(upserted, total_seconds),
+        "stages": stats.as_dict(),
+        "memory": memory.as_dict(),
+        "index_retune": index_retune,
+        "matches_update": matches_update,
+    }
 
 # --------- SimplifyJobs New Grad ---------
 
@@ -532,256 +1706,493 @@ class SimplifyJob:
     date_posted: Optional[datetime]
 
 # The SimplifyJobs repo has a unique format where jobs are listed in markdown tables across the root README and archived files. The following functions handle fetching, parsing, and syncing these jobs into our database.
+
+# Compiled once: the parser runs these on every line / cell of 50k+ row files
+_SIMPLIFY_HEADING_RE = re.compile(r"^##\s+(.*?)(?:\s+New\s+Grad\s+Roles)?\s*$", re.IGNORECASE)
+_BR_RE = re.compile(r"<br(?: ?/)?>")
+_MD_LINK_RE = re.compile(r"\[[^\]]+\]\(([^)]+)\)")
+_AGE_RE = re.compile(r"^(\d+)\s*(d|w|mo)$")
+_AGE_UNIT_DAYS: Dict[str, int] = {"d": 1, "w": 7, "mo": 30}
+# HTML layout (<table> with <tr>/<td>), which upstream switches to at times
+_HTML_ROW_END_RE = re.compile(r"</tr\s*>", re.IGNORECASE)
+_HTML_CELL_RE = re.compile(r"<(t[dh])(?:\s[^>]*)?>(.*?)</t[dh]>", re.IGNORECASE | re.DOTALL)
+_HTML_HREF_RE = re.compile(r"""href\s*=\s*["']([^"']+)["']""", re.IGNORECASE)
+_HTML_SUMMARY_RE = re.compile(r"<summary(?:\s[^>]*)?>.*?</summary>", re.IGNORECASE | re.DOTALL)
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+
+SIMPLIFY_TABLE_COLUMNS: Tuple[str, ...] = ("company", "role", "location", "application", "age")
+SIMPLIFY_MAX_JOBS_PER_FILE: int = 100000
+
+# (company or None for a ↳ sub-row, company_url, title, location, application links, age)
+_SimplifyRow = Tuple[Optional[str], Optional[str], str, str, List[str], str]
+
+
 def _clean_md_cell(cell: str) -> str:
-    s = cell.strip()
-    s = s.replace("<br>", " ").replace("<br/>", " ").replace("<br />", " ")
-    s = re.sub(r"\s+", " ", s)
-    return s.strip()
+    # <br> variants and whitespace runs -> single spaces (str.split is much cheaper than a regex here)
+    if "<br" in cell:
+        cell = _BR_RE.sub(" ", cell)
+    return " ".join(cell.split())
 
-# Extract markdown links of the form [text](url) from a string. Return list of URLs.
-def _extract_all_md_links(text: str) -> List[str]:
-    return [m.group(1).strip() for m in re.finditer(r"\[[^\]]+\]\(([^)]+)\)", text)]
 
-# Extract the first markdown link URL from a string, or None if no links found.
-def _extract_first_md_link(text: str) -> Optional[str]:
-    links = _extract_all_md_links(text)
-    return links[0] if links else None
+def _clean_html_cell(cell: str) -> str:
+    # Drop <details> summaries ("5 locations"), then tags and entities
+    if "<" in cell:
+        if "<summary" in cell:
+            cell = _HTML_SUMMARY_RE.sub(" ", cell)
+        cell = _HTML_TAG_RE.sub(" ", cell)
+    if "&" in cell:
+        cell = html.unescape(cell)
+    return " ".join(cell.split())
+
 
 # Convert Simplify 'Age' strings like "3d", "1w", "2mo" to approximate posted date. Return None if unparseable.
-def _parse_age_to_date_posted(age_str: str) -> Optional[datetime]:
+def _parse_age_to_date_posted(age_str: str, now: Optional[datetime] = None) -> Optional[datetime]:
     """
     Convert Simplify 'Age' to approximate posted date.
     Examples: 0d, 3d, 1w, 2mo
     """
-    s = age_str.strip().lower()
-    now = datetime.now(timezone.utc)
+    m = _AGE_RE.match(age_str.strip().lower())
+    if m is None:
+        return None
+    now = now or datetime.now(timezone.utc)
+    return now - timedelta(days=_AGE_UNIT_DAYS[m.group(2)] * int(m.group(1)))
 
-    m = re.match(r"^(\d+)\s*d$", s)
-    if m:
-        return now - timedelta(days=int(m.group(1)))
 
-    m = re.match(r"^(\d+)\s*w$", s)
-    if m:
-        return now - timedelta(days=7 * int(m.group(1)))
+def _md_row_fields(row: str) -> Optional[_SimplifyRow]:
+    parts = row.split("|")
+    # "| a | b | c | d | e |" splits into 7 parts; fewer means fewer than 5 cells
+    if len(parts) < 7:
+        return None
+    company_cell, role_cell, location_cell, app_cell, age_cell = parts[1:6]
 
-    m = re.match(r"^(\d+)\s*mo$", s)
-    if m:
-        return now - timedelta(days=30 * int(m.group(1)))
+    company: Optional[str] = _clean_md_cell(company_cell)
+    company_url: Optional[str] = None
+    if company.startswith("↳") or company == "":
+        company = None
+    else:
+        m = _MD_LINK_RE.search(company_cell)
+        company_url = m.group(1).strip() if m else None
 
-    return None
+    links = [u.strip() for u in _MD_LINK_RE.findall(app_cell)]
+    return company, company_url, _clean_md_cell(role_cell), _clean_md_cell(location_cell), links, _clean_md_cell(age_cell)
 
-# Helper to fetch markdown text from a URL with retries and error handling.
-def _requests_get_text(url: str, timeout_s: int = 30) -> str:
-    resp = requests.get(
-        url,
-        headers={
-            "User-Agent": "CWRU-Capstone-JobFetcher/1.0",
-            "Accept": "text/plain, text/markdown, */*",
-        },
-        timeout=timeout_s,
-    )
+
+def _iter_html_table_rows(table_html: str) -> Iterator[_SimplifyRow]:
+    # Columns are located from the <th> header row; tables without all of them are skipped
+    columns: Optional[List[int]] = None
+    # Splitting on </tr> is much cheaper than a lazy DOTALL match per row
+    for row_html in _HTML_ROW_END_RE.split(table_html):
+        cells = _HTML_CELL_RE.findall(row_html)
+        if not cells:
+            continue
+        if cells[0][0].lower() == "th":
+            names = [_clean_html_cell(content).lower() for _, content in cells]
+            columns = [names.index(c) if c in names else -1 for c in SIMPLIFY_TABLE_COLUMNS]
+            if -1 in columns:
+                return
+            continue
+        if columns is None or len(cells) <= max(columns):
+            continue
+
+        company_cell, role_cell, location_cell, app_cell, age_cell = (cells[c][1] for c in columns)
+        company: Optional[str] = _clean_html_cell(company_cell)
+        company_url: Optional[str] = None
+        if company.startswith("↳") or company == "":
+            company = None
+        else:
+            m = _HTML_HREF_RE.search(company_cell)
+            company_url = html.unescape(m.group(1).strip()) if m else None
+
+        links = [html.unescape(u.strip()) for u in _HTML_HREF_RE.findall(app_cell)]
+        yield company, company_url, _clean_html_cell(role_cell), _clean_html_cell(location_cell), links, _clean_html_cell(age_cell)
+
+
+# Helper to fetch markdown text from a URL (retries come from the shared HTTP session).
+# Conditional GET: sends If-None-Match when we have an ETag from a previous sync.
+# Returns (text, etag); text is None when the server answers 304 Not Modified.
+def _requests_get_text_conditional(
+    url: str, etag: Optional[str] = None, timeout_s: int = 30
+) -> Tuple[Optional[str], Optional[str]]:
+    headers = {
+        "User-Agent": "CWRU-Capstone-JobFetcher/1.0",
+        "Accept": "text/plain, text/markdown, */*",
+    }
+    if etag:
+        headers["If-None-Match"] = etag
+
+    resp = get_http_session().get(url, headers=headers, timeout=timeout_s)
+    if resp.status_code == 304:
+        return None, etag
     resp.raise_for_status()
-    return resp.text
+    return resp.text, resp.headers.get("ETag")
+
+
+@dataclass(frozen=True)
+class SimplifyMarkdownSource:
+    """One upstream markdown file. `markdown` is None when it is unchanged since the last sync."""
+    name: str
+    markdown: Optional[str]
+    etag: Optional[str] = None
+    blob_sha: Optional[str] = None
+
+    @property
+    def unchanged(self) -> bool:
+        return self.markdown is None
+
+
+# Recorded in `failed` when the archived/ listing itself could not be fetched
+SIMPLIFY_ARCHIVED_LISTING: str = "archived/"
+
+# Concurrency and per-request timeout for downloading archived READMEs
+SIMPLIFY_FETCH_WORKERS: int = int(os.getenv("SIMPLIFY_FETCH_WORKERS", "8"))
+SIMPLIFY_FETCH_TIMEOUT_S: int = int(os.getenv("SIMPLIFY_FETCH_TIMEOUT_S", "30"))
 
-def fetch_simplify_markdown_sources() -> List[Tuple[str, str]]:
+
+def fetch_simplify_markdown_sources(
+    known: Optional[Dict[str, Dict[str, Optional[str]]]] = None,
+    max_workers: int = SIMPLIFY_FETCH_WORKERS,
+    timeout_s: int = SIMPLIFY_FETCH_TIMEOUT_S,
+    failed: Optional[List[str]] = None,
+) -> List[SimplifyMarkdownSource]:
     """
     Fetch ALL markdown sources containing listings:
-      - root README.md (dev)
-      - every archived/*.md discovered via GitHub contents API (dev)
-    Returns list of (name, markdown_text).
+      - root README.md (dev), via a conditional request on its stored ETag
+      - every archived/*.md discovered via GitHub contents API (dev); files whose
+        blob SHA matches the stored one are not downloaded at all
+    `known` maps source name -> {"etag", "blob_sha"} from the previous sync.
+
+    Archived files download concurrently on `max_workers` threads with a per-file
+    timeout. A file that fails is left out (its name is appended to `failed` if given, or
+    SIMPLIFY_ARCHIVED_LISTING if the listing failed); the sources that succeeded are still returned.
     """
-    sources: List[Tuple[str, str]] = []
+    known = known or {}
+    sources: List[SimplifyMarkdownSource] = []
 
     # 1) Root README
-    root_md = _requests_get_text(SIMPLIFY_RAW_ROOT_README)
-    sources.append(("README.md", root_md))
+    root_state = known.get("README.md") or {}
+    root_md, root_etag = _requests_get_text_conditional(
+        SIMPLIFY_RAW_ROOT_README, etag=root_state.get("etag"), timeout_s=timeout_s
+    )
+    sources.append(SimplifyMarkdownSource(name="README.md", markdown=root_md, etag=root_etag))
 
     # 2) Discover archived READMEs using GitHub API
     try:
-        data = requests.get(
+        data = get_http_session().get(
             GITHUB_CONTENTS_ARCHIVED_URL,
             headers={"User-Agent": "CWRU-Capstone-JobFetcher/1.0", "Accept": "application/json"},
-            timeout=30,
+            timeout=timeout_s,
         )
         data.raise_for_status()
         items: Any = data.json()
+    except Exception as e:
+        # If GitHub contents API fails (rate limit etc.), we still have root README.
+        print(f"[WARN] Failed to list archived READMEs: {e}")
+        if failed is not None:
+            failed.append(SIMPLIFY_ARCHIVED_LISTING)
+        return sources
+
+    if not isinstance(items, list):
+        if failed is not None:
+            failed.append(SIMPLIFY_ARCHIVED_LISTING)
+        return sources
+
+    # (source_name, download_url, blob_sha, stored etag) for files that need downloading
+    to_download: List[Tuple[str, str, Optional[str], Optional[str]]] = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        name = str(item.get("name", ""))
+        # only markdown files
+        if not name.lower().endswith(".md"):
+            continue
+        # prefer README-like archived files
+        if "readme" not in name.lower():
+            continue
 
-        if isinstance(items, list):
-            for item in items:
-                if not isinstance(item, dict):
-                    continue
-                name = str(item.get("name", ""))
-                # only markdown files
-                if not name.lower().endswith(".md"):
-                    continue
-                # prefer README-like archived files
-                if "readme" not in name.lower():
-                    continue
+        source_name = f"archived/{name}"
+        blob_sha = item.get("sha") if isinstance(item.get("sha"), str) else None
+        state = known.get(source_name) or {}
 
-                download_url = item.get("download_url")
-                if isinstance(download_url, str) and download_url:
-                    md = _requests_get_text(download_url)
-                    sources.append((f"archived/{name}", md))
-    except Exception:
-        # If GitHub contents API fails (rate limit etc.), we still have root README.
-        pass
+        # Same git blob as last time -> content is identical, skip the download
+        if blob_sha and state.get("blob_sha") == blob_sha:
+            sources.append(SimplifyMarkdownSource(
+                name=source_name, markdown=None, etag=state.get("etag"), blob_sha=blob_sha
+            ))
+            continue
+
+        download_url = item.get("download_url")
+        if isinstance(download_url, str) and download_url:
+            to_download.append((source_name, download_url, blob_sha, state.get("etag")))
+
+    if not to_download:
+        return sources
+
+    downloaded: Dict[str, SimplifyMarkdownSource] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(to_download)))) as executor:
+        futures = {
+            executor.submit(_requests_get_text_conditional, url, etag, timeout_s): (source_name, blob_sha)
+            for source_name, url, blob_sha, etag in to_download
+        }
+        for future in as_completed(futures):
+            source_name, blob_sha = futures[future]
+            try:
+                md, etag = future.result()
+            except Exception as e:
+                print(f"[WARN] Failed to fetch {source_name}: {e}")
+                if failed is not None:
+                    failed.append(source_name)
+                continue
+            downloaded[source_name] = SimplifyMarkdownSource(
+                name=source_name, markdown=md, etag=etag, blob_sha=blob_sha
+            )
+
+    # Keep the listing order so dedup (last one wins) is deterministic
+    for source_name, _, _, _ in to_download:
+        if source_name in downloaded:
+            sources.append(downloaded[source_name])
 
     return sources
 
 
-def parse_simplify_jobs_from_markdown(readme_md: str, max_jobs: int = 100000) -> List[SimplifyJob]:
+def get_sync_source_state(source: str) -> Dict[str, Dict[str, Optional[str]]]:
+    # Load stored ETag / blob SHA per upstream file for a sync source
+    with extensions.get_sync_db_pool().connection() as conn:
+        with conn.cursor(row_factory=dict_row) as cur:
+            cur.execute(
+                """
+                SELECT name, etag, blob_sha
+                FROM sync_sources
+                WHERE source = %s
+                """,
+                (source,),
+            )
+            return {
+                row["name"]: {"etag": row["etag"], "blob_sha": row["blob_sha"]}
+                for row in cur.fetchall()
+            }
+
+
+def iter_simplify_jobs_from_markdown(
+    readme_md: str, max_jobs: Optional[int] = SIMPLIFY_MAX_JOBS_PER_FILE
+) -> Iterator[SimplifyJob]:
     """
-    Parse one markdown file. Extract all category tables.
+    Parse one markdown file in a single pass, yielding jobs from all category tables.
 
-    Expected table columns:
+    Expected table columns, either as a markdown table or an HTML <table>:
       | Company | Role | Location | Application | Age |
     """
+    now = datetime.now(timezone.utc)
+    # Ages repeat a lot ("0d", "1mo"), so each distinct one is parsed once
+    age_dates: Dict[str, Optional[datetime]] = {}
     lines = readme_md.splitlines()
-    jobs: List[SimplifyJob] = []
+    n = len(lines)
+    emitted = 0
 
     category: Optional[str] = None
     last_company: Optional[str] = None
     last_company_url: Optional[str] = None
 
     i = 0
-    while i < len(lines):
+    while i < n:
         line = lines[i].strip()
+        i += 1
 
         # Category header (works for common headings in the repo)
-        m = re.match(r"^##\s+(.*?)(?:\s+New\s+Grad\s+Roles)?\s*$", line, flags=re.IGNORECASE)
-        if m:
-            possible = m.group(1).strip()
-            # Skip generic headings that are not categories
-            if possible and "table of contents" not in possible.lower():
-                category = possible
-                last_company = None
-                last_company_url = None
-            i += 1
+        if line.startswith("##"):
+            m = _SIMPLIFY_HEADING_RE.match(line)
+            if m:
+                possible = m.group(1).strip()
+                # Skip generic headings that are not categories
+                if possible and "table of contents" not in possible.lower():
+                    category = possible
+                    last_company = None
+                    last_company_url = None
+                continue
+
+        if line.startswith("|"):
+            # Markdown table header; anything else starting with "|" is not ours
+            if not ("Company" in line and "Role" in line and "Location" in line and "Application" in line):
+                continue
+            i += 1  # separator line
+            start = i
+            while i < n and lines[i].lstrip().startswith("|"):
+                i += 1
+            rows: Iterator[_SimplifyRow] = (
+                fields for fields in map(_md_row_fields, lines[start:i]) if fields is not None
+            )
+        elif line[:6].lower() == "<table":
+            start = i - 1
+            while i < n and "</table>" not in lines[i - 1].lower():
+                i += 1
+            rows = _iter_html_table_rows("\n".join(lines[start:i]))
+        else:
             continue
 
-        # Table header
-        if line.startswith("|") and "Company" in line and "Role" in line and "Location" in line and "Application" in line:
-            # Skip separator line
-            i += 2
-
-            while i < len(lines):
-                row = lines[i].rstrip()
-                if not row.strip().startswith("|"):
-                    break
-
-                parts = [p.strip() for p in row.split("|")[1:-1]]
-                i += 1
+        tags: List[str] = ["newgrad"]
+        if category:
+            tags.append(f"category:{category}")
 
-                if len(parts) < 5:
+        for company, company_url, title, location, links, age in rows:
+            # Sub-rows that begin with ↳ (or have no company) inherit the previous company
+            if company is None:
+                if last_company is None:
                     continue
+                company, company_url = last_company, last_company_url
+            else:
+                last_company, last_company_url = company, company_url
 
-                company_cell, role_cell, location_cell, app_cell, age_cell = parts[:5]
-
-                # Handle sub-rows that begin with ↳ (inherit company)
-                company_text = _clean_md_cell(company_cell)
-                if company_text.startswith("↳") or company_text == "":
-                    if last_company is None:
-                        continue
-                    company = last_company
-                    company_url = last_company_url
-                    title = _clean_md_cell(_clean_md_cell(role_cell))
-                else:
-                    company = _clean_md_cell(re.sub(r"^↳\s*", "", company_text))
-                    company_url = _extract_first_md_link(company_cell)
-                    last_company = company
-                    last_company_url = company_url
-                    title = _clean_md_cell(role_cell)
-
-                location = _clean_md_cell(location_cell) or None
-
-                links = _extract_all_md_links(app_cell)
-
-                # Prefer non-simplify.jobs as apply_url if present
-                apply_url: Optional[str] = None
-                for u in links:
-                    if "simplify.jobs" not in u:
-                        apply_url = u
-                        break
-                if apply_url is None and links:
-                    apply_url = links[0]
-
-                # url must be NOT NULL per your schema
-                # Prefer company/simplify posting link if present, else fallback to apply_url
-                url = company_url or apply_url
-                if not url:
-                    continue
+            # Prefer non-simplify.jobs as apply_url if present
+            apply_url: Optional[str] = None
+            for u in links:
+                if "simplify.jobs" not in u:
+                    apply_url = u
+                    break
+            if apply_url is None and links:
+                apply_url = links[0]
+
+            # url must be NOT NULL per your schema
+            # Prefer company/simplify posting link if present, else fallback to apply_url
+            url = company_url or apply_url
+            if not url:
+                continue
+
+            if age not in age_dates:
+                age_dates[age] = _parse_age_to_date_posted(age, now)
+
+            yield SimplifyJob(
+                source="simplify_newgrad",
+                # Stable ID from URL
+                source_job_id=hashlib.sha256(url.encode("utf-8")).hexdigest(),
+                title=title,
+                company=company,
+                location=location or None,
+                url=url,
+                apply_url=apply_url,
+                tags=list(tags),
+                date_posted=age_dates[age],
+            )
 
-                date_posted = _parse_age_to_date_posted(_clean_md_cell(age_cell))
-
-                # Stable ID from URL (or fallback)
-                stable_key = url or f"{company}|{title}|{location or ''}|{category or ''}"
-                source_job_id = hashlib.sha256(stable_key.encode("utf-8")).hexdigest()
-
-                tags: List[str] = ["newgrad"]
-                if category:
-                    tags.append(f"category:{category}")
-
-                jobs.append(
-                    SimplifyJob(
-                        source="simplify_newgrad",
-                        source_job_id=source_job_id,
-                        title=title,
-                        company=company,
-                        location=location,
-                        url=url,
-                        apply_url=apply_url,
-                        tags=tags,
-                        date_posted=date_posted,
-                    )
-                )
+            emitted += 1
+            if max_jobs is not None and emitted >= max_jobs:
+                return
 
-                if len(jobs) >= max_jobs:
-                    return jobs
 
-            continue
+def parse_simplify_jobs_from_markdown(readme_md: str, max_jobs: int = SIMPLIFY_MAX_JOBS_PER_FILE) -> List[SimplifyJob]:
+    # List form of iter_simplify_jobs_from_markdown
+    return list(iter_simplify_jobs_from_markdown(readme_md, max_jobs=max_jobs))
 
-        i += 1
 
-    return jobs
+SIMPLIFY_SOURCE: str = "simplify_newgrad"
 
 
-def sync_simplify_jobs(limit: int = 1000, inactive_after_days: int = 10) -> Dict[str, int]:
+def _select_recent_unique_jobs(
+    entries: Iterable[Tuple[str, SimplifyJob]], limit: int
+) -> Tuple[List[Tuple[str, SimplifyJob]], int, set]:
+    """
+    Stream (source_file, job) pairs into the `limit` most recently posted unique jobs, newest
+    first. Memory is O(limit) jobs plus the seen ids. The first listing of a job wins, so the
+    root README (fetched first) takes precedence over archived copies.
+    Returns (selected, number of unique jobs seen, source files that had a job cut by `limit`).
+    """
+    seen: set = set()
+    truncated: set = set()
+    # Min-heap on (posted, -order): the oldest (and among equals the latest listed) is evicted first
+    heap: List[Tuple[int, int, str, SimplifyJob]] = []
+    for order, (name, job) in enumerate(entries):
+        if job.source_job_id in seen:
+            continue
+        seen.add(job.source_job_id)
+        posted = int(job.date_posted.timestamp()) if job.date_posted is not None else 0
+        item = (posted, -order, name, job)
+        if len(heap) < limit:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            truncated.add(heapq.heapreplace(heap, item)[2])
+        else:
+            truncated.add(name)
+
+    heap.sort(reverse=True)
+    return [(name, job) for _, _, name, job in heap], len(seen), truncated
+
+
+def sync_simplify_jobs(
+    limit: int = 1000,
+    inactive_after_days: int = 10,
+    force_full: bool = False,
+    upsert_method: str = JOB_UPSERT_METHOD,
+    update_matches: bool = True,
+    chunk_size: int = SYNC_CHUNK_SIZE,
+) -> Dict[str, Any]:
     """
     Sync SimplifyJobs across README + archived READMEs.
 
-    - Fetch all markdown sources
-    - Parse all jobs
-    - Deduplicate by source_job_id (stable hash)
-    - Upsert all (or capped) jobs into DB
-    - Mark inactive any simplify jobs not seen for inactive_after_days
+    Runs as a pipeline: fetch -> parse -> dedup -> upsert in chunks of `chunk_size` rows
+    that each commit on their own. Memory is bounded by `limit`, not by the size of the feed.
+
+    - Fetch all markdown sources (conditional on stored ETag / blob SHA unless `force_full`)
+    - Parse jobs from changed sources lazily
+    - Deduplicate by source_job_id (stable hash), keeping the `limit` most recent
+    - Upsert them (`upsert_method` "copy" or "executemany")
+    - Refresh last_seen_at for jobs from unchanged or failed sources in one statement, so a
+      file that keeps failing to download doesn't get its jobs deactivated
+    - Once every chunk has committed, save the validators of sources whose jobs all fit under
+      `limit` and mark inactive any simplify jobs not seen for inactive_after_days
+    - If `update_matches`, remove matches to deactivated jobs (Simplify jobs are not embedded)
     """
-    sources = fetch_simplify_markdown_sources()
+    if upsert_method not in JOB_UPSERT_METHODS:
+        raise ValueError(f"upsert_method must be one of {', '.join(JOB_UPSERT_METHODS)}")
 
-    # Parse all files
-    all_jobs: List[SimplifyJob] = []
-    for name, md in sources:
-        all_jobs.extend(parse_simplify_jobs_from_markdown(md))
+    started = time.perf_counter()
+    chunk_size = max(1, int(chunk_size))
+    stats = SyncStats()
+    memory = MemoryTracker().start()
 
-    # Deduplicate by source_job_id (same job can appear in multiple files)
-    dedup: Dict[str, SimplifyJob] = {}
-    for j in all_jobs:
-        dedup[j.source_job_id] = j
+    with stats.stage("fetch") as fetch_stage:
+        known = {} if force_full else get_sync_source_state(SIMPLIFY_SOURCE)
+        failed_sources: List[str] = []
+        sources = fetch_simplify_markdown_sources(known, failed=failed_sources)
+        fetch_stage.items = len(sources)
 
-    jobs_unique = list(dedup.values())
+    changed_sources = [src for src in sources if not src.unchanged]
+    skipped_sources = [src.name for src in sources if src.unchanged]
 
-    # Prefer more recent first (date_posted/age is approximate, but useful)
-    def sort_key(j: SimplifyJob) -> int:
-        if j.date_posted is not None:
-            return int(j.date_posted.timestamp())
-        return 0
-
-    jobs_unique.sort(key=sort_key, reverse=True)
+    # Parse changed files lazily, remembering which file each job came from
+    parsed = stats.timed("parse", (
+        (src.name, j) for src in changed_sources for j in iter_simplify_jobs_from_markdown(src.markdown)
+    ))
 
-    # Cap insert if requested
+    # Deduplicate and keep the most recent `cap` (date_posted/age is approximate, but useful)
     cap = max(1, min(limit, 50000))
-    jobs_unique = jobs_unique[:cap]
+    with stats.stage("dedup") as dedup_stage:
+        jobs_unique, unique_count, truncated_sources = _select_recent_unique_jobs(parsed, cap)
+        dedup_stage.items = unique_count
+
+    pool = extensions.get_sync_db_pool()
+
+    upsert_columns = [
+        "source", "source_job_id",
+        "title", "company", "location",
+        "url", "apply_url",
+        "tags",
+        "date_posted",
+        "source_file",
+    ]
 
-    pool = extensions.get_db_pool()
+    on_conflict_sql = """
+        ON CONFLICT (source, source_job_id)
+        DO UPDATE SET
+            is_active = TRUE,
+            title = EXCLUDED.title,
+            company = EXCLUDED.company,
+            location = EXCLUDED.location,
+            url = EXCLUDED.url,
+            apply_url = EXCLUDED.apply_url,
+            tags = EXCLUDED.tags,
+            date_posted = EXCLUDED.date_posted,
+            source_file = EXCLUDED.source_file,
+            last_seen_at = NOW(),
+            updated_at = NOW();
+    """
 
     upsert_sql = """
         INSERT INTO jobs (
@@ -790,6 +2201,7 @@ def sync_simplify_jobs(limit: int = 1000, inactive_after_days: int = 10) -> Dict
             url, apply_url,
             tags, description,
             date_posted, epoch, salary_min, salary_max,
+            source_file,
             last_seen_at, created_at, updated_at
         )
         VALUES (
@@ -798,20 +2210,51 @@ def sync_simplify_jobs(limit: int = 1000, inactive_after_days: int = 10) -> Dict
             %(url)s, %(apply_url)s,
             %(tags)s::jsonb, NULL,
             %(date_posted)s, NULL, NULL, NULL,
+            %(source_file)s,
             NOW(), NOW(), NOW()
         )
-        ON CONFLICT (source, source_job_id)
+    """ + on_conflict_sql
+
+    # Set-based merge from the COPY staging table
+    merge_sql = """
+        INSERT INTO jobs (
+            source, source_job_id, is_active,
+            title, company, location,
+            url, apply_url,
+            tags, description,
+            date_posted, epoch, salary_min, salary_max,
+            source_file,
+            last_seen_at, created_at, updated_at
+        )
+        SELECT DISTINCT ON (s.source, s.source_job_id)
+            s.source, s.source_job_id, TRUE,
+            s.title, s.company, s.location,
+            s.url, s.apply_url,
+            s.tags, NULL,
+            s.date_posted, NULL, NULL, NULL,
+            s.source_file,
+            NOW(), NOW(), NOW()
+        FROM jobs_stage s
+        ORDER BY s.source, s.source_job_id, s.stage_ord DESC
+    """ + on_conflict_sql
+
+    # Jobs from files that did not change, or could not be fetched this run, are still "seen".
+    # If the archived/ listing failed, every archived file counts as unfetched.
+    refresh_unchanged_sql = """
+        UPDATE jobs
+        SET last_seen_at = NOW()
+        WHERE source = 'simplify_newgrad'
+          AND (source_file = ANY(%s) OR (%s AND source_file LIKE 'archived/%%'));
+    """
+
+    save_source_sql = """
+        INSERT INTO sync_sources (source, name, etag, blob_sha, fetched_at)
+        VALUES (%s, %s, %s, %s, NOW())
+        ON CONFLICT (source, name)
         DO UPDATE SET
-            is_active = TRUE,
-            title = EXCLUDED.title,
-            company = EXCLUDED.company,
-            location = EXCLUDED.location,
-            url = EXCLUDED.url,
-            apply_url = EXCLUDED.apply_url,
-            tags = EXCLUDED.tags,
-            date_posted = EXCLUDED.date_posted,
-            last_seen_at = NOW(),
-            updated_at = NOW();
+            etag = EXCLUDED.etag,
+            blob_sha = EXCLUDED.blob_sha,
+            fetched_at = NOW();
     """
 
     deactivate_sql = """
@@ -819,45 +2262,99 @@ def sync_simplify_jobs(limit: int = 1000, inactive_after_days: int = 10) -> Dict
         SET is_active = FALSE,
             updated_at = NOW()
         WHERE source = 'simplify_newgrad'
-          AND last_seen_at < NOW() - (%s || ' days')::interval;
-    """
-
-    rows: List[Dict[str, Any]] = []
-    for j in jobs_unique:
-        rows.append(
-            {
-                "source": j.source,
-                "source_job_id": j.source_job_id,
-                "title": j.title,
-                "company": j.company,
-                "location": j.location,
-                "url": j.url,
-                "apply_url": j.apply_url,
-                "tags": json.dumps(j.tags),
-                "date_posted": j.date_posted,
-            }
-        )
+          AND is_active = TRUE
+          AND last_seen_at < NOW() - (%s || ' days')::interval
+        RETURNING id;
+    """
 
-    with pool.connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute("BEGIN;")
-            try:
-                if rows:
-                    cur.executemany(upsert_sql, rows)
+    rows = (
+        {
+            "source": j.source,
+            "source_job_id": j.source_job_id,
+            "title": j.title,
+            "company": j.company,
+            "location": j.location,
+            "url": j.url,
+            "apply_url": j.apply_url,
+            "tags": json.dumps(j.tags),
+            "date_posted": j.date_posted,
+            "source_file": name,
+        }
+        for name, j in jobs_unique
+    )
 
-                cur.execute(deactivate_sql, (inactive_after_days,))
-                deactivated = cur.rowcount
-                cur.execute("COMMIT;")
-            except Exception:
-                cur.execute("ROLLBACK;")
-                raise
+    upserted, committed, failed_chunks = _upsert_job_chunks(
+        chunked(rows, chunk_size), upsert_columns, upsert_sql, merge_sql, upsert_method, stats,
+    )
 
+    # A failed chunk's jobs were not marked seen: don't deactivate, and don't save validators
+    # so the next sync re-reads these files in full
+    complete = not failed_chunks
+    deactivated_ids: List[int] = []
+    refreshed = 0
+    with stats.stage("finalize"):
+        with pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("BEGIN;")
+                try:
+                    if skipped_sources or failed_sources:
+                        cur.execute(
+                            refresh_unchanged_sql,
+                            (skipped_sources + failed_sources, SIMPLIFY_ARCHIVED_LISTING in failed_sources),
+                        )
+                        refreshed = cur.rowcount
+
+                    # A file with jobs cut by `limit` keeps its old validator, so the next
+                    # sync reads it again instead of skipping it as unchanged
+                    saved_sources = [src for src in changed_sources if src.name not in truncated_sources]
+                    if complete and saved_sources:
+                        cur.executemany(
+                            save_source_sql,
+                            [(SIMPLIFY_SOURCE, src.name, src.etag, src.blob_sha) for src in saved_sources],
+                        )
+
+                    if complete:
+                        cur.execute(deactivate_sql, (inactive_after_days,))
+                        deactivated_ids = [int(r[0]) for r in cur.fetchall()]
+                    cur.execute("COMMIT;")
+                except Exception:
+                    cur.execute("ROLLBACK;")
+                    raise
+    total_seconds = time.perf_counter() - started
+
+    # Cached /jobs and /matches responses are stale from here on
+    bump_generation("jobs")
+
+    matches_update = None
+    if update_matches and deactivated_ids:
+        matches_update = update_matches_for_changed_jobs([], deactivated_ids)
+
+    memory.stop()
+    observe_sync(SIMPLIFY_SOURCE, stats.as_dict())
+    upsert_seconds = stats.seconds.get("upsert", 0.0)
     return {
         "sources": len(sources),
-        "parsed_total": len(all_jobs),
-        "unique": len(dedup),
-        "upserted": len(rows),
-        "deactivated": deactivated,
+        "sources_changed": len(changed_sources),
+        "sources_skipped": skipped_sources,
+        "sources_failed": sorted(failed_sources),
+        "sources_truncated": sorted(truncated_sources),
+        "parsed_total": stats.items.get("parse", 0),
+        "unique": unique_count,
+        "upserted": upserted,
+        "refreshed_unchanged": refreshed,
+        "deactivated": len(deactivated_ids),
+        "complete": complete,
+        "chunk_size": chunk_size,
+        "chunks_committed": committed,
+        "chunks_failed": failed_chunks,
+        "upsert_method": upsert_method,
+        "upsert_seconds": round(upsert_seconds, 3),
+        "upsert_rows_per_sec": _rows_per_sec(upserted, upsert_seconds),
+        "elapsed_seconds": round(total_seconds, 3),
+        "rows_per_sec": _rows_per_sec(upserted, total_seconds),
+        "stages": stats.as_dict(),
+        "memory": memory.as_dict(),
+        "matches_update": matches_update,
     }
 
 # --------- Embedding Functions ---------
@@ -875,22 +2372,73 @@ def embed_and_store_single_job(job):
         with conn.cursor() as cur:
             cur.execute("""
                 UPDATE jobs
-                SET embedding = %s
+                SET embedding = %s,
+                    embedding_hash = %s,
+                    embedding_model = %s,
+                    updated_at = NOW()
                 WHERE id = %s
-            """, (embedding, job["id"]))
+            """, (embedding, embedding_fingerprint(text), EMBEDDING_MODEL_NAME, job["id"]))
 
-def embed_and_store_jobs():
-    pool = extensions.get_db_pool()
+def embed_and_store_jobs(batch_size: int = EMBED_BATCH_SIZE, force: bool = False) -> Dict[str, Any]:
+    """
+    Embed active jobs in batches and write all vectors back on one connection.
+    Jobs whose stored fingerprint matches their current text are skipped unless `force`.
+    Writes go through the sync pool, like the other bulk writers.
+    """
+    pool = extensions.get_sync_db_pool()
+    started = time.perf_counter()
 
     jobs = list_active_jobs_for_matching()
     print(f"Found {len(jobs)} jobs")
 
-    for job in jobs:
-        embed_and_store_single_job(job)
+    texts = [build_job_embedding_text(job) for job in jobs]
+    fingerprints = [embedding_fingerprint(t) for t in texts]
+    miss_idx = [
+        i for i, job in enumerate(jobs)
+        if force
+        or job.get("embedding_model") != EMBEDDING_MODEL_NAME
+        or job.get("embedding_hash") != fingerprints[i]
+    ]
+
+    embeddings = embed_texts([texts[i] for i in miss_idx], batch_size=batch_size)
+
+    rows = [
+        {
+            "id": jobs[i]["id"],
+            "embedding": embedding,
+            "embedding_hash": fingerprints[i],
+            "embedding_model": EMBEDDING_MODEL_NAME,
+        }
+        for i, embedding in zip(miss_idx, embeddings)
+    ]
+
+    if rows:
+        with pool.connection() as conn:
+            with conn.cursor() as cur:
+                _stage_job_rows(cur, rows, ["id", "embedding", "embedding_hash", "embedding_model"])
+                cur.execute(
+                    """
+                    UPDATE jobs j
+                    SET embedding = s.embedding::vector,
+                        embedding_hash = s.embedding_hash,
+                        embedding_model = s.embedding_model,
+                        updated_at = NOW()
+                    FROM jobs_stage s
+                    WHERE j.id = s.id
+                    """
+                )
 
-    pool.close()
+    elapsed = time.perf_counter() - started
     print("Job embeddings stored successfully")
 
+    return {
+        "embedded": len(embeddings),
+        "embedding_cache_hits": len(jobs) - len(miss_idx),
+        "embedding_cache_misses": len(miss_idx),
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_sec": _rows_per_sec(len(embeddings), elapsed),
+    }
+
 def get_job_embedding(job_id: int) -> Optional[list[float]]:
     with extensions.get_db_pool().connection() as conn:
         with conn.cursor() as cur:
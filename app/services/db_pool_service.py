@@ -0,0 +1,104 @@
+"""
+Connection pools, sized and tuned from the environment.
+
+- The app pool serves request-path queries (matches, extractions, listings).
+- The sync pool serves job syncs, which hold a connection per chunk for as long as a large
+  Simplify sync runs. Giving them their own (small) pool keeps match reads from queuing
+  behind them. DB_SYNC_POOL_MAX_SIZE=0 makes syncs share the app pool instead.
+- Every new connection is configured once: statement_timeout, the psycopg prepare threshold,
+  and session defaults for ivfflat.probes / hnsw.ef_search (see configure_search_session).
+"""
+
+import os
+from typing import Callable, Optional
+import psycopg
+from psycopg_pool import ConnectionPool
+from app.extensions import extensions
+from app.services.vector_schema_service import configure_search_session
+
+
+DB_POOL_MIN_SIZE: int = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+DB_POOL_MAX_SIZE: int = int(os.getenv("DB_POOL_MAX_SIZE", "5"))
+# Seconds a caller waits for a connection before PoolTimeout
+DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "60"))
+# Connections are replaced after this many seconds, and idle ones above min_size closed after DB_POOL_MAX_IDLE
+DB_POOL_MAX_LIFETIME: float = float(os.getenv("DB_POOL_MAX_LIFETIME", "3600"))
+DB_POOL_MAX_IDLE: float = float(os.getenv("DB_POOL_MAX_IDLE", "600"))
+# Per-connection statement_timeout in milliseconds (0 = no limit)
+DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+
+DB_SYNC_POOL_MIN_SIZE: int = int(os.getenv("DB_SYNC_POOL_MIN_SIZE", "0"))
+DB_SYNC_POOL_MAX_SIZE: int = int(os.getenv("DB_SYNC_POOL_MAX_SIZE", "2"))
+# Syncs are background work: waiting for a connection is better than failing
+DB_SYNC_POOL_TIMEOUT: float = float(os.getenv("DB_SYNC_POOL_TIMEOUT", "300"))
+DB_SYNC_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_SYNC_STATEMENT_TIMEOUT_MS", "0"))
+
+# psycopg prepares a query server-side once it has run this many times on a connection.
+# "none" turns prepared statements off (needed behind PgBouncer in transaction mode).
+_prepare_threshold = os.getenv("DB_PREPARE_THRESHOLD", "5").strip().lower()
+DB_PREPARE_THRESHOLD: Optional[int] = None if _prepare_threshold in ("", "none", "off") else int(_prepare_threshold)
+
+# Pass as cursor.execute(..., prepare=PREPARE_HOT) for queries on the request hot path:
+# prepared on first use instead of after DB_PREPARE_THRESHOLD runs
+PREPARE_HOT: Optional[bool] = True if DB_PREPARE_THRESHOLD is not None else None
+
+
+def _make_configure(statement_timeout_ms: int) -> Callable[[psycopg.Connection], None]:
+    def configure(conn: psycopg.Connection) -> None:
+        # Runs once per new connection; it must be left idle (not in a transaction)
+        conn.prepare_threshold = DB_PREPARE_THRESHOLD
+        conn.execute("SELECT set_config('statement_timeout', %s, false)", (str(max(0, statement_timeout_ms)),))
+        conn.commit()
+        configure_search_session(conn)
+
+    return configure
+
+
+def create_pool(
+    conninfo: str,
+    name: str,
+    min_size: int,
+    max_size: int,
+    timeout: float,
+    statement_timeout_ms: int,
+) -> ConnectionPool:
+    # Opens in the background; call .wait() to block until min_size connections are ready
+    return ConnectionPool(
+        conninfo=conninfo,
+        name=name,
+        min_size=min_size,
+        max_size=max_size,
+        timeout=timeout,
+        open=True,
+        max_lifetime=DB_POOL_MAX_LIFETIME,
+        max_idle=DB_POOL_MAX_IDLE,
+        configure=_make_configure(statement_timeout_ms),
+    )
+
+
+def init_db_pools(conninfo: str) -> None:
+    """Create extensions.db_pool and, unless DB_SYNC_POOL_MAX_SIZE=0, extensions.sync_db_pool."""
+    extensions.db_pool = create_pool(
+        conninfo,
+        name="app",
+        min_size=DB_POOL_MIN_SIZE,
+        max_size=DB_POOL_MAX_SIZE,
+        timeout=DB_POOL_TIMEOUT,
+        statement_timeout_ms=DB_STATEMENT_TIMEOUT_MS,
+    )
+    if DB_SYNC_POOL_MAX_SIZE > 0:
+        extensions.sync_db_pool = create_pool(
+            conninfo,
+            name="sync",
+            min_size=min(DB_SYNC_POOL_MIN_SIZE, DB_SYNC_POOL_MAX_SIZE),
+            max_size=DB_SYNC_POOL_MAX_SIZE,
+            timeout=DB_SYNC_POOL_TIMEOUT,
+            statement_timeout_ms=DB_SYNC_STATEMENT_TIMEOUT_MS,
+        )
+
+
+def wait_db_pools() -> None:
+    for pool in (extensions.db_pool, extensions.sync_db_pool):
+        if pool is not None:
+            pool.wait()
+
@@ -1,15 +1,96 @@
 from dotenv import load_dotenv
+import hashlib
 import os
+import threading
+import time
 import numpy as np
-from typing import List
-from sentence_transformers import SentenceTransformer
+from typing import Any, Dict, List, Optional
+from app.services.metrics_service import timed_stage
 
 load_dotenv()
 
-model = SentenceTransformer("all-MiniLM-L6-v2")
-
+EMBEDDING_MODEL_NAME: str = "all-MiniLM-L6-v2"
+# Output size of EMBEDDING_MODEL_NAME; the pgvector columns must be declared with it
+EMBEDDING_DIMENSION: int = int(os.getenv("EMBEDDING_DIMENSION", "384"))
+
+# The model (and torch) load on first use, so processes that never embed stay light.
+# Use warmup_embedding_model() to load ahead of the first request.
+_model: Optional[Any] = None
+_model_lock = threading.Lock()
+_model_load_seconds: Optional[float] = None
+_model_error: Optional[str] = None
+_model_loading = False
+
+
+def get_embedding_model():
+    global _model, _model_load_seconds, _model_error, _model_loading
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                _model_loading = True
+                started = time.perf_counter()
+                try:
+                    # Imported here: sentence_transformers pulls in torch
+                    from sentence_transformers import SentenceTransformer
+                    _model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+                    _model_error = None
+                except Exception as e:
+                    _model_error = str(e)
+                    raise
+                finally:
+                    _model_loading = False
+                    _model_load_seconds = round(time.perf_counter() - started, 3)
+    return _model
+
+
+def warmup_embedding_model() -> Dict[str, Any]:
+    # Load the model and run one encode so the first real request doesn't pay for it
+    get_embedding_model().encode("warmup")
+    return embedding_model_status()
+
+
+def warmup_embedding_model_in_background() -> threading.Thread:
+    def _run() -> None:
+        try:
+            warmup_embedding_model()
+        except Exception as e:
+            print(f"[WARN] Embedding model warmup failed: {e}")
+
+    thread = threading.Thread(target=_run, name="embedding-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def embedding_model_status() -> Dict[str, Any]:
+    return {
+        "model_name": EMBEDDING_MODEL_NAME,
+        "loaded": _model is not None,
+        "loading": _model_loading,
+        "load_seconds": _model_load_seconds,
+        "error": _model_error,
+    }
+
+# Number of texts sent through the model per forward pass when embedding in bulk
+EMBED_BATCH_SIZE: int = int(os.getenv("EMBED_BATCH_SIZE", "64"))
+
+@timed_stage("embed")
 def embed_text(text: str) -> List[float]:
-    return model.encode(text).tolist()
+    return get_embedding_model().encode(text).tolist()
+
+# Embed many texts at once, chunked so memory stays bounded on large syncs.
+# Output order matches input order.
+@timed_stage("embed")
+def embed_texts(texts: List[str], batch_size: int = EMBED_BATCH_SIZE) -> List[List[float]]:
+    if not texts:
+        return []
+
+    batch_size = max(1, int(batch_size))
+    model = get_embedding_model()
+    vectors: List[List[float]] = []
+    for start in range(0, len(texts), batch_size):
+        chunk = texts[start:start + batch_size]
+        vectors.extend(model.encode(chunk, batch_size=batch_size).tolist())
+    return vectors
 
 
 # def cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
@@ -45,4 +126,9 @@ def build_job_embedding_text(job):
     Description: {job.get("description", "")}
 
     This role is for a {job["title"]} requiring skills in {tags_str}.
-    """
\ No newline at end of file
+    """
+
+# Stable fingerprint of an embedding input; stored next to the vector so unchanged
+# jobs can skip the model on the next sync
+def embedding_fingerprint(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
@@ -0,0 +1,41 @@
+from typing import Any, Dict, Optional, Tuple
+from app.extensions import extensions
+from app.services.embedding_service import embedding_model_status
+
+# Keep readiness probes fast even when the pool is exhausted or the DB is down
+READINESS_DB_TIMEOUT_S: float = 2.0
+
+
+def get_db_pool_status() -> Dict[str, Any]:
+    pool = getattr(extensions, "db_pool", None)
+    if pool is None:
+        return {"ready": False, "error": "db_pool not initialized"}
+
+    status: Dict[str, Any] = {"stats": pool.get_stats()}
+    try:
+        with pool.connection(timeout=READINESS_DB_TIMEOUT_S) as conn:
+            conn.execute("SELECT 1")
+        status["ready"] = True
+    except Exception as e:
+        status["ready"] = False
+        status["error"] = str(e)
+    return status
+
+
+def get_sync_db_pool_stats() -> Optional[Dict[str, Any]]:
+    # Reported but not probed: readiness only depends on the pool serving requests
+    pool = getattr(extensions, "sync_db_pool", None)
+    return None if pool is None else pool.get_stats()
+
+
+def get_readiness(require_model: bool = False) -> Tuple[Dict[str, Any], bool]:
+    db = get_db_pool_status()
+    model = embedding_model_status()
+
+    ok = db["ready"] and (model["loaded"] or not require_model)
+    return {
+        "status": "ready" if ok else "not_ready",
+        "db_pool": db,
+        "sync_db_pool": get_sync_db_pool_stats(),
+        "embedding_model": model,
+    }, ok
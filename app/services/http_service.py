@@ -0,0 +1,55 @@
+import os
+import threading
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Max keep-alive connections kept per host; should be >= the number of concurrent fetch workers
+HTTP_POOL_SIZE: int = int(os.getenv("HTTP_POOL_SIZE", "16"))
+HTTP_MAX_RETRIES: int = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+HTTP_BACKOFF_FACTOR: float = float(os.getenv("HTTP_BACKOFF_FACTOR", "0.5"))
+# Longest Retry-After we sleep for; a larger value is clamped so one 429 can't stall a sync
+HTTP_MAX_RETRY_AFTER_S: float = float(os.getenv("HTTP_MAX_RETRY_AFTER_S", "30"))
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+class _CappedRetry(Retry):
+    # urllib3 sleeps for whatever Retry-After says (GitHub can send an hour)
+    def get_retry_after(self, response) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, HTTP_MAX_RETRY_AFTER_S)
+
+
+def _build_session() -> requests.Session:
+    # Retry idempotent GETs on rate limits and transient server errors.
+    # Retry-After from 429/503 responses is honoured (up to HTTP_MAX_RETRY_AFTER_S)
+    # before falling back to exponential backoff.
+    retry = _CappedRetry(
+        total=HTTP_MAX_RETRIES,
+        backoff_factor=HTTP_BACKOFF_FACTOR,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Shared session so every upstream fetch reuses keep-alive connections
+def get_http_session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
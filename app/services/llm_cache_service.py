@@ -0,0 +1,112 @@
+"""
+Two-level cache for LLM skill-extraction responses.
+
+An in-memory LRU (per process) sits in front of the llm_extraction_cache table
+(shared by all processes). Both levels expire entries after LLM_CACHE_TTL_S.
+"""
+
+import copy
+import hashlib
+import os
+import re
+import threading
+import traceback
+from typing import Any, Dict, Optional
+from app.services.lru_cache import LruTtlCache
+from app.services.database_service import (
+    get_llm_cache_entry,
+    prune_llm_cache,
+    upsert_llm_cache_entry,
+)
+
+
+LLM_CACHE_TTL_S: int = int(os.getenv("LLM_CACHE_TTL_S", str(7 * 24 * 3600)))
+LLM_CACHE_MEMORY_MAX: int = int(os.getenv("LLM_CACHE_MEMORY_MAX", "512"))
+LLM_CACHE_DB_MAX_ROWS: int = int(os.getenv("LLM_CACHE_DB_MAX_ROWS", "50000"))
+# Prune the table once every N writes rather than on every write
+LLM_CACHE_PRUNE_EVERY: int = int(os.getenv("LLM_CACHE_PRUNE_EVERY", "100"))
+
+
+_memory = LruTtlCache(LLM_CACHE_MEMORY_MAX, LLM_CACHE_TTL_S)
+_stats_lock = threading.Lock()
+_stats: Dict[str, int] = {"memory_hits": 0, "db_hits": 0, "misses": 0, "writes": 0, "errors": 0}
+
+
+def _bump(counter: str) -> None:
+    with _stats_lock:
+        _stats[counter] += 1
+
+
+def _normalize(text: Optional[str]) -> str:
+    return re.sub(r"\s+", " ", (text or "").strip())
+
+
+def _normalize_intent(user_intent: Optional[str]) -> str:
+    return _normalize(user_intent).lower()
+
+
+def intent_key(user_intent: Optional[str], template: str) -> str:
+    # Hash of the intent and prompt template, normalized exactly as in llm_cache_key.
+    # Upload dedup keys use it so a template edit invalidates them along with the cache.
+    h = hashlib.sha256()
+    for part in (_normalize_intent(user_intent), template):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def llm_cache_key(resume_text: str, user_intent: Optional[str], template: str, model_name: str) -> str:
+    # Any change to the resume, intent, prompt template or model gives a new key
+    h = hashlib.sha256()
+    for part in (_normalize(resume_text), _normalize_intent(user_intent), template, model_name):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def get_cached_extraction(cache_key: str) -> Optional[Dict[str, Any]]:
+    value = _memory.get(cache_key)
+    if value is not None:
+        _bump("memory_hits")
+        return copy.deepcopy(value)
+
+    try:
+        value = get_llm_cache_entry(cache_key, LLM_CACHE_TTL_S)
+    except Exception:
+        # The cache must never break extraction - fall through to the LLM
+        traceback.print_exc()
+        _bump("errors")
+        value = None
+
+    if value is None:
+        _bump("misses")
+        return None
+
+    _bump("db_hits")
+    _memory.put(cache_key, value)
+    return copy.deepcopy(value)
+
+
+def store_cached_extraction(cache_key: str, model_name: str, value: Dict[str, Any]) -> None:
+    _memory.put(cache_key, copy.deepcopy(value))
+    try:
+        upsert_llm_cache_entry(cache_key, model_name, value)
+        with _stats_lock:
+            _stats["writes"] += 1
+            should_prune = _stats["writes"] % max(1, LLM_CACHE_PRUNE_EVERY) == 0
+        if should_prune:
+            prune_llm_cache(LLM_CACHE_TTL_S, LLM_CACHE_DB_MAX_ROWS)
+    except Exception:
+        traceback.print_exc()
+        _bump("errors")
+
+
+def get_llm_cache_stats() -> Dict[str, Any]:
+    with _stats_lock:
+        stats: Dict[str, Any] = dict(_stats)
+    lookups = stats["memory_hits"] + stats["db_hits"] + stats["misses"]
+    stats["hit_rate"] = round((stats["memory_hits"] + stats["db_hits"]) / lookups, 4) if lookups else 0.0
+    stats["memory_entries"] = len(_memory)
+    stats["memory_max_entries"] = _memory.max_entries
+    stats["ttl_seconds"] = LLM_CACHE_TTL_S
+    return stats
@@ -1,15 +1,20 @@
 import json
 from typing import Any, Dict
 from app.extensions import extensions
+from app.services.metrics_service import timed_stage
+
+# Gemini model used for every LLM call; also part of the skill-extraction cache key
+LLM_MODEL_NAME: str = "gemini-2.5-flash"
 
 
 # helper function to make llm call
 # just returns text back for now
+@timed_stage("llm")
 def call_llm(prompt: str) -> str:
     client = extensions.get_llm_client()
 
     response = client.models.generate_content(
-        model="gemini-2.5-flash",
+        model=LLM_MODEL_NAME,
         contents=prompt
     )
 
@@ -19,12 +24,13 @@ def call_llm(prompt: str) -> str:
     return response.text.strip()
 
 # Call LLM with response formatted as JSON. Output JSON matches input schema
+@timed_stage("llm")
 def call_llm_json(prompt: str, json_schema: Dict[str, Any]) -> Dict[str, Any]:
    
     client = extensions.get_llm_client()
 
     response = client.models.generate_content(
-        model="gemini-2.5-flash",
+        model=LLM_MODEL_NAME,
         contents=prompt,
         config={
             "response_mime_type": "application/json",
@@ -0,0 +1,36 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class LruTtlCache:
+    """Thread-safe LRU with a per-entry expiry time."""
+
+    def __init__(self, max_entries: int, ttl_s: float):
+        self.max_entries = max(1, max_entries)
+        self.ttl_s = ttl_s
+        self._data: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_s, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
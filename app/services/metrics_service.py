@@ -0,0 +1,253 @@
+"""
+Lightweight latency instrumentation.
+
+- timed_stage("llm") wraps a function or block: the duration goes into the
+  jobmatch_stage_seconds histogram and, inside a request, into that response's Server-Timing header.
+- init_app(app) times every request (jobmatch_http_request_seconds) and writes Server-Timing.
+- render_metrics() is the Prometheus text exposition served at /metrics, including
+  psycopg_pool ConnectionPool stats for the app and sync pools (pool label).
+
+Metrics are kept per process (like prometheus_client without multiprocess mode); with several
+gunicorn workers each scrape sees the worker that answered it.
+"""
+
+import functools
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+from flask import Flask, g, has_request_context, request
+from app.extensions import extensions
+
+
+METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+SERVER_TIMING_ENABLED: bool = os.getenv("SERVER_TIMING_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Seconds; spans a cached read (ms) up to a cold model load or a full sync (a minute)
+LATENCY_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class _Histogram:
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self._series: Dict[_LabelKey, List[float]] = {}   # label key -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            snapshot = {key: list(series) for key, series in self._series.items()}
+        for key, series in sorted(snapshot.items()):
+            for bound, count in zip(self.buckets, series):
+                yield f"{self.name}_bucket{_labels(key, le=_format_value(bound))} {_format_value(count)}"
+            yield f"{self.name}_bucket{_labels(key, le='+Inf')} {_format_value(series[-1])}"
+            yield f"{self.name}_sum{_labels(key)} {_format_value(series[-2])}"
+            yield f"{self.name}_count{_labels(key)} {_format_value(series[-1])}"
+
+
+class _Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._series: Dict[_LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._series[key] = self._series.get(key, 0.0) + amount
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            snapshot = dict(self._series)
+        for key, value in sorted(snapshot.items()):
+            yield f"{self.name}{_labels(key)} {_format_value(value)}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(key: _LabelKey, **extra: str) -> str:
+    pairs = list(key) + list(extra.items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+STAGE_SECONDS = _Histogram("jobmatch_stage_seconds", "Time spent in an instrumented stage (parse, llm, embed, match, ...).")
+STAGE_ERRORS = _Counter("jobmatch_stage_errors_total", "Instrumented stage calls that raised.")
+SYNC_STAGE_SECONDS = _Histogram("jobmatch_sync_stage_seconds", "Time per job sync run spent in each pipeline stage.")
+SYNC_STAGE_ITEMS = _Counter("jobmatch_sync_stage_items_total", "Items produced by each job sync pipeline stage.")
+HTTP_REQUEST_SECONDS = _Histogram("jobmatch_http_request_seconds", "HTTP request latency by endpoint.")
+
+_METRICS = (STAGE_SECONDS, STAGE_ERRORS, SYNC_STAGE_SECONDS, SYNC_STAGE_ITEMS, HTTP_REQUEST_SECONDS)
+
+
+def _record_server_timing(name: str, seconds: float) -> None:
+    if SERVER_TIMING_ENABLED and has_request_context():
+        timings = g.setdefault("server_timings", {})
+        timings[name] = timings.get(name, 0.0) + seconds
+
+
+def observe_stage(stage: str, seconds: float, error: bool = False) -> None:
+    if not METRICS_ENABLED:
+        return
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    if error:
+        STAGE_ERRORS.inc(stage=stage)
+    _record_server_timing(stage, seconds)
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class timed_stage:
+    """
+    Time a stage, as a decorator or a context manager:
+
+        @timed_stage("embed")
+        def embed_text(...): ...
+
+        with timed_stage("llm"):
+            ...
+    """
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self._local = threading.local()
+
+    def __enter__(self) -> "timed_stage":
+        self._local.__dict__.setdefault("starts", []).append(time.perf_counter())
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        started = self._local.starts.pop()
+        observe_stage(self.stage, time.perf_counter() - started, error=exc_type is not None)
+
+    def __call__(self, fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with self:
+                return fn(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+
+
+def observe_sync(source: str, stages: Dict[str, Dict[str, Any]]) -> None:
+    # One observation per stage per sync run (SyncStats.as_dict() shape)
+    if not METRICS_ENABLED:
+        return
+    for stage, entry in stages.items():
+        SYNC_STAGE_SECONDS.observe(entry["seconds"], source=source, stage=stage)
+        SYNC_STAGE_ITEMS.inc(entry["items"], source=source, stage=stage)
+        _record_server_timing(f"sync_{stage}", entry["seconds"])
+
+
+def _render_pool_stats() -> Iterable[str]:
+    pools = [
+        (label, pool)
+        for label, pool in (("app", getattr(extensions, "db_pool", None)), ("sync", getattr(extensions, "sync_db_pool", None)))
+        if pool is not None
+    ]
+    if not pools:
+        return
+    stats = {label: pool.get_stats() for label, pool in pools}
+
+    def _series(name: str, help_text: str, kind: str, value_of: Callable[[Dict[str, int]], float]) -> Iterable[str]:
+        yield f"# HELP {name} {help_text}"
+        yield f"# TYPE {name} {kind}"
+        for label, pool_stats in stats.items():
+            yield f"{name}{_labels((('pool', label),))} {_format_value(value_of(pool_stats))}"
+
+    gauges = (
+        ("jobmatch_db_pool_size", "Connections currently open in the pool.", lambda st: st.get("pool_size", 0)),
+        ("jobmatch_db_pool_max_size", "Configured maximum pool size.", lambda st: st.get("pool_max", 0)),
+        ("jobmatch_db_pool_available", "Idle connections ready to be checked out.", lambda st: st.get("pool_available", 0)),
+        (
+            "jobmatch_db_pool_in_use",
+            "Connections checked out by the app.",
+            lambda st: max(0, st.get("pool_size", 0) - st.get("pool_available", 0)),
+        ),
+        ("jobmatch_db_pool_requests_waiting", "Clients currently waiting for a connection.", lambda st: st.get("requests_waiting", 0)),
+    )
+    for name, help_text, value_of in gauges:
+        yield from _series(name, help_text, "gauge", value_of)
+
+    counters = (
+        ("jobmatch_db_pool_requests_total", "Connection checkouts requested.", "requests_num"),
+        ("jobmatch_db_pool_requests_queued_total", "Checkouts that had to wait for a connection.", "requests_queued"),
+        ("jobmatch_db_pool_requests_errors_total", "Checkouts that failed (timeout or error).", "requests_errors"),
+        ("jobmatch_db_pool_connections_errors_total", "Failed attempts to open a connection.", "connections_errors"),
+    )
+    for name, help_text, key in counters:
+        yield from _series(name, help_text, "counter", lambda st, key=key: st.get(key, 0))
+
+    # psycopg_pool keeps the total wait, not a distribution: expose it as a summary (sum/count)
+    name = "jobmatch_db_pool_checkout_wait_seconds"
+    yield f"# HELP {name} Time clients spent waiting to check out a connection."
+    yield f"# TYPE {name} summary"
+    for label, pool_stats in stats.items():
+        yield f"{name}_sum{_labels((('pool', label),))} {_format_value(pool_stats.get('requests_wait_ms', 0) / 1000.0)}"
+        yield f"{name}_count{_labels((('pool', label),))} {_format_value(pool_stats.get('requests_num', 0))}"
+
+
+def render_metrics() -> str:
+    lines: List[str] = []
+    for metric in _METRICS:
+        lines.extend(metric.render())
+    lines.extend(_render_pool_stats())
+    return "\n".join(lines) + "\n"
+
+
+def init_app(app: Flask) -> None:
+    """Time every request and attach a Server-Timing header with the stages it ran."""
+
+    @app.before_request
+    def _start_request_timer() -> None:
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def _finish_request_timer(response):
+        started: Optional[float] = g.get("request_started")
+        if started is None:
+            return response
+        elapsed = time.perf_counter() - started
+
+        if METRICS_ENABLED and request.endpoint != "metrics.metrics":
+            HTTP_REQUEST_SECONDS.observe(
+                elapsed,
+                endpoint=request.endpoint or "unmatched",
+                method=request.method,
+                status=str(response.status_code),
+            )
+
+        if SERVER_TIMING_ENABLED:
+            timings: Dict[str, float] = g.get("server_timings") or {}
+            entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items()]
+            entries.append(f"total;dur={elapsed * 1000:.1f}")
+            # For streamed responses this covers the time until the body starts streaming
+            response.headers.add("Server-Timing", ", ".join(entries))
+        return response
@@ -0,0 +1,129 @@
+"""
+Versioned response cache for read endpoints the frontend polls.
+
+Each cached read depends on one or more generation counters ("jobs", "matches") that syncs and
+scoring runs bump. The ETag is derived from the request parameters plus those generations, so
+an If-None-Match check needs no database work, and a new generation naturally orphans old entries.
+
+Without RESPONSE_CACHE_REDIS_URL, counters are per process: another worker's sync is only
+noticed once the current RESPONSE_CACHE_LOCAL_TTL_S window rolls over (it is part of the ETag).
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import traceback
+from typing import Any, Dict, Iterable, Optional, Tuple
+from app.services.lru_cache import LruTtlCache
+
+# redis is optional - without it generations and cached bodies stay per process
+try:
+    import redis
+except ImportError:  # pragma: no cover - depends on environment
+    redis = None
+
+
+RESPONSE_CACHE_ENABLED: bool = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+RESPONSE_CACHE_LOCAL_TTL_S: int = int(os.getenv("RESPONSE_CACHE_LOCAL_TTL_S", "30"))
+RESPONSE_CACHE_REDIS_URL: Optional[str] = os.getenv("RESPONSE_CACHE_REDIS_URL") or None
+RESPONSE_CACHE_SHARED_TTL_S: int = int(os.getenv("RESPONSE_CACHE_SHARED_TTL_S", "3600"))
+
+_REDIS_PREFIX = "jobmatch:response_cache:"
+
+_memory = LruTtlCache(RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_SHARED_TTL_S)
+_generations_lock = threading.Lock()
+# Seeded from the clock so ETags issued before a restart don't match fresh counters
+_generations: Dict[str, int] = {}
+_generation_seed = int(time.time())
+
+_redis_client = None
+_redis_lock = threading.Lock()
+_redis_missing_warned = False
+
+
+def _get_redis():
+    global _redis_client, _redis_missing_warned
+    if RESPONSE_CACHE_REDIS_URL is None:
+        return None
+    if redis is None:
+        if not _redis_missing_warned:
+            _redis_missing_warned = True
+            print("[WARN] RESPONSE_CACHE_REDIS_URL is set but redis is not installed; using a per-process cache")
+        return None
+    if _redis_client is None:
+        with _redis_lock:
+            if _redis_client is None:
+                _redis_client = redis.Redis.from_url(RESPONSE_CACHE_REDIS_URL, socket_timeout=0.5)
+    return _redis_client
+
+
+def bump_generation(*scopes: str) -> None:
+    # Call after anything that changes what the cached reads would return
+    for scope in scopes:
+        with _generations_lock:
+            _generations[scope] = _generations.get(scope, _generation_seed) + 1
+        client = _get_redis()
+        if client is not None:
+            try:
+                client.incr(_REDIS_PREFIX + "gen:" + scope)
+            except Exception:
+                traceback.print_exc()
+
+
+def _generation_token(scopes: Iterable[str]) -> str:
+    client = _get_redis()
+    if client is not None:
+        try:
+            values = client.mget([_REDIS_PREFIX + "gen:" + scope for scope in scopes])
+            return ".".join(str(int(v or 0)) for v in values)
+        except Exception:
+            # Fall through to local counters if redis is unreachable
+            traceback.print_exc()
+
+    with _generations_lock:
+        local = ".".join(str(_generations.get(scope, _generation_seed)) for scope in scopes)
+    # Time window bounds how long a stale per-process generation can be served
+    return f"{local}.{int(time.time()) // max(1, RESPONSE_CACHE_LOCAL_TTL_S)}"
+
+
+def response_etag(endpoint: str, scopes: Tuple[str, ...], params: Dict[str, Any]) -> str:
+    """ETag value (sent weak) for `endpoint` called with `params` at the current generations of `scopes`."""
+    h = hashlib.sha256()
+    h.update(endpoint.encode("utf-8"))
+    h.update(json.dumps(params, sort_keys=True, default=str).encode("utf-8"))
+    h.update(_generation_token(scopes).encode("utf-8"))
+    return h.hexdigest()[:32]
+
+
+def get_cached_response(etag: str) -> Optional[bytes]:
+    if not RESPONSE_CACHE_ENABLED:
+        return None
+    body = _memory.get(etag)
+    if body is not None:
+        return body
+
+    client = _get_redis()
+    if client is not None:
+        try:
+            body = client.get(_REDIS_PREFIX + "body:" + etag)
+        except Exception:
+            traceback.print_exc()
+            body = None
+        if body is not None:
+            _memory.put(etag, body)
+    return body
+
+
+def store_cached_response(etag: str, body: bytes) -> None:
+    if not RESPONSE_CACHE_ENABLED:
+        return
+    _memory.put(etag, body)
+    client = _get_redis()
+    if client is not None:
+        try:
+            client.setex(_REDIS_PREFIX + "body:" + etag, RESPONSE_CACHE_SHARED_TTL_S, body)
+        except Exception:
+            traceback.print_exc()
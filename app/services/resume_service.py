@@ -1,24 +1,37 @@
 import re
 import time
-from typing import Any, Dict, List
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional
 from werkzeug.datastructures import FileStorage
 from app.services.embedding_service import embed_text
-from app.services.database_service import compute_matches_for_resume
+from app.services.vector_index import (
+    MATCH_ENGINE,
+    MATCH_ENGINES,
+    get_job_vector_index,
+    search_jobs_in_memory,
+)
 
 from app.services.resume_utils.resume_parser import (
     parse_resume_file,
     looks_like_scanned_or_empty,
+    spool_upload,
 )
 from app.services.prompt_loader import load_prompt_text
-from app.services.llm_service import call_llm_json
+from app.services.llm_service import LLM_MODEL_NAME, call_llm_json
+from app.services.llm_cache_service import get_cached_extraction, intent_key, llm_cache_key, store_cached_extraction
 from app.services.database_service import (
-    clear_matches_for_resume,
-    create_or_update_matches,
+    MATCHES_TOP_K,
+    MatchFilters,
     create_resume,
     create_resume_extraction,
+    find_resume_by_content,
     get_latest_resume_extraction,
-    list_active_jobs_for_matching,
+    hybrid_score_and_fetch_matches,
+    list_latest_resume_embeddings,
+    list_scored_matches_for_resume,
     list_top_matches_for_resume,
+    replace_matches_bulk,
+    score_and_fetch_matches,
 )
 
 
@@ -36,6 +49,10 @@ _SKILLS_SCHEMA: Dict[str, Any] = {
     "required": ["skills"]
 }
 
+def _skills_prompt_template(user_intent: Optional[str]) -> str:
+    return load_prompt_text("extract_relevant_skills.txt") if user_intent else load_prompt_text("extract_all_skills.txt")
+
+
 #helper method to extract skills from text of a resume
 #takes in user_job_description to instruct LLM on what keywords to value
 def extract_skills_from_resume_text(resume_text: str, user_intent: str) -> Dict[str, Any]:
@@ -46,31 +63,80 @@ def extract_skills_from_resume_text(resume_text: str, user_intent: str) -> Dict[
             "Try uploading a text-based PDF or DOCX."
         )
 
-    template = load_prompt_text("extract_relevant_skills.txt") if user_intent else load_prompt_text("extract_all_skills.txt") 
+    template = _skills_prompt_template(user_intent)
+
+    # Same resume + intent + prompt + model -> reuse the earlier answer and skip Gemini
+    cache_key = llm_cache_key(resume_text, user_intent, template, LLM_MODEL_NAME)
+    cached = get_cached_extraction(cache_key)
+    if cached is not None:
+        return cached
+
     template = template.replace("{{USER_INTENT}}", user_intent or "")   #Add user intent - will do nothing for prompt where this field does not exist
     prompt = template.replace("{{RESUME_TEXT}}", resume_text)
 
-    return call_llm_json(prompt, _SKILLS_SCHEMA)
+    extracted = call_llm_json(prompt, _SKILLS_SCHEMA)
+    store_cached_extraction(cache_key, LLM_MODEL_NAME, extracted)
+    return extracted
+
+def intent_fingerprint(user_intent: Optional[str]) -> str:
+    # Covers the prompt template the intent selects: editing a template stops old extractions
+    # from being reused, as it does for the LLM cache
+    return intent_key(user_intent, _skills_prompt_template(user_intent))
+
 
 # Full upload flow: parse resume, extract keywords, and store both records in db
-def process_uploaded_resume(file: FileStorage, user_job_description: str) -> Dict[str, Any]:
-    resume_text = parse_resume_file(file)
+# on_stage (optional) is called after each stage: parsed, extracted, embedded, stored,
+# or only deduplicated when an identical upload was already processed
+def process_uploaded_resume(
+    file: FileStorage,
+    user_job_description: str,
+    on_stage: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    # Spool + hash first: an identical file uploaded with the same intent reuses the stored
+    # resume and extraction with no parsing, LLM or embedding work
+    spooled, content_sha256, _ = spool_upload(file)
+    intent_sha256 = intent_fingerprint(user_job_description)
+
+    with spooled:
+        existing = find_resume_by_content(content_sha256, intent_sha256, LLM_MODEL_NAME)
+        if existing:
+            if on_stage:
+                on_stage("deduplicated")
+            return {
+                "resume_id": int(existing["resume_id"]),
+                "extraction_id": int(existing["extraction_id"]),
+                "extracted": existing["extracted_json"],
+                "deduplicated": True,
+            }
+
+        resume_text = parse_resume_file(FileStorage(stream=spooled, filename=file.filename))
+    if on_stage:
+        on_stage("parsed")
+
     extracted_skills = extract_skills_from_resume_text(resume_text, user_job_description)
+    if on_stage:
+        on_stage("extracted")
 
     resume_embedding = generate_resume_embedding(extracted_skills)
+    if on_stage:
+        on_stage("embedded")
 
-    resume_id = create_resume(resume_text=resume_text, filename=file.filename)
+    resume_id = create_resume(resume_text=resume_text, filename=file.filename, content_sha256=content_sha256)
     extraction_id = create_resume_extraction(
         resume_id=resume_id,
         extracted_json=extracted_skills,
         embedding=resume_embedding,
-        model_name="gemini-2.5-flash",
+        model_name=LLM_MODEL_NAME,
+        intent_sha256=intent_sha256,
     )
+    if on_stage:
+        on_stage("stored")
 
     return {
         "resume_id": resume_id,
         "extraction_id": extraction_id,
         "extracted": extracted_skills,
+        "deduplicated": False,
     }
 
 
@@ -94,11 +160,68 @@ def _normalize_keywords(extracted_json: Dict[str, Any]) -> List[str]:
     return normalized
 
 
-def _tokenize_text(text: str) -> set[str]:
-    # Tokenize job text into searchable lowercase terms
-    return set(re.findall(r"[a-z0-9+#.\-]+", text.lower()))
+def _tokenize_terms(text: str) -> List[str]:
+    # Tokenize text into searchable lowercase terms, in order
+    return re.findall(r"[a-z0-9+#.\-]+", text.lower())
+
+
+def build_lexical_query(extracted_json: Dict[str, Any]) -> str:
+    # websearch_to_tsquery text: any keyword may match, multi-word keywords match as phrases
+    clauses: List[str] = []
+    for keyword in _normalize_keywords(extracted_json):
+        # A leading "-" would negate the term; a bare "or" would be read as the operator
+        terms = [t.lstrip("-") for t in _tokenize_terms(keyword)]
+        terms = [t for t in terms if t and t != "or"]
+        if not terms:
+            continue
+        clauses.append(f'"{" ".join(terms)}"' if len(terms) > 1 else terms[0])
+    return " or ".join(clauses)
+
+
+def score_resume_against_jobs(
+    resume_id: int,
+    engine: Optional[str] = None,
+    return_jobs: int = 0,
+    prefilter: bool = False,
+    filters: Optional[MatchFilters] = None,
+) -> Dict[str, Any]:
+    # engine: "pgvector" (ANN query in Postgres), "hybrid" (ANN + full-text fused with RRF)
+    # or "memory" (in-process index); defaults to MATCH_ENGINE
+    # return_jobs > 0 also returns that many display-ready top jobs, read in the same transaction
+    # prefilter (hybrid only): rank just the full-text candidates by cosine instead of the whole table
+    # filters: location / remote / source / recency / salary, applied inside the vector query
+    engine = engine or MATCH_ENGINE
+    if engine not in MATCH_ENGINES:
+        raise ValueError(f"engine must be one of {', '.join(MATCH_ENGINES)}")
+    if engine == "memory" and filters is not None and filters.active:
+        raise ValueError("filters are only supported by the pgvector and hybrid engines")
+
+    if engine in ("pgvector", "hybrid"):
+        # Lookup, delete, ANN insert and display rows on one connection in one transaction
+        if engine == "hybrid":
+            result = hybrid_score_and_fetch_matches(
+                resume_id,
+                build_lexical_query,
+                top_k=MATCHES_TOP_K,
+                display_limit=return_jobs,
+                prefilter=prefilter,
+                filters=filters,
+            )
+        else:
+            result = score_and_fetch_matches(
+                resume_id, top_k=MATCHES_TOP_K, display_limit=return_jobs, filters=filters
+            )
+        if result is None:
+            raise ValueError(f"No embedded extraction found for resume_id={resume_id}")
+        stats: Dict[str, Any] = {
+            "resume_id": resume_id,
+            "engine": engine,
+            "matches_saved": result["matches_saved"],
+        }
+        if return_jobs > 0:
+            stats["jobs"] = result["jobs"]
+        return stats
 
-def score_resume_against_jobs(resume_id: int) -> Dict[str, Any]:
     # 1. Get latest extraction (contains embedding)
     extraction = get_latest_resume_extraction(resume_id)
     if not extraction:
@@ -108,36 +231,70 @@ def score_resume_against_jobs(resume_id: int) -> Dict[str, Any]:
     if resume_embedding is None:
         raise ValueError("Resume embedding not found")
 
-    # 2. Clear old matches
-    clear_matches_for_resume(resume_id)
+    # 2. Search the in-process index
+    rows = search_jobs_in_memory(resume_embedding, top_k=MATCHES_TOP_K)
 
-    # 3. Compute matches using DB (THIS is the key)
-    rows = compute_matches_for_resume(resume_id, resume_embedding, top_k=50)
-    print ("[DEBUG] Row length", len(rows))
+    # 3. Swap old matches for new ones atomically
+    saved = replace_matches_bulk([resume_id], [(resume_id, int(job_id), float(sim)) for job_id, sim in rows])
 
-    # 4. Build payload
-    matches = []
-    for job_id, similarity in rows:
-        matches.append([
-            resume_id,
-            int(job_id),
-            float(similarity),
-            None,
-            {}
-        ])
+    stats = {
+        "resume_id": resume_id,
+        "engine": engine,
+        "matches_saved": saved,
+    }
+    if return_jobs > 0:
+        # Same row count as the pgvector and hybrid engines (up to the route's cap of 50)
+        stats["jobs"] = list_scored_matches_for_resume(resume_id, limit=return_jobs)
+    return stats
 
-    # 5. Store matches
-    create_or_update_matches(matches)
 
+# Score many resumes in one pass: exact top-k against every active job as chunked
+# matrix products, then one bulk write of all matches
+def score_resumes_batch(
+    resume_ids: Optional[List[int]] = None,
+    top_k: int = MATCHES_TOP_K,
+    chunk_size: int = 128,
+) -> Dict[str, Any]:
+    started = time.perf_counter()
+
+    embeddings = list_latest_resume_embeddings(resume_ids)
+    if not embeddings:
+        return {"resumes_scored": 0, "matches_saved": 0, "elapsed_seconds": 0.0, "resumes_per_sec": 0.0}
+
+    index = get_job_vector_index()
+    index.ensure_fresh()
+
+    scored_ids = [resume_id for resume_id, _ in embeddings]
+    queries = np.array([vec for _, vec in embeddings], dtype=np.float32)
+    search_started = time.perf_counter()
+    results = index.search_many(queries, top_k=top_k, chunk_size=chunk_size)
+    search_seconds = time.perf_counter() - search_started
+
+    matches = [
+        (resume_id, job_id, similarity)
+        for resume_id, rows in zip(scored_ids, results)
+        for job_id, similarity in rows
+    ]
+    saved = replace_matches_bulk(scored_ids, matches)
+
+    elapsed = time.perf_counter() - started
     return {
-        "resume_id": resume_id,
-        "matches_saved": len(matches),
+        "resumes_scored": len(scored_ids),
+        "jobs_indexed": len(index),
+        "matches_saved": saved,
+        "search_seconds": round(search_seconds, 3),
+        "elapsed_seconds": round(elapsed, 3),
+        "resumes_per_sec": round(len(scored_ids) / elapsed, 2) if elapsed > 0 else 0.0,
     }
 
 
-def get_display_jobs_for_resume(resume_id: int, limit: int = 10) -> List[Dict[str, Any]]:
+def get_display_jobs_for_resume(
+    resume_id: int,
+    limit: int = 10,
+    filters: Optional[MatchFilters] = None,
+) -> List[Dict[str, Any]]:
     # Fetch top ranked jobs to send to the frontend
-    return list_top_matches_for_resume(resume_id=resume_id, limit=limit)
+    return list_top_matches_for_resume(resume_id=resume_id, limit=limit, filters=filters)
 
 
 def build_resume_embedding_text_from_keywords(keywords: List[str]) -> str:
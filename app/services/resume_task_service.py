@@ -0,0 +1,96 @@
+"""
+Background processing for uploaded resumes.
+
+Uploads are saved to disk by the route, then parsed / extracted / embedded (and optionally
+scored) on a small bounded worker pool. Progress is written to the resume_tasks table.
+"""
+
+import os
+import threading
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+from werkzeug.datastructures import FileStorage
+from app.services.database_service import (
+    add_resume_task_stage,
+    create_resume_task,
+    finish_resume_task,
+    start_resume_task,
+)
+from app.services.resume_service import process_uploaded_resume, score_resume_against_jobs
+
+
+# Concurrent resume pipelines per process, and how many more may wait in line
+RESUME_TASK_WORKERS: int = int(os.getenv("RESUME_TASK_WORKERS", "2"))
+RESUME_TASK_QUEUE_MAX: int = int(os.getenv("RESUME_TASK_QUEUE_MAX", "20"))
+
+
+class ResumeQueueFullError(RuntimeError):
+    """Raised when the worker pool and its queue are both full."""
+
+
+_executor = ThreadPoolExecutor(max_workers=max(1, RESUME_TASK_WORKERS), thread_name_prefix="resume-worker")
+# ThreadPoolExecutor's own queue is unbounded, so running + waiting tasks are capped here
+_slots = threading.BoundedSemaphore(max(1, RESUME_TASK_WORKERS) + max(0, RESUME_TASK_QUEUE_MAX))
+
+
+def _run_resume_task(
+    task_id: str,
+    saved_path: str,
+    filename: str,
+    user_job_description: Optional[str],
+    auto_score: bool,
+) -> None:
+    try:
+        # Running from here on, so polls don't report the slow parse / extract stages as queued
+        start_resume_task(task_id)
+        with open(saved_path, "rb") as f:
+            upload = FileStorage(stream=f, filename=filename)
+            data: Dict[str, Any] = process_uploaded_resume(
+                upload,
+                user_job_description,
+                on_stage=lambda stage: add_resume_task_stage(task_id, stage),
+            )
+
+        if auto_score:
+            data["score"] = score_resume_against_jobs(data["resume_id"])
+            add_resume_task_stage(task_id, "scored")
+
+        finish_resume_task(task_id, "done", result=data)
+    except Exception as e:
+        traceback.print_exc()
+        try:
+            finish_resume_task(task_id, "failed", error=str(e))
+        except Exception:
+            traceback.print_exc()
+    finally:
+        _slots.release()
+        try:
+            os.remove(saved_path)
+        except OSError:
+            pass
+
+
+def submit_resume_task(
+    saved_path: str,
+    filename: str,
+    user_job_description: Optional[str],
+    auto_score: bool = False,
+) -> str:
+    """
+    Queue an already-saved upload for processing and return its task id.
+    Raises ResumeQueueFullError if too many uploads are in flight.
+    """
+    if not _slots.acquire(blocking=False):
+        raise ResumeQueueFullError("Resume processing queue is full, try again shortly")
+
+    task_id = uuid.uuid4().hex
+    try:
+        create_resume_task(task_id, filename, auto_score=auto_score)
+        _executor.submit(_run_resume_task, task_id, saved_path, filename, user_job_description, auto_score)
+    except Exception:
+        _slots.release()
+        raise
+
+    return task_id
@@ -0,0 +1,229 @@
+"""
+Pluggable PDF text extraction.
+
+A backend is a picklable function (pdf_bytes, first_page, stop_page) -> [page text]. Short PDFs
+are extracted in-process; long ones are split into page ranges on a spawn-based process pool.
+Both are bound by PDF_EXTRACT_TIMEOUT_S, but only pool tasks can be killed when they overrun.
+
+- "pdfium": plain text extraction via PDFium (no layout analysis) - the fast default
+- "pdfplumber": pdfminer layout analysis - slower, used as the fallback for poor fast output
+- "pymupdf": MuPDF plain text, only if PyMuPDF is installed
+"""
+
+import io
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional, Tuple
+import pdfplumber
+import pypdfium2 as pdfium
+
+# PyMuPDF is optional - registered as the "pymupdf" backend when installed
+try:
+    import fitz
+except ImportError:  # pragma: no cover - depends on environment
+    fitz = None
+
+
+PDF_EXTRACTOR: str = os.getenv("PDF_EXTRACTOR", "pdfium")
+# Pages past this are ignored - resumes are short, anything longer is probably not a resume
+PDF_MAX_PAGES: int = int(os.getenv("PDF_MAX_PAGES", "20"))
+# PDFs with at least this many pages are split across the process pool
+PDF_PARALLEL_MIN_PAGES: int = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "6"))
+PDF_EXTRACT_WORKERS: int = int(os.getenv("PDF_EXTRACT_WORKERS", "2"))
+PDF_EXTRACT_TIMEOUT_S: float = float(os.getenv("PDF_EXTRACT_TIMEOUT_S", "20"))
+
+PageExtractor = Callable[[bytes, int, int], List[str]]
+
+
+class PdfExtractionError(ValueError):
+    """Raised when PDF extraction fails outside the backend itself (e.g. a worker process died)."""
+
+
+class PdfExtractionTimeout(PdfExtractionError):
+    """Raised when a PDF takes longer than PDF_EXTRACT_TIMEOUT_S to extract."""
+
+
+# PDFium is not thread-safe; calls from threads in one process are serialized
+_pdfium_lock = threading.Lock()
+
+
+def _pdfium_pages(data: bytes, start: int, stop: int) -> List[str]:
+    with _pdfium_lock:
+        pdf = pdfium.PdfDocument(data)
+        try:
+            parts: List[str] = []
+            for i in range(start, min(stop, len(pdf))):
+                page = pdf[i]
+                textpage = page.get_textpage()
+                parts.append(textpage.get_text_range() or "")
+                textpage.close()
+                page.close()
+            return parts
+        finally:
+            pdf.close()
+
+
+def _pdfplumber_pages(data: bytes, start: int, stop: int) -> List[str]:
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        return [page.extract_text() or "" for page in pdf.pages[start:stop]]
+
+
+def _pymupdf_pages(data: bytes, start: int, stop: int) -> List[str]:
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        return [doc[i].get_text() or "" for i in range(start, min(stop, doc.page_count))]
+
+
+PDF_EXTRACTORS: Dict[str, PageExtractor] = {
+    "pdfium": _pdfium_pages,
+    "pdfplumber": _pdfplumber_pages,
+}
+if fitz is not None:
+    PDF_EXTRACTORS["pymupdf"] = _pymupdf_pages
+
+
+def register_pdf_extractor(name: str, extractor: PageExtractor) -> None:
+    # Extractors used with the process pool must be importable module-level functions
+    PDF_EXTRACTORS[name] = extractor
+
+
+def count_pdf_pages(data: bytes) -> int:
+    with _pdfium_lock:
+        pdf = pdfium.PdfDocument(data)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # spawn: forking a threaded web process that holds PDFium state is unsafe
+                _pool = ProcessPoolExecutor(
+                    max_workers=max(1, PDF_EXTRACT_WORKERS),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+
+def _shutdown_pool_killing_workers(pool: ProcessPoolExecutor) -> None:
+    """
+    Shut a pool down and kill its worker processes, including ones busy with a task.
+
+    ProcessPoolExecutor has no public way to stop a running task, so this reads its private
+    `_processes` map (pid -> Process, CPython 3.8+) before shutdown() clears it. If that
+    attribute is ever missing, the pool is only shut down, the workers finish on their own and
+    a warning is printed.
+    """
+    processes = getattr(pool, "_processes", None)
+    processes = list(processes.values()) if processes is not None else None
+    pool.shutdown(wait=False, cancel_futures=True)
+    if processes is None:
+        print("[WARN] Could not terminate PDF extraction workers: ProcessPoolExecutor._processes is unavailable")
+        return
+    for process in processes:
+        if process.is_alive():
+            process.kill()
+
+
+def _reset_pool(pool: ProcessPoolExecutor) -> None:
+    # A hung PDF must not keep a worker busy, nor leave a new pool running next to the old one
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    _shutdown_pool_killing_workers(pool)
+
+
+def _check_deadline(deadline: float, timeout_s: float) -> None:
+    if time.perf_counter() > deadline:
+        raise PdfExtractionTimeout(f"PDF text extraction took longer than {timeout_s:g}s")
+
+
+def _run_with_deadline(calls: List[Tuple[Callable, tuple]], deadline: float, timeout_s: float) -> list:
+    """
+    Run (fn, args) calls on the process pool and return their results in order.
+    Raises PdfExtractionTimeout once `deadline` (perf_counter) passes. A pool broken by another
+    request's timeout is replaced and the calls retried once; if that pool breaks too (a worker
+    crashed or ran out of memory), PdfExtractionError is raised.
+    """
+    for attempt in range(2):
+        pool = _get_pool()
+        try:
+            futures = [pool.submit(fn, *args) for fn, args in calls]
+        except RuntimeError:
+            # Shut down by another request between _get_pool() and submit
+            _reset_pool(pool)
+            continue
+        try:
+            return [future.result(timeout=max(0.0, deadline - time.perf_counter())) for future in futures]
+        except FuturesTimeoutError:
+            _reset_pool(pool)
+            raise PdfExtractionTimeout(f"PDF text extraction took longer than {timeout_s:g}s")
+        except BrokenProcessPool as e:
+            _reset_pool(pool)
+            if time.perf_counter() >= deadline:
+                raise PdfExtractionTimeout(f"PDF text extraction took longer than {timeout_s:g}s") from e
+            if attempt:
+                raise PdfExtractionError("PDF text extraction failed: the extraction worker exited unexpectedly") from e
+    raise PdfExtractionError("PDF text extraction failed: the extraction pool was shut down")
+
+
+def extract_pdf_pages(
+    data: bytes,
+    backend: Optional[str] = None,
+    max_pages: int = PDF_MAX_PAGES,
+    timeout_s: float = PDF_EXTRACT_TIMEOUT_S,
+) -> Tuple[List[str], Dict[str, object]]:
+    """
+    Extract up to `max_pages` pages of text with `backend`. Returns (pages, info) where info has
+    backend, page counts, whether the process pool was used and elapsed seconds.
+
+    Short PDFs are read on the calling thread, which can't be interrupted: the deadline is
+    checked between the page count and the extraction, and again at the end. Long PDFs go to
+    the process pool, where a task that overruns `timeout_s` is killed.
+    """
+    backend = backend or PDF_EXTRACTOR
+    extractor = PDF_EXTRACTORS.get(backend)
+    if extractor is None:
+        raise ValueError(f"PDF extractor must be one of {', '.join(PDF_EXTRACTORS)}")
+
+    started = time.perf_counter()
+    deadline = started + timeout_s
+    total_pages = count_pdf_pages(data)
+    pages_to_read = min(total_pages, max(1, max_pages))
+    workers = max(1, PDF_EXTRACT_WORKERS)
+    parallel = workers > 1 and pages_to_read >= PDF_PARALLEL_MIN_PAGES
+
+    _check_deadline(deadline, timeout_s)
+    if not parallel:
+        pages = extractor(data, 0, pages_to_read)
+        _check_deadline(deadline, timeout_s)
+    else:
+        step = -(-pages_to_read // workers)
+        calls = [
+            (extractor, (data, start, min(start + step, pages_to_read)))
+            for start in range(0, pages_to_read, step)
+        ]
+        pages = []
+        for part in _run_with_deadline(calls, deadline, timeout_s):
+            pages.extend(part)
+
+    info = {
+        "backend": backend,
+        "pages_total": total_pages,
+        "pages_read": len(pages),
+        "parallel": parallel,
+        "seconds": round(time.perf_counter() - started, 4),
+    }
+    return pages, info
@@ -1,26 +1,92 @@
+import hashlib
 import io
+import os
 import re
-from typing import Optional
-import pdfplumber
+import tempfile
+import time
+from typing import Optional, Tuple, Union
 import docx
 from typing import BinaryIO
 from werkzeug.datastructures import FileStorage
+from app.services.metrics_service import timed_stage
+from app.services.resume_utils.pdf_extractors import (
+    PDF_EXTRACT_TIMEOUT_S,
+    PDF_EXTRACTOR,
+    PDF_EXTRACTORS,
+    PdfExtractionTimeout,
+    extract_pdf_pages,
+)
 
-def extract_text_from_pdf(stream: BinaryIO) -> str:
-  
-    parts: list[str] = []
+# Backend used when the fast extractor's output looks poor
+PDF_FALLBACK_EXTRACTOR: str = "pdfplumber"
+
+def extract_text_from_pdf(stream: BinaryIO, backend: Optional[str] = None) -> str:
+    # Fast plain-text backend first; fall back to pdfplumber's layout analysis
+    # only if the fast output looks empty or scanned
     stream.seek(0)
-    with pdfplumber.open(stream) as pdf:
-        for page in pdf.pages:
-            parts.append(page.extract_text() or "")
-    return "\n\n".join(parts).strip()
+    data = stream.read()
+    backend = backend or PDF_EXTRACTOR
+
+    # One PDF_EXTRACT_TIMEOUT_S budget covers the fast pass and the fallback together
+    started = time.perf_counter()
+    pages, _ = extract_pdf_pages(data, backend=backend)
+    text = "\n\n".join(pages).strip()
+    if backend != PDF_FALLBACK_EXTRACTOR and looks_like_scanned_or_empty(text):
+        remaining = PDF_EXTRACT_TIMEOUT_S - (time.perf_counter() - started)
+        if remaining <= 0:
+            raise PdfExtractionTimeout(f"PDF text extraction took longer than {PDF_EXTRACT_TIMEOUT_S:g}s")
+        fallback_pages, _ = extract_pdf_pages(data, backend=PDF_FALLBACK_EXTRACTOR, timeout_s=remaining)
+        fallback_text = "\n\n".join(fallback_pages).strip()
+        if len(fallback_text) > len(text):
+            text = fallback_text
+    return text
 
-def extract_text_from_docx(data: bytes) -> str:
+def extract_text_from_docx(data: Union[bytes, BinaryIO]) -> str:
     # python-docx expects a path OR a file-like object.
-    # Feeding it BytesIO is the standard approach for uploads.
-    doc = docx.Document(io.BytesIO(data))
+    # Uploads pass their (seekable) stream directly; raw bytes are wrapped in BytesIO.
+    doc = docx.Document(io.BytesIO(data) if isinstance(data, bytes) else data)
     return "\n".join(p.text for p in doc.paragraphs if p.text is not None).strip()
 
+# Uploads larger than this are rejected; the first UPLOAD_SPOOL_MEMORY_BYTES stay in memory,
+# the rest spill to a temp file
+RESUME_MAX_UPLOAD_BYTES: int = int(os.getenv("RESUME_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_SPOOL_MEMORY_BYTES: int = int(os.getenv("UPLOAD_SPOOL_MEMORY_BYTES", str(1024 * 1024)))
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds RESUME_MAX_UPLOAD_BYTES."""
+
+
+def spool_upload(
+    upload: FileStorage,
+    max_bytes: int = RESUME_MAX_UPLOAD_BYTES,
+    chunk_size: int = 64 * 1024,
+) -> Tuple[tempfile.SpooledTemporaryFile, str, int]:
+    # Copy the upload into a spooled temp file in chunks while hashing it.
+    # Returns (file rewound to 0, sha256 hex, size). The caller closes the file.
+    spooled = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MEMORY_BYTES)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        upload.stream.seek(0)
+    except (AttributeError, OSError):
+        pass
+    try:
+        while True:
+            chunk = upload.stream.read(chunk_size)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLargeError(f"Upload is larger than the {max_bytes} byte limit")
+            digest.update(chunk)
+            spooled.write(chunk)
+    except Exception:
+        spooled.close()
+        raise
+    spooled.seek(0)
+    return spooled, digest.hexdigest(), size
+
 def normalize_resume_text(text: str) -> str:
     # Normalize newlines and whitespace without destroying structure
     text = text.replace("\r\n", "\n").replace("\r", "\n")
@@ -30,6 +96,7 @@ def normalize_resume_text(text: str) -> str:
     text = "\n".join(line.rstrip() for line in text.split("\n"))
     return text.strip()
 
+@timed_stage("parse")
 def parse_resume_file(upload: FileStorage) -> str:
     # Only input: FileStorage
     filename = (upload.filename or "").lower()
@@ -39,10 +106,9 @@ def parse_resume_file(upload: FileStorage) -> str:
         text = extract_text_from_pdf(upload.stream)
 
     elif filename.endswith(".docx"):
-        # docx parsing is simplest if we read bytes once
+        # python-docx reads the zip from the stream without loading it all up front
         upload.stream.seek(0)
-        data = upload.read()
-        text = extract_text_from_docx(data)
+        text = extract_text_from_docx(upload.stream)
     else:
         raise ValueError("Unsupported file type (only pdf, docx)")
 
@@ -51,4 +117,37 @@ def parse_resume_file(upload: FileStorage) -> str:
 
 def looks_like_scanned_or_empty(text: str, min_chars: int = 400) -> bool:
     # If extraction yields very little text, likely scanned PDF or extraction failed
-    return len(text.strip()) < min_chars
\ No newline at end of file
+    return len(text.strip()) < min_chars
+
+def benchmark_resume_extractors(paths: list[str], repeat: int = 3, backends: Optional[list[str]] = None) -> list[dict]:
+    # Time each PDF backend (and python-docx for .docx files) on local sample files.
+    # Reports the best of `repeat` runs plus output size, so fast-but-empty backends stand out.
+    results: list[dict] = []
+    for path in paths:
+        with open(path, "rb") as f:
+            data = f.read()
+        lower = path.lower()
+        if lower.endswith(".pdf"):
+            runs = {name: (lambda name=name: "\n\n".join(extract_pdf_pages(data, backend=name)[0]))
+                    for name in (backends or list(PDF_EXTRACTORS))}
+        elif lower.endswith(".docx"):
+            runs = {"python-docx": lambda: extract_text_from_docx(data)}
+        else:
+            continue
+
+        for name, run in runs.items():
+            timings: list[float] = []
+            text = ""
+            for _ in range(max(1, repeat)):
+                started = time.perf_counter()
+                text = run()
+                timings.append(time.perf_counter() - started)
+            results.append({
+                "file": os.path.basename(path),
+                "backend": name,
+                "best_ms": round(min(timings) * 1000, 2),
+                "mean_ms": round(sum(timings) / len(timings) * 1000, 2),
+                "chars": len(text.strip()),
+                "looks_poor": looks_like_scanned_or_empty(normalize_resume_text(text)),
+            })
+    return results
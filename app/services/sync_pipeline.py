@@ -0,0 +1,206 @@
+"""
+Building blocks for the streaming job syncs: fetch -> parse -> dedup -> (embed) -> upsert.
+
+Stages are generators. A stage that should overlap with the next one (embedding while the
+previous chunk is written) runs on a thread behind a bounded queue, so at most
+SYNC_QUEUE_DEPTH chunks are buffered between them. Upserts commit every SYNC_CHUNK_SIZE rows.
+"""
+
+import os
+import queue
+import threading
+import time
+import tracemalloc
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+# resource is Unix-only - without it peak RSS is not reported
+try:
+    import resource
+except ImportError:  # pragma: no cover - depends on environment
+    resource = None
+
+
+SYNC_CHUNK_SIZE: int = int(os.getenv("SYNC_CHUNK_SIZE", "1000"))
+SYNC_QUEUE_DEPTH: int = int(os.getenv("SYNC_QUEUE_DEPTH", "2"))
+# tracemalloc makes allocation-heavy stages noticeably slower; off unless asked for
+SYNC_TRACE_MEMORY: bool = os.getenv("SYNC_TRACE_MEMORY", "false").lower() in ("1", "true", "yes")
+
+T = TypeVar("T")
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    chunk: List[T] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class SyncStats:
+    """
+    Per-stage wall time and item counts for one sync run.
+    Time is exclusive: while a stage pulls from the stage before it, the clock runs for that one.
+    """
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = {}
+        self.items: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _add(self, name: str, seconds: float = 0.0, items: int = 0) -> None:
+        with self._lock:
+            self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+            self.items[name] = self.items.get(name, 0) + items
+
+    def _enter(self, name: str) -> None:
+        stack = self._local.__dict__.setdefault("stack", [])
+        now = time.perf_counter()
+        if stack:
+            parent, resumed_at = stack[-1]
+            self._add(parent, now - resumed_at)
+        stack.append((name, now))
+
+    def _exit(self) -> None:
+        stack = self._local.stack
+        name, resumed_at = stack.pop()
+        now = time.perf_counter()
+        self._add(name, now - resumed_at)
+        if stack:
+            stack[-1] = (stack[-1][0], now)
+
+    def timed(self, name: str, iterable: Iterable[T]) -> Iterator[T]:
+        # Wraps a stage: counts what it yields and the time spent producing it
+        it = iter(iterable)
+        while True:
+            self._enter(name)
+            try:
+                item = next(it)
+            except StopIteration:
+                return
+            finally:
+                self._exit()
+            self._add(name, items=1)
+            yield item
+
+    def stage(self, name: str, items: int = 0) -> "_StageTimer":
+        # For non-generator work: `with stats.stage("finalize"): ...`
+        return _StageTimer(self, name, items)
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                name: {"seconds": round(seconds, 3), "items": self.items.get(name, 0)}
+                for name, seconds in self.seconds.items()
+            }
+
+
+class _StageTimer:
+    def __init__(self, stats: SyncStats, name: str, items: int):
+        self.stats, self.name, self.items = stats, name, items
+
+    def __enter__(self) -> "_StageTimer":
+        self.stats._enter(self.name)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stats._exit()
+        self.stats._add(self.name, items=self.items)
+
+
+_DONE = object()
+
+
+def prefetch(iterable: Iterable[T], depth: int = SYNC_QUEUE_DEPTH, name: str = "sync-prefetch") -> Iterator[T]:
+    """
+    Run `iterable` on a background thread, buffering at most `depth` items.
+    Errors in the producer are re-raised in the consumer; a consumer that stops early
+    stops the producer at its next item.
+    """
+    buffer: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, depth))
+    stop = threading.Event()
+
+    def _put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce() -> None:
+        try:
+            for item in iterable:
+                if not _put(item):
+                    return
+            _put(_DONE)
+        except BaseException as e:
+            _put(e)
+
+    thread = threading.Thread(target=_produce, name=name, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+# True while tracemalloc runs because a MemoryTracker started it. Module level, so a sync that
+# raised before stop() has its tracing stopped by the next tracker instead of left running.
+_tracing_started_here = False
+
+
+class MemoryTracker:
+    """
+    Peak memory for a sync: process peak RSS (a high-water mark over the process lifetime)
+    and, with SYNC_TRACE_MEMORY, the peak of Python allocations between start() and stop().
+    """
+
+    def __init__(self, trace: bool = SYNC_TRACE_MEMORY):
+        self.trace = trace
+        self.rss_before_mb: Optional[float] = None
+        self.python_peak_mb: Optional[float] = None
+
+    @staticmethod
+    def peak_rss_mb() -> Optional[float]:
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KiB, macOS bytes
+        return round(peak / (1024 * 1024 if os.uname().sysname == "Darwin" else 1024), 1)
+
+    def start(self) -> "MemoryTracker":
+        global _tracing_started_here
+        self.rss_before_mb = self.peak_rss_mb()
+        if self.trace:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                _tracing_started_here = True
+        return self
+
+    def stop(self) -> None:
+        global _tracing_started_here
+        if self.trace and tracemalloc.is_tracing():
+            self.python_peak_mb = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+            if _tracing_started_here:
+                tracemalloc.stop()
+                _tracing_started_here = False
+
+    def as_dict(self) -> Dict[str, Optional[float]]:
+        return {
+            "peak_rss_mb": self.peak_rss_mb(),
+            "peak_rss_mb_before": self.rss_before_mb,
+            "python_peak_mb": self.python_peak_mb,
+        }
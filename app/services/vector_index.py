@@ -0,0 +1,308 @@
+"""
+In-process vector search over active job embeddings.
+
+Keeps L2-normalized job vectors in one contiguous float32 matrix so a resume can be
+scored against every active job with a single matrix-vector product (exact cosine).
+For large corpora an HNSW graph (hnswlib) can answer approximately instead.
+The index follows the jobs table incrementally using jobs.updated_at.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from app.extensions import extensions
+
+# hnswlib is optional - without it the index always answers with exact search
+try:
+    import hnswlib
+except ImportError:  # pragma: no cover - depends on environment
+    hnswlib = None
+
+
+# "pgvector" sends the search to Postgres, "hybrid" fuses it with Postgres full-text search,
+# "memory" uses this module
+MATCH_ENGINE: str = os.getenv("MATCH_ENGINE", "pgvector")
+MATCH_ENGINES: Tuple[str, ...] = ("pgvector", "hybrid", "memory")
+
+# "exact", "hnsw", or "auto" (hnsw once the corpus reaches MATCH_INDEX_HNSW_MIN_ROWS)
+MATCH_INDEX_MODE: str = os.getenv("MATCH_INDEX_MODE", "auto")
+MATCH_INDEX_HNSW_MIN_ROWS: int = int(os.getenv("MATCH_INDEX_HNSW_MIN_ROWS", "50000"))
+MATCH_INDEX_HNSW_M: int = int(os.getenv("MATCH_INDEX_HNSW_M", "16"))
+MATCH_INDEX_HNSW_EF_CONSTRUCTION: int = int(os.getenv("MATCH_INDEX_HNSW_EF_CONSTRUCTION", "200"))
+MATCH_INDEX_HNSW_EF_SEARCH: int = int(os.getenv("MATCH_INDEX_HNSW_EF_SEARCH", "100"))
+
+# How often searches check Postgres for changed jobs, and how far back each check looks.
+# The overlap covers long sync transactions whose rows commit with an older updated_at.
+MATCH_INDEX_REFRESH_S: float = float(os.getenv("MATCH_INDEX_REFRESH_S", "30"))
+MATCH_INDEX_REFRESH_OVERLAP_S: float = float(os.getenv("MATCH_INDEX_REFRESH_OVERLAP_S", "600"))
+MATCH_INDEX_FULL_RELOAD_S: float = float(os.getenv("MATCH_INDEX_FULL_RELOAD_S", "3600"))
+
+
+def to_float32_vector(value: Any) -> np.ndarray:
+    # pgvector values arrive as '[0.1,0.2,...]' text unless cast to real[] in SQL
+    if isinstance(value, str):
+        return np.array(value.strip("[]").split(","), dtype=np.float32)
+    return np.asarray(value, dtype=np.float32)
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class JobVectorIndex:
+    """Thread-safe top-k cosine search over active job embeddings."""
+
+    def __init__(self, mode: str = MATCH_INDEX_MODE):
+        self.mode = mode
+        self._lock = threading.RLock()
+        self._dim: Optional[int] = None
+        self._matrix = np.zeros((0, 0), dtype=np.float32)   # rows [0, _size) are live
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._size = 0
+        self._row_of: Dict[int, int] = {}
+        self._hnsw = None
+        self._watermark: Optional[datetime] = None
+        self._last_check = 0.0
+        self._last_full = 0.0
+
+    def __len__(self) -> int:
+        return self._size
+
+    # ---------------- maintenance ----------------
+
+    def _reserve(self, capacity: int) -> None:
+        # Grow the backing arrays geometrically so appends stay amortized O(1)
+        if capacity <= self._matrix.shape[0]:
+            return
+        new_cap = max(capacity, 2 * self._matrix.shape[0], 1024)
+        matrix = np.zeros((new_cap, self._dim), dtype=np.float32)
+        matrix[: self._size] = self._matrix[: self._size]
+        ids = np.zeros(new_cap, dtype=np.int64)
+        ids[: self._size] = self._ids[: self._size]
+        self._matrix, self._ids = matrix, ids
+
+    def _upsert(self, job_ids: List[int], vectors: np.ndarray) -> None:
+        if self._dim is None:
+            self._dim = vectors.shape[1]
+            self._matrix = np.zeros((0, self._dim), dtype=np.float32)
+        vectors = normalize_rows(vectors.astype(np.float32, copy=False))
+        self._reserve(self._size + len(job_ids))
+
+        for job_id, vec in zip(job_ids, vectors):
+            row = self._row_of.get(job_id)
+            if row is None:
+                row = self._size
+                self._size += 1
+                self._row_of[job_id] = row
+                self._ids[row] = job_id
+            self._matrix[row] = vec
+
+        if self._hnsw is not None:
+            self._hnsw_add(job_ids, vectors)
+
+    def _remove(self, job_ids: List[int]) -> None:
+        # Swap-delete keeps live rows contiguous
+        for job_id in job_ids:
+            row = self._row_of.pop(job_id, None)
+            if row is None:
+                continue
+            last = self._size - 1
+            if row != last:
+                moved_id = int(self._ids[last])
+                self._matrix[row] = self._matrix[last]
+                self._ids[row] = moved_id
+                self._row_of[moved_id] = row
+            self._size -= 1
+            if self._hnsw is not None:
+                try:
+                    self._hnsw.mark_deleted(job_id)
+                except RuntimeError:
+                    pass
+
+    def _use_hnsw(self) -> bool:
+        if hnswlib is None or self.mode == "exact":
+            return False
+        return self.mode == "hnsw" or self._size >= MATCH_INDEX_HNSW_MIN_ROWS
+
+    def _build_hnsw(self) -> None:
+        index = hnswlib.Index(space="ip", dim=self._dim)
+        index.init_index(
+            max_elements=max(1024, 2 * self._size),
+            ef_construction=MATCH_INDEX_HNSW_EF_CONSTRUCTION,
+            M=MATCH_INDEX_HNSW_M,
+        )
+        index.set_ef(MATCH_INDEX_HNSW_EF_SEARCH)
+        if self._size:
+            index.add_items(self._matrix[: self._size], self._ids[: self._size])
+        self._hnsw = index
+
+    def _hnsw_add(self, job_ids: List[int], vectors: np.ndarray) -> None:
+        needed = self._hnsw.get_current_count() + len(job_ids)
+        if needed > self._hnsw.get_max_elements():
+            self._hnsw.resize_index(2 * needed)
+        # Re-adding an existing label replaces its vector (and un-deletes it)
+        self._hnsw.add_items(vectors, np.asarray(job_ids, dtype=np.int64))
+
+    def load(self) -> None:
+        """Full reload of every active embedded job."""
+        with extensions.get_db_pool().connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT NOW()")
+                started_at = cur.fetchone()[0]
+                cur.execute(
+                    """
+                    SELECT id, embedding::real[]
+                    FROM jobs
+                    WHERE is_active = TRUE
+                      AND embedding IS NOT NULL
+                    """
+                )
+                rows = cur.fetchall()
+
+        with self._lock:
+            self._dim = None
+            self._matrix = np.zeros((0, 0), dtype=np.float32)
+            self._ids = np.zeros(0, dtype=np.int64)
+            self._size = 0
+            self._row_of = {}
+            self._hnsw = None
+            if rows:
+                self._upsert([int(r[0]) for r in rows], np.array([r[1] for r in rows], dtype=np.float32))
+            if self._dim is not None and self._use_hnsw():
+                self._build_hnsw()
+            self._watermark = started_at
+            self._last_check = self._last_full = time.monotonic()
+
+    def refresh(self) -> Dict[str, int]:
+        """
+        Apply jobs whose is_active/embedding changed since the last check.
+        Embedding and activity writes all bump jobs.updated_at.
+        """
+        if self._watermark is None:
+            self.load()
+            return {"upserted": self._size, "removed": 0}
+
+        since = self._watermark - timedelta(seconds=MATCH_INDEX_REFRESH_OVERLAP_S)
+        with extensions.get_db_pool().connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT NOW()")
+                started_at = cur.fetchone()[0]
+                cur.execute(
+                    """
+                    SELECT id, is_active, embedding::real[]
+                    FROM jobs
+                    WHERE updated_at >= %s
+                    """,
+                    (since,),
+                )
+                rows = cur.fetchall()
+
+        live = [(int(r[0]), r[2]) for r in rows if r[1] and r[2] is not None]
+        dead = [int(r[0]) for r in rows if not (r[1] and r[2] is not None)]
+
+        with self._lock:
+            if live:
+                self._upsert([job_id for job_id, _ in live], np.array([v for _, v in live], dtype=np.float32))
+            if dead:
+                self._remove(dead)
+            if self._hnsw is None and self._dim is not None and self._use_hnsw():
+                self._build_hnsw()
+            self._watermark = started_at
+            self._last_check = time.monotonic()
+
+        return {"upserted": len(live), "removed": len(dead)}
+
+    def ensure_fresh(self) -> None:
+        # Cheap to call per request; only touches Postgres once per refresh interval
+        now = time.monotonic()
+        if self._watermark is None or now - self._last_full >= MATCH_INDEX_FULL_RELOAD_S:
+            self.load()
+        elif now - self._last_check >= MATCH_INDEX_REFRESH_S:
+            self.refresh()
+
+    # ---------------- search ----------------
+
+    def search(self, query: Any, top_k: int = 10, exact: Optional[bool] = None) -> List[Tuple[int, float]]:
+        """
+        Return [(job_id, cosine_similarity)] best first.
+        `exact=None` lets the index decide (HNSW when built, else exact).
+        """
+        q = to_float32_vector(query)
+        norm = float(np.linalg.norm(q))
+        if norm == 0:
+            return []
+        q = q / norm
+
+        with self._lock:
+            if self._size == 0:
+                return []
+            k = min(max(1, int(top_k)), self._size)
+
+            if self._hnsw is not None and exact is not True:
+                self._hnsw.set_ef(max(MATCH_INDEX_HNSW_EF_SEARCH, k))
+                labels, distances = self._hnsw.knn_query(q, k=k)
+                # "ip" space distance is 1 - dot
+                return [(int(label), float(1.0 - dist)) for label, dist in zip(labels[0], distances[0])]
+
+            scores = self._matrix[: self._size] @ q
+            if k < self._size:
+                top = np.argpartition(-scores, k - 1)[:k]
+            else:
+                top = np.arange(self._size)
+            top = top[np.argsort(-scores[top], kind="stable")]
+            return [(int(self._ids[i]), float(scores[i])) for i in top]
+
+    def search_many(self, queries: np.ndarray, top_k: int = 10, chunk_size: int = 128) -> List[List[Tuple[int, float]]]:
+        """
+        Exact top-k for many queries at once: one (chunk x jobs) matrix product per chunk,
+        so memory is bounded by chunk_size * len(index) floats.
+        """
+        queries = normalize_rows(np.asarray(queries, dtype=np.float32))
+        results: List[List[Tuple[int, float]]] = []
+
+        with self._lock:
+            if self._size == 0:
+                return [[] for _ in range(len(queries))]
+            k = min(max(1, int(top_k)), self._size)
+            matrix = self._matrix[: self._size]
+            ids = self._ids[: self._size]
+
+            for start in range(0, len(queries), max(1, chunk_size)):
+                scores = queries[start:start + chunk_size] @ matrix.T
+                if k < self._size:
+                    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                else:
+                    top = np.tile(np.arange(self._size), (len(scores), 1))
+                top_scores = np.take_along_axis(scores, top, axis=1)
+                order = np.argsort(-top_scores, axis=1, kind="stable")
+                top = np.take_along_axis(top, order, axis=1)
+                top_scores = np.take_along_axis(top_scores, order, axis=1)
+                for row_ids, row_scores in zip(ids[top], top_scores):
+                    results.append([(int(j), float(sc)) for j, sc in zip(row_ids, row_scores)])
+
+        return results
+
+
+_index: Optional[JobVectorIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_job_vector_index() -> JobVectorIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = JobVectorIndex()
+    return _index
+
+
+def search_jobs_in_memory(resume_embedding: Any, top_k: int = 10) -> List[Tuple[int, float]]:
+    # Same row shape as compute_matches_for_resume: [(job_id, similarity)]
+    index = get_job_vector_index()
+    index.ensure_fresh()
+    return index.search(resume_embedding, top_k=top_k)
@@ -0,0 +1,521 @@
+"""
+Schema and index management for pgvector columns.
+
+- Aligns jobs.embedding / resume_extractions.embedding with the embedding model's dimension.
+- Builds ivfflat or HNSW cosine indexes sized from the current row count, and records what
+  was built in vector_index_state so later calls can tell when a rebuild is worth it.
+- Picks ivfflat.probes / hnsw.ef_search per query from a target recall, and turns on
+  iterative index scans for filtered queries where pgvector supports them. New pool
+  connections get the default-recall setting once per session, so most queries skip the SET.
+"""
+
+import math
+import os
+import re
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+import psycopg
+from psycopg.rows import dict_row
+from app.extensions import extensions
+from app.services.embedding_service import EMBEDDING_DIMENSION
+
+
+VECTOR_INDEX_METHODS: Tuple[str, ...] = ("ivfflat", "hnsw")
+VECTOR_INDEX_METHOD: str = os.getenv("VECTOR_INDEX_METHOD", "ivfflat")
+VECTOR_TARGET_RECALL: float = float(os.getenv("VECTOR_TARGET_RECALL", "0.95"))
+
+# Rebuild an ivfflat index once the table has grown/shrunk this much since it was built
+VECTOR_INDEX_REBUILD_GROWTH: float = float(os.getenv("VECTOR_INDEX_REBUILD_GROWTH", "2.0"))
+# Syncs that write fewer rows than this don't trigger a retune check
+VECTOR_INDEX_RETUNE_MIN_ROWS: int = int(os.getenv("VECTOR_INDEX_RETUNE_MIN_ROWS", "500"))
+
+HNSW_M: int = int(os.getenv("HNSW_M", "16"))
+HNSW_EF_CONSTRUCTION: int = int(os.getenv("HNSW_EF_CONSTRUCTION", "64"))
+
+# How long per-query code trusts its cached copy of vector_index_state
+_STATE_CACHE_TTL_S: float = 60.0
+
+# table -> cosine index name (names predate HNSW support and are kept for either method)
+VECTOR_INDEXES: Dict[str, str] = {
+    "jobs": "idx_jobs_embedding_cosine",
+    "resume_extractions": "idx_resume_extractions_embedding_cosine",
+}
+
+# Partial-index predicates. Every ANN query on jobs filters on is_active, so inactive rows
+# are left out of the index entirely.
+VECTOR_INDEX_PREDICATES: Dict[str, str] = {
+    "jobs": "is_active = TRUE",
+}
+
+# Sources that get their own partial jobs index, so source-filtered searches only scan that source
+VECTOR_SOURCE_INDEX_SOURCES: Tuple[str, ...] = tuple(
+    s.strip() for s in os.getenv("VECTOR_SOURCE_INDEX_SOURCES", "remoteok").split(",") if s.strip()
+)
+
+# pgvector release that added ivfflat/hnsw.iterative_scan
+_ITERATIVE_SCAN_MIN_VERSION: Tuple[int, ...] = (0, 8, 0)
+
+# (recall, fraction of ivfflat lists to probe) and (recall, hnsw ef_search); interpolated linearly
+_IVFFLAT_PROBE_CURVE: List[Tuple[float, float]] = [(0.80, 0.02), (0.90, 0.05), (0.95, 0.10), (0.99, 0.25), (1.00, 1.00)]
+_HNSW_EF_CURVE: List[Tuple[float, float]] = [(0.80, 20), (0.90, 40), (0.95, 80), (0.99, 200), (1.00, 1000)]
+
+
+def _interpolate(curve: List[Tuple[float, float]], x: float) -> float:
+    if x <= curve[0][0]:
+        return curve[0][1]
+    for (x0, y0), (x1, y1) in zip(curve, curve[1:]):
+        if x <= x1:
+            return y0 + (y1 - y0) * (x - x0) / (x1 - x0)
+    return curve[-1][1]
+
+
+def ivfflat_lists_for_rows(rows: int) -> int:
+    # pgvector guidance: rows / 1000 up to 1M rows, sqrt(rows) beyond
+    if rows <= 1_000_000:
+        return max(1, rows // 1000)
+    return max(1, int(math.sqrt(rows)))
+
+
+def choose_search_params(
+    method: str,
+    target_recall: float = VECTOR_TARGET_RECALL,
+    lists: Optional[int] = None,
+    rows: int = 0,
+    top_k: int = 10,
+) -> Tuple[str, int]:
+    """Return (setting name, value) to apply before an ANN query on an index of this shape."""
+    target_recall = min(max(target_recall, 0.0), 1.0)
+
+    if method == "hnsw":
+        ef = _interpolate(_HNSW_EF_CURVE, target_recall)
+        # Larger graphs need a wider beam for the same recall
+        if rows > 100_000:
+            ef *= 1 + math.log10(rows / 100_000)
+        return "hnsw.ef_search", int(min(1000, max(top_k, math.ceil(ef))))
+
+    lists = max(1, lists or 1)
+    probes = math.ceil(lists * _interpolate(_IVFFLAT_PROBE_CURVE, target_recall))
+    # Never probe fewer than sqrt(lists) - below that recall drops off sharply
+    probes = max(probes, math.ceil(math.sqrt(lists)))
+    return "ivfflat.probes", int(min(lists, max(1, probes)))
+
+
+def source_index_name(source: str) -> str:
+    # Sources are interpolated into DDL, so only plain identifiers are accepted
+    if not re.fullmatch(r"[a-z0-9_]+", source):
+        raise ValueError(f"invalid source name for a vector index: {source!r}")
+    return f"{VECTOR_INDEXES['jobs']}_{source}"
+
+
+def _source_index_predicate(source: str) -> str:
+    return f"{VECTOR_INDEX_PREDICATES['jobs']} AND source = '{source}'"
+
+
+# ---------------- dimension alignment ----------------
+
+def get_vector_column_dimension(cur, table: str, column: str = "embedding") -> Optional[int]:
+    # For vector(n) columns atttypmod holds n (-1 when undeclared)
+    cur.execute(
+        """
+        SELECT atttypmod
+        FROM pg_attribute
+        WHERE attrelid = %s::regclass
+          AND attname = %s
+          AND NOT attisdropped
+        """,
+        (table, column),
+    )
+    row = cur.fetchone()
+    if row is None or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+def migrate_embedding_dimensions(dim: int = EMBEDDING_DIMENSION) -> Dict[str, Any]:
+    """
+    Alter embedding columns to vector(dim). Vectors of another dimension can't be converted,
+    so they are cleared (and job fingerprints reset so the next sync re-embeds them).
+    Indexes on a changed column are dropped; run ensure_vector_indexes afterwards.
+    """
+    changed: Dict[str, Any] = {}
+    with extensions.get_db_pool().connection() as conn:
+        with conn.cursor() as cur:
+            for table, index_name in VECTOR_INDEXES.items():
+                current = get_vector_column_dimension(cur, table)
+                if current == dim:
+                    continue
+
+                cur.execute(f"DROP INDEX IF EXISTS {index_name};")
+                if table == "jobs":
+                    for source in VECTOR_SOURCE_INDEX_SOURCES:
+                        cur.execute(f"DROP INDEX IF EXISTS {source_index_name(source)};")
+                cur.execute(
+                    f"""
+                    ALTER TABLE {table}
+                    ALTER COLUMN embedding TYPE vector({dim})
+                    USING (CASE WHEN vector_dims(embedding) = {dim} THEN embedding::vector({dim}) END)
+                    """
+                )
+                if table == "jobs":
+                    cur.execute(
+                        "UPDATE jobs SET embedding_hash = NULL, updated_at = NOW() WHERE embedding IS NULL"
+                    )
+                cur.execute("DELETE FROM vector_index_state WHERE index_name = %s", (index_name,))
+                changed[table] = {"from": current, "to": dim}
+
+    _invalidate_state_cache()
+    if changed:
+        # Prepared statements that select a retyped column fail until re-prepared on a new connection
+        _drain_pools()
+    return {"dimension": dim, "changed": changed}
+
+
+# ---------------- index build / retune ----------------
+
+def _count_embedded_rows(cur, table: str, predicate: Optional[str] = None) -> int:
+    where = f"embedding IS NOT NULL AND {predicate}" if predicate else "embedding IS NOT NULL"
+    cur.execute(f"SELECT COUNT(*) FROM {table} WHERE {where}")
+    return int(cur.fetchone()[0])
+
+
+def _index_exists(cur, index_name: str, partial: bool = False) -> bool:
+    # partial=True only counts an index built with a WHERE clause (older full indexes get rebuilt)
+    cur.execute("SELECT indexdef FROM pg_indexes WHERE indexname = %s", (index_name,))
+    row = cur.fetchone()
+    if row is None:
+        return False
+    return not partial or " WHERE " in row[0]
+
+
+def _create_vector_index(
+    cur,
+    table: str,
+    index_name: str,
+    method: str,
+    lists: Optional[int],
+    predicate: Optional[str],
+) -> None:
+    """
+    Build the index under a temporary name with CREATE INDEX CONCURRENTLY, then swap it in.
+    Reads and writes on `table` keep running (and keep using the old index) during the build;
+    only the rename takes a brief lock. The cursor's connection must be in autocommit mode.
+    """
+    where = f"WHERE {predicate}" if predicate else ""
+    new_name, old_name = f"{index_name}_new", f"{index_name}_old"
+    # Leftovers from an interrupted build (a failed CONCURRENTLY build leaves an invalid index)
+    cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {new_name};")
+    cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {old_name};")
+    if method == "hnsw":
+        params = f"hnsw (embedding vector_cosine_ops) WITH (m = {HNSW_M}, ef_construction = {HNSW_EF_CONSTRUCTION})"
+    else:
+        params = f"ivfflat (embedding vector_cosine_ops) WITH (lists = {lists})"
+    try:
+        cur.execute(f"CREATE INDEX CONCURRENTLY {new_name} ON {table} USING {params} {where}")
+    except psycopg.Error:
+        cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {new_name};")
+        raise
+
+    # Both renames commit together, so queries always see an index under index_name
+    with cur.connection.transaction():
+        cur.execute(f"ALTER INDEX IF EXISTS {index_name} RENAME TO {old_name};")
+        cur.execute(f"ALTER INDEX {new_name} RENAME TO {index_name};")
+    cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {old_name};")
+
+
+def _ensure_source_indexes(cur, method: str, rebuild: bool) -> Dict[str, Any]:
+    # Per-source partial jobs indexes follow the main jobs index: same method, rebuilt with it
+    results: Dict[str, Any] = {}
+    for source in VECTOR_SOURCE_INDEX_SOURCES:
+        index_name = source_index_name(source)
+        predicate = _source_index_predicate(source)
+        if not rebuild and _index_exists(cur, index_name):
+            results[source] = {"action": "kept"}
+            continue
+        rows = _count_embedded_rows(cur, "jobs", predicate)
+        lists = ivfflat_lists_for_rows(rows) if method == "ivfflat" else None
+        _create_vector_index(cur, "jobs", index_name, method, lists, predicate)
+        results[source] = {"action": "rebuilt", "rows": rows, "lists": lists}
+    return results
+
+
+def _read_index_state(conn) -> Dict[str, Dict[str, Any]]:
+    with conn.cursor(row_factory=dict_row) as cur:
+        cur.execute(
+            """
+            SELECT table_name, index_name, method, lists, m, ef_construction, row_count, built_at
+            FROM vector_index_state
+            """
+        )
+        rows = cur.fetchall()
+
+    for row in rows:
+        if row.get("built_at"):
+            row["built_at"] = row["built_at"].isoformat()
+    return {row["table_name"]: row for row in rows}
+
+
+def get_vector_index_state(pool=None) -> Dict[str, Dict[str, Any]]:
+    with (pool or extensions.get_db_pool()).connection() as conn:
+        return _read_index_state(conn)
+
+
+def _needs_rebuild(state: Optional[Dict[str, Any]], method: str, rows: int, exists: bool) -> bool:
+    if not exists or state is None or state["method"] != method:
+        return True
+    if method == "hnsw":
+        # HNSW maintains itself on insert; only the method/params trigger rebuilds
+        return state["m"] != HNSW_M or state["ef_construction"] != HNSW_EF_CONSTRUCTION
+    # ivfflat centroids are fixed at build time - rebuild once the table has changed size a lot
+    built_rows = max(1, int(state["row_count"] or 0))
+    growth = max(rows, 1) / built_rows
+    return growth >= VECTOR_INDEX_REBUILD_GROWTH or growth <= 1 / VECTOR_INDEX_REBUILD_GROWTH
+
+
+@contextmanager
+def _autocommit(conn):
+    # CREATE/DROP INDEX CONCURRENTLY can't run inside a transaction block. Pooled connections
+    # are handed back in their default mode.
+    conn.autocommit = True
+    try:
+        yield conn
+    finally:
+        if not conn.closed:
+            conn.autocommit = False
+
+
+def ensure_vector_indexes(method: Optional[str] = None, force: bool = False, pool=None) -> Dict[str, Any]:
+    """
+    (Re)build cosine indexes whose method/parameters no longer fit the table size.
+    Builds run CONCURRENTLY on an autocommit connection and are swapped in by rename, so
+    reads and writes on the table carry on meanwhile. vector_index_state is only updated
+    once the new index is in place.
+    `pool` defaults to the app pool; background retunes pass the sync pool.
+    """
+    method = method or VECTOR_INDEX_METHOD
+    if method not in VECTOR_INDEX_METHODS:
+        raise ValueError(f"method must be one of {', '.join(VECTOR_INDEX_METHODS)}")
+
+    pool = pool or extensions.get_db_pool()
+    states = get_vector_index_state(pool)
+    results: Dict[str, Any] = {}
+
+    for table, index_name in VECTOR_INDEXES.items():
+        predicate = VECTOR_INDEX_PREDICATES.get(table)
+        with pool.connection() as conn, _autocommit(conn):
+            with conn.cursor() as cur:
+                rows = _count_embedded_rows(cur, table, predicate)
+                exists = _index_exists(cur, index_name, partial=predicate is not None)
+                if not force and not _needs_rebuild(states.get(table), method, rows, exists):
+                    results[table] = {"action": "kept", "rows": rows}
+                    if table == "jobs":
+                        results[table]["sources"] = _ensure_source_indexes(cur, method, rebuild=False)
+                    continue
+
+                started = time.perf_counter()
+                lists = ivfflat_lists_for_rows(rows) if method == "ivfflat" else None
+                _create_vector_index(cur, table, index_name, method, lists, predicate)
+                sources = _ensure_source_indexes(cur, method, rebuild=True) if table == "jobs" else None
+
+                cur.execute(
+                    """
+                    INSERT INTO vector_index_state (
+                        table_name, index_name, method, lists, m, ef_construction, row_count, built_at
+                    )
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, NOW())
+                    ON CONFLICT (table_name)
+                    DO UPDATE SET
+                        index_name = EXCLUDED.index_name,
+                        method = EXCLUDED.method,
+                        lists = EXCLUDED.lists,
+                        m = EXCLUDED.m,
+                        ef_construction = EXCLUDED.ef_construction,
+                        row_count = EXCLUDED.row_count,
+                        built_at = NOW()
+                    """,
+                    (
+                        table,
+                        index_name,
+                        method,
+                        lists,
+                        HNSW_M if method == "hnsw" else None,
+                        HNSW_EF_CONSTRUCTION if method == "hnsw" else None,
+                        rows,
+                    ),
+                )
+                cur.execute(f"ANALYZE {table};")
+
+        results[table] = {
+            "action": "rebuilt",
+            "method": method,
+            "rows": rows,
+            "lists": lists,
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+        if sources is not None:
+            results[table]["sources"] = sources
+
+    _invalidate_state_cache()
+    return {"method": method, "indexes": results}
+
+
+_retune_lock = threading.Lock()
+
+
+def _retune_in_background() -> None:
+    try:
+        result = ensure_vector_indexes(pool=extensions.get_sync_db_pool())
+        print(f"[INFO] Vector index retune after sync: {result}")
+    except Exception as e:
+        # A failed retune must not take the worker down; the next sync tries again
+        print(f"[WARN] Vector index retune failed: {e}")
+    finally:
+        _retune_lock.release()
+
+
+def maybe_retune_after_sync(rows_written: int) -> Optional[Dict[str, Any]]:
+    """
+    Called after syncs; small syncs skip the check entirely. CREATE INDEX can take minutes,
+    so the check runs on a background thread against the sync pool and the sync returns at once.
+    """
+    if rows_written < VECTOR_INDEX_RETUNE_MIN_ROWS:
+        return None
+    if not _retune_lock.acquire(blocking=False):
+        return {"status": "already_running"}
+    try:
+        threading.Thread(target=_retune_in_background, name="vector-index-retune", daemon=True).start()
+    except Exception:
+        _retune_lock.release()
+        raise
+    return {"status": "started"}
+
+
+# ---------------- per-query search params ----------------
+
+_state_cache: Optional[Dict[str, Dict[str, Any]]] = None
+_state_cache_at = 0.0
+_state_cache_lock = threading.Lock()
+
+
+def _invalidate_state_cache() -> None:
+    global _state_cache
+    with _state_cache_lock:
+        _state_cache = None
+
+
+def _cached_index_state(cur, table: str) -> Optional[Dict[str, Any]]:
+    """
+    vector_index_state for `table`, refreshed through the caller's connection when the cache
+    is older than _STATE_CACHE_TTL_S (checking out a second connection could wait on a full pool).
+    """
+    global _state_cache, _state_cache_at
+    with _state_cache_lock:
+        cache = _state_cache
+        fresh = cache is not None and time.monotonic() - _state_cache_at <= _STATE_CACHE_TTL_S
+    if fresh:
+        return cache.get(table)
+
+    try:
+        # Savepoint: a failed read must not abort the caller's transaction
+        with cur.connection.transaction():
+            states = _read_index_state(cur.connection)
+    except psycopg.Error as e:
+        # Keep the stale copy (or the schema default) and try again on the next query
+        print(f"[WARN] Could not read vector_index_state: {e}")
+        return (cache or {}).get(table)
+
+    with _state_cache_lock:
+        _state_cache = states
+        _state_cache_at = time.monotonic()
+    return states.get(table)
+
+
+_pgvector_version: Optional[Tuple[int, ...]] = None
+
+
+def _get_pgvector_version(cur) -> Tuple[int, ...]:
+    # Cached for the process; extension upgrades need a restart to be picked up
+    global _pgvector_version
+    if _pgvector_version is None:
+        cur.execute("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+        row = cur.fetchone()
+        version = row[0] if row and not isinstance(row, dict) else (row or {}).get("extversion")
+        _pgvector_version = tuple(int(p) for p in re.findall(r"\d+", version or "0"))
+    return _pgvector_version
+
+
+# connection -> (setting, value) set for the whole session by configure_search_session
+_session_search_params: "weakref.WeakKeyDictionary[Any, Tuple[str, int]]" = weakref.WeakKeyDictionary()
+
+
+def configure_search_session(conn) -> Optional[Tuple[str, int]]:
+    """
+    Pool `configure` hook: set the default-recall probes / ef_search for the connection's session.
+    Reads vector_index_state on this connection, since the pool is still opening it.
+    """
+    try:
+        with conn.cursor(row_factory=dict_row) as cur:
+            cur.execute(
+                "SELECT method, lists, row_count FROM vector_index_state WHERE table_name = 'jobs'"
+            )
+            state = cur.fetchone() or {"method": "ivfflat", "lists": 100, "row_count": 0}
+            name, value = choose_search_params(
+                state["method"],
+                target_recall=VECTOR_TARGET_RECALL,
+                lists=state.get("lists"),
+                rows=int(state.get("row_count") or 0),
+            )
+            cur.execute("SELECT set_config(%s, %s, false)", (name, str(value)))
+        conn.commit()
+    except psycopg.Error as e:
+        # Queries still SET LOCAL what they need; a missing table just means db.sql hasn't run yet
+        conn.rollback()
+        if not isinstance(e, psycopg.errors.UndefinedTable):
+            print(f"[WARN] Could not set session search params: {e}")
+        return None
+
+    _session_search_params[conn] = (name, value)
+    return name, value
+
+
+def _drain_pools() -> None:
+    for pool in (extensions.db_pool, extensions.sync_db_pool):
+        if pool is not None:
+            pool.drain()
+
+
+def apply_search_params(
+    cur,
+    table: str = "jobs",
+    target_recall: Optional[float] = None,
+    top_k: int = 10,
+    filtered: bool = False,
+) -> Tuple[str, int]:
+    """
+    Set ivfflat.probes or hnsw.ef_search for the current transaction only. Call it once per
+    transaction: when the session already has the wanted value (configure_search_session),
+    no SET is sent.
+    Falls back to the ivfflat schema default (lists = 100) if the index was never tuned.
+
+    filtered=True (the query has WHERE filters beyond the index predicate) also enables
+    iterative index scans on pgvector >= 0.8, so the scan keeps going until LIMIT rows
+    pass the filters instead of returning whatever survived the first probes.
+    """
+    state = _cached_index_state(cur, table) or {"method": "ivfflat", "lists": 100, "row_count": 0}
+    name, value = choose_search_params(
+        state["method"],
+        target_recall=VECTOR_TARGET_RECALL if target_recall is None else target_recall,
+        lists=state.get("lists"),
+        rows=int(state.get("row_count") or 0),
+        top_k=top_k,
+    )
+    if _session_search_params.get(cur.connection) != (name, value):
+        # set_config(..., true) is SET LOCAL and, unlike SET, accepts bound parameters
+        cur.execute("SELECT set_config(%s, %s, true)", (name, str(value)))
+    if filtered and _get_pgvector_version(cur) >= _ITERATIVE_SCAN_MIN_VERSION:
+        # relaxed_order may return rows slightly out of distance order; callers re-sort
+        prefix = name.split(".", 1)[0]
+        cur.execute("SELECT set_config(%s, 'relaxed_order', true)", (f"{prefix}.iterative_scan",))
+    return name, value
@@ -0,0 +1,227 @@
+"""
+Offline fixtures for the benchmark suite: synthetic Simplify markdown, RemoteOK API payloads,
+resume PDFs, and fakes for the Gemini client and the shared HTTP session.
+Everything is seeded so runs on different commits see identical inputs.
+"""
+
+import hashlib
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+
+_COMPANIES = [
+    "Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises",
+    "Soylent", "Wonka", "Cyberdyne", "Tyrell", "Aperture", "Black Mesa", "Vandelay", "Massive Dynamic",
+]
+_ROLES = [
+    "Software Engineer", "Backend Engineer", "Data Engineer", "Machine Learning Engineer",
+    "Frontend Engineer", "Site Reliability Engineer", "Data Analyst", "Full Stack Engineer",
+    "Platform Engineer", "Security Engineer",
+]
+_LOCATIONS = [
+    "San Francisco, CA", "New York, NY", "Seattle, WA", "Austin, TX", "Remote in USA",
+    "Boston, MA", "Chicago, IL", "Toronto, ON", "London, UK", "Remote",
+]
+_SKILLS = [
+    "python", "sql", "postgres", "flask", "django", "react", "typescript", "go", "rust", "java",
+    "kubernetes", "docker", "aws", "gcp", "terraform", "spark", "airflow", "pytorch", "tensorflow",
+    "pandas", "numpy", "redis", "kafka", "graphql", "linux", "c++", "machine learning", "nlp",
+]
+_CATEGORIES = ["💻 Software Engineering", "🤖 Data Science, AI & Machine Learning", "📈 Quantitative Finance"]
+
+
+def synthetic_simplify_markdown(rows: int, seed: int = 7) -> str:
+    """Simplify-style README with `rows` listings spread over category tables, ~30% as ↳ sub-rows."""
+    rng = random.Random(seed)
+    lines: List[str] = ["# New Grad Positions", "", "## Table of Contents", ""]
+    per_category = -(-rows // len(_CATEGORIES))
+    written = 0
+
+    for category in _CATEGORIES:
+        lines += [f"## {category} New Grad Roles", "", "| Company | Role | Location | Application | Age |", "| --- | --- | --- | :---: | :---: |"]
+        for _ in range(min(per_category, rows - written)):
+            company = rng.choice(_COMPANIES)
+            slug = f"{company.replace(' ', '-')}-{written}"
+            if written and rng.random() < 0.3:
+                company_cell = "↳"
+            else:
+                company_cell = f"**[{company}](https://simplify.jobs/c/{slug})**"
+            apply = f"https://jobs.example.com/{slug}/apply?utm_source=Simplify"
+            app_cell = f"[Apply]({apply}) [Simplify](https://simplify.jobs/p/{slug})"
+            age = rng.choice(["0d", "1d", "3d", "6d", "12d", "1mo", "2mo"])
+            lines.append(f"| {company_cell} | {rng.choice(_ROLES)} | {rng.choice(_LOCATIONS)} | {app_cell} | {age} |")
+            written += 1
+        lines.append("")
+
+    return "\n".join(lines)
+
+
+def synthetic_simplify_html(rows: int, seed: int = 7) -> str:
+    """Same listings as synthetic_simplify_markdown, in the HTML <table> layout upstream also uses."""
+    rng = random.Random(seed)
+    lines: List[str] = ["# New Grad Positions", "", "## Table of Contents", ""]
+    per_category = -(-rows // len(_CATEGORIES))
+    written = 0
+
+    for category in _CATEGORIES:
+        lines += [
+            f"## {category} New Grad Roles", "", "<table>", "<thead>", "<tr>",
+            "<th>Company</th>", "<th>Role</th>", "<th>Location</th>", "<th>Application</th>", "<th>Age</th>",
+            "</tr>", "</thead>", "<tbody>",
+        ]
+        for _ in range(min(per_category, rows - written)):
+            company = rng.choice(_COMPANIES)
+            slug = f"{company.replace(' ', '-')}-{written}"
+            if written and rng.random() < 0.3:
+                company_cell = "↳"
+            else:
+                company_cell = f'<strong><a href="https://simplify.jobs/c/{slug}">{company}</a></strong>'
+            apply = f"https://jobs.example.com/{slug}/apply?utm_source=Simplify&amp;ref=bench"
+            app_cell = (
+                f'<div align="center"><a href="{apply}"><img src="https://i.imgur.com/apply.png" alt="Apply"></a> '
+                f'<a href="https://simplify.jobs/p/{slug}"><img src="https://i.imgur.com/simplify.png" alt="Simplify"></a></div>'
+            )
+            age = rng.choice(["0d", "1d", "3d", "6d", "12d", "1mo", "2mo"])
+            lines += [
+                "<tr>",
+                f"<td>{company_cell}</td>",
+                f"<td>{rng.choice(_ROLES)}</td>",
+                f"<td>{rng.choice(_LOCATIONS)}</td>",
+                f"<td>{app_cell}</td>",
+                f"<td>{age}</td>",
+                "</tr>",
+            ]
+            written += 1
+        lines += ["</tbody>", "</table>", ""]
+
+    return "\n".join(lines)
+
+
+def synthetic_remoteok_payload(jobs: int, seed: int = 11) -> List[Dict[str, Any]]:
+    """RemoteOK API-shaped list: a legal/metadata element first, then `jobs` postings."""
+    rng = random.Random(seed)
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    payload: List[Dict[str, Any]] = [{"legal": "Synthetic fixture for offline benchmarks", "last_updated": int(now.timestamp())}]
+
+    for i in range(jobs):
+        posted = now - timedelta(hours=rng.randint(0, 24 * 30))
+        tags = rng.sample(_SKILLS, k=rng.randint(3, 8))
+        paragraphs = [
+            f"<p>We are hiring a {rng.choice(_ROLES)} to work on {', '.join(rng.sample(_SKILLS, 4))}.</p>"
+            for _ in range(rng.randint(4, 12))
+        ]
+        salary_min = rng.choice([0, 60000, 80000, 100000, 120000])
+        payload.append({
+            "id": str(100000 + i),
+            "epoch": int(posted.timestamp()),
+            "date": posted.isoformat(),
+            "company": rng.choice(_COMPANIES),
+            "position": rng.choice(_ROLES),
+            "tags": tags,
+            "description": "".join(paragraphs),
+            "location": rng.choice(_LOCATIONS),
+            "salary_min": salary_min,
+            "salary_max": salary_min + rng.choice([0, 20000, 40000]),
+            "slug": f"remote-job-{i}",
+            "url": f"https://remoteok.com/remote-jobs/{100000 + i}",
+            "apply_url": f"https://remoteok.com/l/{100000 + i}",
+            "company_logo": "",
+        })
+    return payload
+
+
+def load_remoteok_fixture(path: str) -> List[Dict[str, Any]]:
+    # A payload recorded with `python -m benchmarks.run record-remoteok`
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def synthetic_resume_pdf(pages: int = 2, variant: int = 0) -> bytes:
+    """Minimal text PDF (Helvetica, ~30 lines per page). `variant` changes the bytes, not the size."""
+    objects: List[str] = ["<< /Type /Catalog /Pages 2 0 R >>"]
+    kids = " ".join(f"{3 + 2 * i} 0 R" for i in range(pages))
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {pages} >>")
+    font_id = 3 + 2 * pages
+    rng = random.Random(variant)
+
+    for page in range(pages):
+        lines = [f"Candidate {variant} - page {page + 1}"]
+        lines += [
+            f"Built {rng.choice(_ROLES).lower()} projects with {', '.join(rng.sample(_SKILLS, 3))}"
+            for _ in range(30)
+        ]
+        stream = "BT /F1 9 Tf 30 800 Td 11 TL " + " ".join(f"({line}) '" for line in lines) + " ET"
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] /Contents {4 + 2 * page} 0 R "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> >>"
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = "%PDF-1.4\n"
+    offsets: List[int] = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n"
+    xref_at = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_at}\n%%EOF\n"
+    return out.encode("latin-1")
+
+
+class _FakeResponse:
+    def __init__(self, payload: Any, status_code: int = 200):
+        self._payload = payload
+        self.status_code = status_code
+        self.headers: Dict[str, str] = {}
+        self.text = json.dumps(payload)
+        self.content = self.text.encode("utf-8")
+
+    def json(self) -> Any:
+        return self._payload
+
+    def iter_content(self, chunk_size: int = 1) -> Any:
+        # Like requests with stream=True: the body in byte chunks
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def raise_for_status(self) -> None:
+        return None
+
+    def close(self) -> None:
+        return None
+
+
+class FakeHttpSession:
+    """Stands in for get_http_session(): every GET returns the same recorded payload."""
+
+    def __init__(self, payload: Any):
+        self.payload = payload
+
+    def get(self, url: str, **kwargs: Any) -> _FakeResponse:
+        return _FakeResponse(self.payload)
+
+
+class _FakeGeminiResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _FakeGeminiModels:
+    def __init__(self, skills: int):
+        self.skills = skills
+
+    def generate_content(self, model: str, contents: str, config: Optional[Dict[str, Any]] = None) -> _FakeGeminiResponse:
+        # Deterministic per prompt, so the LLM cache behaves as it would with the real model
+        rng = random.Random(hashlib.sha256(contents.encode("utf-8")).hexdigest())
+        return _FakeGeminiResponse(json.dumps({"skills": rng.sample(_SKILLS, k=self.skills)}))
+
+
+class FakeGeminiClient:
+    """Minimal google-genai Client double: client.models.generate_content(...).text is JSON."""
+
+    def __init__(self, skills: int = 8):
+        self.models = _FakeGeminiModels(skills)
@@ -0,0 +1,402 @@
+"""
+Offline benchmark suite for ingestion and matching.
+
+    python -m benchmarks.run                                  # everything that can run here
+    python -m benchmarks.run --only parse --only embed        # a subset
+    python -m benchmarks.run --output bench.json              # machine-readable results
+    python -m benchmarks.run --compare baseline.json          # exit 1 on regressions
+
+Database benchmarks need BENCH_DATABASE_URL (or --database-url) pointing at a disposable
+Postgres with pgvector: the schema is applied and the jobs/resumes/matches tables are TRUNCATED.
+Without the embedding model in the local Hugging Face cache, embeddings are faked (noted in meta).
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import traceback
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+# Never reach out for model weights - use the local cache or fall back to fake embeddings
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+
+import numpy as np
+from werkzeug.datastructures import FileStorage
+from app.extensions import extensions
+from app.services import database_service, embedding_service, resume_service
+from app.services.embedding_service import EMBEDDING_DIMENSION
+from benchmarks.fixtures import (
+    FakeGeminiClient,
+    FakeHttpSession,
+    load_remoteok_fixture,
+    synthetic_remoteok_payload,
+    synthetic_resume_pdf,
+    synthetic_simplify_html,
+    synthetic_simplify_markdown,
+)
+
+
+BENCHMARKS = ("parse", "decode", "embed", "sync", "match", "upload")
+_BENCH_TABLES = ("matches", "resume_extractions", "resumes", "resume_tasks", "jobs", "llm_extraction_cache", "sync_sources")
+
+
+def _result(name: str, value: float, unit: str, higher_is_better: bool, **params: Any) -> Dict[str, Any]:
+    return {
+        "name": name,
+        "params": params,
+        "value": round(float(value), 4),
+        "unit": unit,
+        "higher_is_better": higher_is_better,
+    }
+
+
+def _best_of(repeat: int, fn: Callable[[], Any]) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    return float(np.percentile(np.asarray(samples), pct))
+
+
+# ---------------- fakes ----------------
+
+def _fake_vector(text: str) -> List[float]:
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+    vec = np.random.default_rng(seed).standard_normal(EMBEDDING_DIMENSION).astype(np.float32)
+    return (vec / np.linalg.norm(vec)).tolist()
+
+
+def _fake_embed_texts(texts: List[str], batch_size: int = 64) -> List[List[float]]:
+    return [_fake_vector(t) for t in texts]
+
+
+def _use_fake_embeddings() -> None:
+    # Patch the names the services imported, not just embedding_service
+    database_service.embed_texts = _fake_embed_texts
+    database_service.embed_text = _fake_vector
+    resume_service.embed_text = _fake_vector
+
+
+def _embedding_model_available() -> bool:
+    try:
+        embedding_service.get_embedding_model()
+        return True
+    except Exception as e:
+        print(f"[bench] embedding model unavailable offline ({e.__class__.__name__}); using fake embeddings")
+        return False
+
+
+def _setup_database(url: str) -> None:
+    from app.services.db_pool_service import create_pool
+
+    # Same connection setup as the app (prepare threshold, session search params), sync pool shared
+    extensions.db_pool = create_pool(
+        url, name="bench", min_size=1, max_size=4, timeout=30, statement_timeout_ms=0
+    )
+    extensions.db_pool.wait()
+    schema_path = os.path.join(os.path.dirname(database_service.__file__), "..", "database", "db.sql")
+    with open(schema_path, "r", encoding="utf-8") as f:
+        schema = f.read()
+    with extensions.db_pool.connection() as conn:
+        conn.execute(schema)
+        conn.execute(f"TRUNCATE {', '.join(_BENCH_TABLES)} RESTART IDENTITY CASCADE")
+
+
+# ---------------- benchmarks ----------------
+
+def bench_parse(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    results = []
+    layouts = (("parse_simplify_markdown", synthetic_simplify_markdown), ("parse_simplify_html", synthetic_simplify_html))
+    for name, build in layouts:
+        for rows in args.parse_rows:
+            readme = build(rows)
+            parsed = len(database_service.parse_simplify_jobs_from_markdown(readme, max_jobs=rows + 1))
+            seconds = _best_of(args.repeat, lambda: database_service.parse_simplify_jobs_from_markdown(readme, max_jobs=rows + 1))
+            results.append(_result(name, parsed / seconds, "rows/s", True, rows=rows))
+    return results
+
+
+def bench_decode(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    # RemoteOK feed -> normalized newest-first records, as fetch_remoteok_jobs does before the sync writes
+    payload = load_remoteok_fixture(args.remoteok_fixture) if args.remoteok_fixture else synthetic_remoteok_payload(args.sync_jobs)
+    database_service.get_http_session = lambda: FakeHttpSession(payload)
+    feed = len(payload) - 1
+    results = []
+    for limit in sorted({min(1000, feed), feed}):
+        seconds = _best_of(args.repeat, lambda: database_service.fetch_remoteok_jobs(limit=limit))
+        tracemalloc.start()
+        database_service.fetch_remoteok_jobs(limit=limit)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results.append(_result("remoteok_decode", seconds * 1000 * 1000 / feed, "ms/1k jobs", False, jobs=feed, limit=limit))
+        results.append(_result("remoteok_decode_peak", peak / (1024 * 1024), "MB", False, jobs=feed, limit=limit))
+    return results
+
+
+def bench_embed(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    if args.fake_embeddings:
+        return []
+    payload = synthetic_remoteok_payload(args.embed_texts)[1:]
+    texts = [
+        embedding_service.build_job_embedding_text({
+            "title": j["position"], "company": j["company"], "location": j["location"],
+            "tags": j["tags"], "description": j["description"],
+        })
+        for j in payload
+    ]
+    embedding_service.embed_texts(texts[:8])   # warm up
+    results = []
+    for batch_size in args.embed_batch_sizes:
+        seconds = _best_of(args.repeat, lambda: embedding_service.embed_texts(texts, batch_size=batch_size))
+        results.append(_result("embed_texts", len(texts) / seconds, "texts/s", True, texts=len(texts), batch_size=batch_size))
+    started = time.perf_counter()
+    for text in texts[:32]:
+        embedding_service.embed_text(text)
+    results.append(_result("embed_text_single", 32 / (time.perf_counter() - started), "texts/s", True))
+    return results
+
+
+def bench_sync(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    payload = load_remoteok_fixture(args.remoteok_fixture) if args.remoteok_fixture else synthetic_remoteok_payload(args.sync_jobs)
+    database_service.get_http_session = lambda: FakeHttpSession(payload)
+    jobs = len(payload) - 1
+    results = []
+
+    for method in database_service.JOB_UPSERT_METHODS:
+        with extensions.get_db_pool().connection() as conn:
+            conn.execute("TRUNCATE jobs RESTART IDENTITY CASCADE")
+        # Cold: every job is new and embedded. Warm: same payload again, fingerprints all hit.
+        for phase in ("cold", "warm"):
+            stats = database_service.sync_remoteok_jobs(limit=jobs, upsert_method=method, update_matches=False)
+            results.append(_result("sync_remoteok_upsert", stats["upsert_rows_per_sec"], "rows/s", True, jobs=jobs, method=method, phase=phase))
+            results.append(_result("sync_remoteok_total", stats["elapsed_seconds"], "s", False, jobs=jobs, method=method, phase=phase))
+    return results
+
+
+def bench_match(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    from app.services.vector_schema_service import ensure_vector_indexes
+
+    with extensions.get_db_pool().connection() as conn:
+        count = conn.execute("SELECT COUNT(*) FROM jobs WHERE embedding IS NOT NULL").fetchone()[0]
+    if count == 0:
+        database_service.get_http_session = lambda: FakeHttpSession(synthetic_remoteok_payload(args.sync_jobs))
+        database_service.sync_remoteok_jobs(limit=args.sync_jobs, update_matches=False)
+    ensure_vector_indexes(force=True)
+
+    rng = np.random.default_rng(3)
+    queries = rng.standard_normal((args.match_queries, EMBEDDING_DIMENSION)).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    database_service.compute_matches_for_resume(0, queries[0].tolist(), top_k=args.match_top_k)   # warm up
+    latencies: List[float] = []
+    for q in queries:
+        started = time.perf_counter()
+        database_service.compute_matches_for_resume(0, q.tolist(), top_k=args.match_top_k)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    params = {"jobs": int(count) or args.sync_jobs, "top_k": args.match_top_k, "queries": len(latencies)}
+    return [
+        _result("compute_matches_p50", _percentile(latencies, 50), "ms", False, **params),
+        _result("compute_matches_p99", _percentile(latencies, 99), "ms", False, **params),
+    ]
+
+
+def bench_upload(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    extensions.llm_client = FakeGeminiClient()
+    extensions.llm_api_key = extensions.llm_api_key or "benchmark"
+
+    def upload(variant: int) -> Dict[str, Any]:
+        data = synthetic_resume_pdf(pages=2, variant=variant)
+        return resume_service.process_uploaded_resume(
+            FileStorage(stream=io.BytesIO(data), filename=f"resume_{variant}.pdf"),
+            "backend engineering roles",
+        )
+
+    upload(10_000)   # warm up (imports, PDFium, first connections)
+    fresh: List[float] = []
+    for i in range(args.uploads):
+        started = time.perf_counter()
+        upload(i)
+        fresh.append((time.perf_counter() - started) * 1000)
+
+    repeat: List[float] = []
+    for i in range(min(args.uploads, 10)):
+        started = time.perf_counter()
+        result = upload(i)
+        repeat.append((time.perf_counter() - started) * 1000)
+        assert result.get("deduplicated"), "repeat upload was not deduplicated"
+
+    return [
+        _result("upload_e2e_p50", _percentile(fresh, 50), "ms", False, uploads=len(fresh), llm="fake"),
+        _result("upload_e2e_p99", _percentile(fresh, 99), "ms", False, uploads=len(fresh), llm="fake"),
+        _result("upload_dedup_p50", _percentile(repeat, 50), "ms", False, uploads=len(repeat)),
+    ]
+
+
+_RUNNERS: Dict[str, Callable[[argparse.Namespace], List[Dict[str, Any]]]] = {
+    "parse": bench_parse,
+    "decode": bench_decode,
+    "embed": bench_embed,
+    "sync": bench_sync,
+    "match": bench_match,
+    "upload": bench_upload,
+}
+_NEEDS_DB = {"sync", "match", "upload"}
+
+
+# ---------------- output / comparison ----------------
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def _result_key(result: Dict[str, Any]) -> str:
+    return result["name"] + json.dumps(result["params"], sort_keys=True)
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """Return one row per benchmark present in both runs; `regressed` when worse by > threshold."""
+    previous = {_result_key(r): r for r in baseline.get("results", [])}
+    rows = []
+    for result in current["results"]:
+        base = previous.get(_result_key(result))
+        if base is None or not base["value"]:
+            continue
+        change = (result["value"] - base["value"]) / base["value"]
+        worse = -change if result["higher_is_better"] else change
+        rows.append({
+            "name": result["name"],
+            "params": result["params"],
+            "baseline": base["value"],
+            "current": result["value"],
+            "unit": result["unit"],
+            "change_pct": round(change * 100, 2),
+            "regressed": worse > threshold,
+        })
+    return rows
+
+
+def _print_table(results: List[Dict[str, Any]]) -> None:
+    for r in results:
+        params = " ".join(f"{k}={v}" for k, v in r["params"].items())
+        print(f"{r['name']:<28} {params:<52} {r['value']:>14.2f} {r['unit']}")
+
+
+def record_remoteok(path: str) -> None:
+    # Network on purpose: capture a real payload once, then benchmark against it offline
+    from app.services.http_service import get_http_session
+
+    resp = get_http_session().get(database_service.REMOTEOK_API_URL, headers={"User-Agent": "Mozilla/5.0"}, timeout=30)
+    resp.raise_for_status()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(resp.json(), f)
+    print(f"[bench] recorded {len(resp.json())} RemoteOK items to {path}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline ingestion/matching benchmarks")
+    parser.add_argument("command", nargs="?", default="run", choices=("run", "record-remoteok"))
+    parser.add_argument("--only", action="append", choices=BENCHMARKS, help="Benchmark to run (repeatable). Default: all.")
+    parser.add_argument("--output", help="Write results JSON here (default: stdout summary only).")
+    parser.add_argument("--compare", help="Baseline results JSON to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown that counts as a regression.")
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"), help="Disposable Postgres+pgvector (TRUNCATED).")
+    parser.add_argument("--fake-embeddings", action="store_true", help="Skip the model even if it is cached locally.")
+    parser.add_argument("--remoteok-fixture", help="Recorded RemoteOK payload (see record-remoteok). Default: synthetic.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--parse-rows", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--embed-texts", type=int, default=512)
+    parser.add_argument("--embed-batch-sizes", type=int, nargs="+", default=[32, 64, 128])
+    parser.add_argument("--sync-jobs", type=int, default=2000)
+    parser.add_argument("--match-queries", type=int, default=200)
+    parser.add_argument("--match-top-k", type=int, default=50)
+    parser.add_argument("--uploads", type=int, default=20)
+    parser.add_argument("--path", default="benchmarks/fixtures/remoteok.json", help="Output path for record-remoteok.")
+    args = parser.parse_args(argv)
+
+    if args.command == "record-remoteok":
+        os.makedirs(os.path.dirname(args.path) or ".", exist_ok=True)
+        record_remoteok(args.path)
+        return 0
+
+    selected = args.only or list(BENCHMARKS)
+    if not args.fake_embeddings and set(selected) & {"embed", "sync", "match", "upload"}:
+        args.fake_embeddings = not _embedding_model_available()
+    if args.fake_embeddings:
+        _use_fake_embeddings()
+
+    skipped: Dict[str, str] = {}
+    if set(selected) & _NEEDS_DB:
+        if args.database_url:
+            _setup_database(args.database_url)
+        else:
+            for name in set(selected) & _NEEDS_DB:
+                skipped[name] = "no BENCH_DATABASE_URL"
+
+    results: List[Dict[str, Any]] = []
+    for name in selected:
+        if name in skipped:
+            continue
+        if name == "embed" and args.fake_embeddings:
+            skipped[name] = "embedding model not available"
+            continue
+        print(f"[bench] {name} ...", file=sys.stderr)
+        try:
+            results.extend(_RUNNERS[name](args))
+        except Exception as e:
+            traceback.print_exc()
+            skipped[name] = f"failed: {e}"
+
+    report = {
+        "meta": {
+            "git_commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "embeddings": "fake" if args.fake_embeddings else embedding_service.EMBEDDING_MODEL_NAME,
+            "skipped": skipped,
+        },
+        "results": results,
+    }
+
+    _print_table(results)
+    for name, reason in skipped.items():
+        print(f"[bench] skipped {name}: {reason}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        comparison = compare_results(report, baseline, args.threshold)
+        for row in comparison:
+            flag = "REGRESSION" if row["regressed"] else "ok"
+            print(f"{row['name']:<28} {row['baseline']:>12.2f} -> {row['current']:>12.2f} {row['unit']:<7} {row['change_pct']:>+8.2f}%  {flag}")
+        if any(row["regressed"] for row in comparison):
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
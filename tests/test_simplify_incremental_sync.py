@@ -0,0 +1,127 @@
+"""
+Incremental Simplify fetch against a local HTTP stand-in for raw.githubusercontent.com
+and the GitHub contents API: unchanged files are skipped via ETag / blob SHA.
+"""
+
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services import database_service as ds
+
+
+ROOT_MD = "| Company | Role | Location | Application | Age |\n| --- | --- | --- | --- | --- |\n"
+
+
+class _StandIn(BaseHTTPRequestHandler):
+    hits: dict = {}
+    port = 0
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=b"", headers=None):
+        self.send_response(status)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        type(self).hits[self.path] = type(self).hits.get(self.path, 0) + 1
+        base = f"http://127.0.0.1:{self.port}"
+        if self.path == "/README.md":
+            if self.headers.get("If-None-Match") == '"root-v1"':
+                return self._send(304)
+            return self._send(200, ROOT_MD.encode(), {"ETag": '"root-v1"'})
+        if self.path == "/contents":
+            listing = [
+                {"name": "README-2024.md", "sha": "sha-2024", "download_url": f"{base}/archived/README-2024.md"},
+                {"name": "README-2025.md", "sha": "sha-2025", "download_url": f"{base}/archived/README-2025.md"},
+                {"name": "notes.txt", "sha": "sha-notes", "download_url": f"{base}/archived/notes.txt"},
+            ]
+            return self._send(200, json.dumps(listing).encode(), {"Content-Type": "application/json"})
+        if self.path.startswith("/archived/"):
+            return self._send(200, ROOT_MD.encode())
+        return self._send(404)
+
+
+@pytest.fixture
+def stand_in(monkeypatch):
+    _StandIn.hits = {}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandIn)
+    _StandIn.port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{_StandIn.port}"
+    monkeypatch.setattr(ds, "SIMPLIFY_RAW_ROOT_README", f"{base}/README.md")
+    monkeypatch.setattr(ds, "GITHUB_CONTENTS_ARCHIVED_URL", f"{base}/contents")
+    yield _StandIn.hits
+    server.shutdown()
+    server.server_close()
+
+
+def test_first_sync_downloads_every_readme(stand_in):
+    sources = ds.fetch_simplify_markdown_sources({})
+
+    assert [s.name for s in sources] == ["README.md", "archived/README-2024.md", "archived/README-2025.md"]
+    assert not any(s.unchanged for s in sources)
+    assert sources[0].etag == '"root-v1"'
+    assert [s.blob_sha for s in sources[1:]] == ["sha-2024", "sha-2025"]
+    assert "/archived/notes.txt" not in stand_in
+
+
+def test_unchanged_sources_are_skipped(stand_in):
+    known = {
+        "README.md": {"etag": '"root-v1"', "blob_sha": None},
+        "archived/README-2024.md": {"etag": None, "blob_sha": "sha-2024"},
+        "archived/README-2025.md": {"etag": None, "blob_sha": "sha-old"},
+    }
+    sources = {s.name: s for s in ds.fetch_simplify_markdown_sources(known)}
+
+    # Root README answered 304 to If-None-Match
+    assert sources["README.md"].unchanged
+    # Same blob SHA: never downloaded
+    assert sources["archived/README-2024.md"].unchanged
+    assert "/archived/README-2024.md" not in stand_in
+    # New blob SHA: downloaded and parsed again
+    assert not sources["archived/README-2025.md"].unchanged
+    assert stand_in["/archived/README-2025.md"] == 1
+
+
+def test_failed_archive_listing_is_reported(stand_in, monkeypatch):
+    base = f"http://127.0.0.1:{_StandIn.port}"
+    monkeypatch.setattr(ds, "GITHUB_CONTENTS_ARCHIVED_URL", f"{base}/missing")
+    failed = []
+    sources = ds.fetch_simplify_markdown_sources({}, failed=failed)
+
+    assert [s.name for s in sources] == ["README.md"]
+    # The sync refreshes every archived/ job instead of letting them age out
+    assert failed == [ds.SIMPLIFY_ARCHIVED_LISTING]
+
+
+def _job(job_id: str, days_ago: int) -> ds.SimplifyJob:
+    return ds.SimplifyJob(
+        source=ds.SIMPLIFY_SOURCE, source_job_id=job_id, title="Engineer", company="Acme",
+        location=None, url=f"https://example.com/{job_id}", apply_url=None, tags=[],
+        date_posted=datetime(2026, 1, 1, tzinfo=timezone.utc) - timedelta(days=days_ago),
+    )
+
+
+def test_limit_reports_truncated_sources():
+    entries = [
+        ("README.md", _job("a", 0)),
+        ("README.md", _job("b", 1)),
+        ("archived/README-2024.md", _job("a", 0)),
+        ("archived/README-2024.md", _job("c", 30)),
+        ("archived/README-2025.md", _job("d", 2)),
+    ]
+    selected, unique, truncated = ds._select_recent_unique_jobs(entries, limit=3)
+
+    assert [j.source_job_id for _, j in selected] == ["a", "b", "d"]
+    assert unique == 4
+    # Only the file whose job was cut must be re-read next sync
+    assert truncated == {"archived/README-2024.md"}